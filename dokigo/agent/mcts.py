@@ -1,13 +1,41 @@
+import copy
 import math
+import multiprocessing
 import random
+import time
+
+import numpy as np
 
 from dokigo.agent import base
 from dokigo.base import Player
 from dokigo.agent.naive import FastRandomBot as RandomBot
+from dokigo.agent.transposition import TranspositionTable
+from dokigo.agent.utilities import is_point_an_eye
+from dokigo.batchboard import BatchBoard
+from dokigo.geometry import board_geometry
+from dokigo.goboard import Move
+from dokigo.playout import play_out
+from dokigo.scoring import compute_game_result
 
 __all__ = ['MCTSAgent']
 
+MAX_REUSE_DEPTH = 4  # <1>
+
+NO_CHILDREN = np.zeros(0)  # <2>
+NO_POINTS = np.zeros(0, dtype=np.int32)
+
+# <1> how many moves the game may have gone on since the last search for its tree to be reused
+# <2> the child statistics of a node that hasn't made its moves yet; never written to
+
 class MCTSNode(object):
+    """A position in the search tree.
+
+    A new node is cheap: its moves are only made the first time someone asks whether a child can be added, and each
+    move is only checked for legality right before it gets a child. The moves come in random order, except that
+    filling one's own eyes, passing and resigning come last, so a node that may only have a few children (see
+    MCTSAgent's widening) gets the moves worth trying first.
+    """
+
     def __init__(self, game_state, parent=None, move=None):
         self.game_state = game_state
         self.parent = parent
@@ -18,22 +46,130 @@ class MCTSNode(object):
         }
         self.num_rollouts = 0
         self.children = []
-        self.unvisited_moves = game_state.legal_moves()
+        self.child_moves = []  # <1>
+        self.unvisited_moves = None  # <2>
+        self.child_rollouts = NO_CHILDREN  # <3>
+        self.child_wins = NO_CHILDREN
+        self.child_total = 0
+        self.child_amaf_rollouts = NO_CHILDREN  # <4>
+        self.child_amaf_wins = NO_CHILDREN
+        self.child_points = NO_POINTS
+
+    # <1> child_moves[i] leads to children[i]. With a transposition table a child can be shared with other parents,
+    # so child.move is only the move it was first reached by.
+    # <2> the moves without a child yet, the next one to try last; None until _make_moves
+    # <3> child_rollouts[i] and child_wins[i] count the rollouts through children[i] from this node, and the ones
+    # the player to move here won; child_total is their sum. A node never gets more children than it has moves.
+    # <4> all moves as first: the rollouts from this node in which the player to move here played the point of
+    # children[i] before the opponent did, and the ones of those the player won. child_points[i] is the point index of
+    # child_moves[i] (row major, as in geometry.Geometry), -1 for pass and resign.
+
+    def _make_moves(self):
+        state = self.game_state
+        moves = []
+        if not state.is_over():
+            board = state.board
+            player = state.next_player
+            points = list(board.empty_points())
+            random.shuffle(points)
+            eyes = []
+            for point in points:
+                (eyes if is_point_an_eye(board, point, player) else moves).append(Move.play(point))
+            moves += eyes
+            moves += [Move.pass_turn(), Move.resign()]
+            moves.reverse()  # <1>
+        self.unvisited_moves = moves
+        self.child_rollouts = np.zeros(len(moves))
+        self.child_wins = np.zeros(len(moves))
+        self.child_amaf_rollouts = np.zeros(len(moves))
+        self.child_amaf_wins = np.zeros(len(moves))
+        self.child_points = np.full(len(moves), -1, dtype=np.int32)
 
-    def add_random_child(self):
-        index = random.randint(0, len(self.unvisited_moves) - 1)
-        new_move = self.unvisited_moves.pop(index)
+    # <1> moves are taken from the end of the list
+
+    def add_random_child(self, table=None, path=()):
+        """Add a child for the next unvisited move; can_add_child must have said yes. If the position after the move
+        is in table, the node from the table becomes the child, unless it is on path already."""
+        new_move = self.unvisited_moves.pop()
         new_game_state = self.game_state.apply_move(new_move)
-        new_node = MCTSNode(new_game_state, self, new_move)
+        new_node = None
+        if table is not None:
+            new_node = table.get(new_game_state.position_key)
+            if new_node is not None and new_node in path:  # <1>
+                new_node = None
+        if new_node is None:
+            new_node = MCTSNode(new_game_state, self, new_move)
+            if table is not None:
+                table.put(new_game_state.position_key, new_node)
+        if new_move.is_play:
+            point = new_move.point
+            self.child_points[len(self.children)] = (point.row - 1) * self.game_state.board.num_cols + point.col - 1
         self.children.append(new_node)
+        self.child_moves.append(new_move)
         return new_node
 
+    # <1> the keys ignore superko, so a shared node could lead back to its own ancestor; never close such a cycle
+
+    def forget_children(self):
+        """Drop the children, their moves become unvisited again. The statistics of this node are kept."""
+        if self.unvisited_moves is None:
+            return
+        self.unvisited_moves.extend(self.child_moves)
+        self.children = []
+        self.child_moves = []
+        self.child_rollouts[:] = 0
+        self.child_wins[:] = 0
+        self.child_total = 0
+        self.child_amaf_rollouts[:] = 0
+        self.child_amaf_wins[:] = 0
+        self.child_points[:] = -1
+
     def record_win(self, winner):
-        self.win_counts[winner] += 1
-        self.num_rollouts += 1
+        self.record_rollouts(int(winner == Player.black), 1)
+
+    def record_rollouts(self, black_wins, num_rollouts):
+        """Count num_rollouts rollouts through this node, black_wins of which black won."""
+        self.win_counts[Player.black] += black_wins
+        self.win_counts[Player.white] += num_rollouts - black_wins
+        self.num_rollouts += num_rollouts
+
+    def record_child_win(self, index, winner):
+        """Count a rollout through children[index]."""
+        self.record_child_rollouts(index, int(winner == Player.black), 1)
+
+    def record_child_rollouts(self, index, black_wins, num_rollouts):
+        """Count num_rollouts rollouts through children[index], black_wins of which black won."""
+        self.child_rollouts[index] += num_rollouts
+        self.child_total += num_rollouts
+        if self.game_state.next_player == Player.black:
+            self.child_wins[index] += black_wins
+        else:
+            self.child_wins[index] += num_rollouts - black_wins
+
+    def record_amaf(self, first_player, winner):
+        """Count a rollout in the all moves as first statistics. first_player[index] is the Player.value of whoever
+        played on point index first after this node, 0 if nobody did; its last entry must be 0."""
+        num_children = len(self.children)
+        player = self.game_state.next_player
+        played = first_player[self.child_points[:num_children]] == player.value  # <1>
+        self.child_amaf_rollouts[:num_children] += played
+        if winner == player:
+            self.child_amaf_wins[:num_children] += played
 
-    def can_add_child(self):
-        return len(self.unvisited_moves) > 0
+    # <1> pass and resign have point -1, which looks up the 0 at the end
+
+    def can_add_child(self, max_children=None):
+        """Tell if there is a legal move without a child left, and the node has fewer than max_children children."""
+        if max_children is not None and len(self.children) >= max_children:
+            return False
+        if self.unvisited_moves is None:
+            self._make_moves()
+        moves = self.unvisited_moves
+        while moves and not self.game_state.is_valid_move(moves[-1]):  # <1>
+            moves.pop()
+        return len(moves) > 0
+
+    # <1> the legality test only runs for the move that is next in line
 
     def is_terminal(self):
         return self.game_state.is_over()
@@ -43,38 +179,190 @@ class MCTSNode(object):
 
 
 class MCTSAgent(base.Agent):
-    def __init__(self, num_rounds, temperature):
+    """Monte Carlo tree search with random rollouts.
+
+    With table_size set, positions reached by different move orders share one node through a TranspositionTable
+    keyed on GameState.position_key, so their statistics are pooled. The table is kept between moves and holds at
+    most table_size nodes; eviction picks the node to drop, 'lru' or 'fifo'. Every round touches the nodes it
+    goes through, so 'lru' drops the ones off the lines being searched. The root, its children and the nodes of the
+    running round are never dropped. An evicted node forgets its children, so nothing the table let go of stays
+    reachable through it.
+
+    With reuse_tree the tree is kept from one move to the next. The next search starts from the node of the new
+    position, found by following the moves played since, and keeps all the rollouts below it.
+
+    The search stops after num_rounds rounds, or after time_limit seconds, or when the time a timecontrol.GameClock
+    gives the move is up, whichever comes first; num_rounds can be None if there is a time limit. With early_stop the
+    agent plays the most visited move instead of the one with the best win rate, and stops as soon as no other move
+    can catch up with it in the rounds that are left.
+
+    With num_workers above 1 the search is root parallel: every worker of a process pool searches its own tree for
+    the same position, with its share of num_rounds and the whole time budget, and the rollouts and wins of the root
+    moves are added up over the workers before picking the move. The trees are thrown away after every move, so
+    reuse_tree has no effect then. Call close() to shut the pool down.
+
+    With widening set, a node with n rollouts gets at most widening * n ** widening_exponent children (and at least
+    one); only when it has been visited often enough is the next move tried. Without it, every move of a node gets a
+    child before the search goes deeper.
+
+    With rave_equivalence set, the search keeps all moves as first (AMAF) statistics: every point a player played
+    during a round, in the tree or in the rollout, counts for that player's move to it at every node of the round
+    before it, unless the opponent got there first. Selection blends the AMAF win rate of a child into its win rate
+    with weight sqrt(k / (3 * n + k)), where n is the rollouts of the child and k is rave_equivalence, so AMAF guides
+    the search while a child has few rollouts of its own and fades out as it gets more.
+
+    With light_playouts the rollouts are played by playout.play_out on a scratch board instead of by random bots on
+    GameStates, which is about twenty times faster; those games only check the simple ko rule, not positional superko.
+
+    Every round plays rollouts_per_expansion games from the new leaf and backs their result up the tree at once, so
+    the walk down the tree is shared by all of them; num_rounds counts rounds, not rollouts. With batch_rollouts the
+    games of a round are played together by a batchboard.BatchBoard. Those don't report their moves, so with RAVE only
+    the moves in the tree count for them.
+
+    A rollout stops after max_rollout_moves moves if that is set, or with mercy set, once one side has more than
+    mercy stones more on the board than the other; the unfinished game is scored as it stands. Rollouts return the score
+    margin, and margin_weight decides what gets backed up: 0 counts wins only, 1 counts the margin only, mapped
+    linearly from a loss by the whole board to a win by the whole board onto 0 to 1, and values in between blend the
+    two. Some weight on the margin keeps the search playing for points when every move wins or every move loses.
+    """
+
+    def __init__(self, num_rounds, temperature, table_size=None, eviction='lru', reuse_tree=True,
+                 time_limit=None, clock=None, early_stop=False, num_workers=1, widening=None, widening_exponent=0.5,
+                 rave_equivalence=None, light_playouts=False, rollouts_per_expansion=1, batch_rollouts=False,
+                 max_rollout_moves=None, mercy=None, margin_weight=0.0):
         base.Agent.__init__(self)
+        if num_rounds is None and time_limit is None and clock is None:
+            raise ValueError('MCTSAgent needs num_rounds, a time_limit or a clock to know when to stop')
         self.num_rounds = num_rounds
         self.temperature = temperature
+        self.reuse_tree = reuse_tree
+        self.time_limit = time_limit
+        self.clock = clock
+        self.early_stop = early_stop
+        self.num_workers = num_workers
+        self.widening = widening
+        self.widening_exponent = widening_exponent
+        self.rave_equivalence = rave_equivalence
+        self.light_playouts = light_playouts
+        self.rollouts_per_expansion = rollouts_per_expansion
+        self.batch_rollouts = batch_rollouts
+        self.max_rollout_moves = max_rollout_moves
+        self.mercy = mercy
+        self.margin_weight = margin_weight
+        self.table = None
+        if table_size is not None:
+            self.table = TranspositionTable(table_size, eviction, on_evict=self._evict, can_evict=self._can_evict)
+        self._root = None
+        self._path = []
+        self._worker_options = dict(temperature=temperature, table_size=table_size, eviction=eviction,
+                                    early_stop=early_stop, widening=widening,
+                                    widening_exponent=widening_exponent, rave_equivalence=rave_equivalence,
+                                    light_playouts=light_playouts, rollouts_per_expansion=rollouts_per_expansion,
+                                    batch_rollouts=batch_rollouts, max_rollout_moves=max_rollout_moves, mercy=mercy,
+                                    margin_weight=margin_weight)  # <1>
+        self._pool = None
+
+    # <1> the options the agents in the pool get, see _search_root
+
+    def _evict(self, node):
+        node.forget_children()
+
+    def _can_evict(self, node):
+        root = self._root
+        return node is not root and node not in root.children and node not in self._path  # <1>
+
+    # <1> the root and its children, the candidate moves, keep their subtrees, and so does every node the running
+    # round went through, since the round still has to back its result up through their children
+
+    def _reused_root(self, game_state):
+        """Return the node of the previous search for game_state, or None if there isn't one."""
+        previous_root = self._root
+        if previous_root is None or not self.reuse_tree:
+            return None
+        moves = []
+        state = game_state
+        while state is not previous_root.game_state:  # <1>
+            if state is None or len(moves) == MAX_REUSE_DEPTH:
+                return None
+            moves.append(state.last_move)
+            state = state.previous_state
+        node = previous_root
+        for move in reversed(moves):
+            if move not in node.child_moves:
+                return None
+            node = node.children[node.child_moves.index(move)]
+        if node.game_state.position_key != game_state.position_key:
+            return None
+        node.parent = None  # <2>
+        node.game_state = game_state
+        return node
+
+    # <1> the game states the agent is given are the ones the game goes on from, so the previous root is one of
+    # the previous states of game_state
+    # <2> let go of the rest of the old tree
 
 # tag::mcts-signature[]
     def select_move(self, game_state):
-        root = MCTSNode(game_state)
+        if self.num_workers > 1:
+            return self._select_move_parallel(game_state)
+        root = self._reused_root(game_state)
+        if root is None and self.table is not None:
+            root = self.table.get(game_state.position_key)
+            if root is not None:
+                root.parent = None
+                root.game_state = game_state  # <1>
+        if root is None:
+            root = MCTSNode(game_state)
+        self._root = root
+        self._path = [root]  # <2>
+        if self.table is not None and game_state.position_key not in self.table:
+            self.table.put(game_state.position_key, root)
+        start = time.perf_counter()
+        time_limit = self._time_limit(game_state)
+        deadline = None if time_limit is None else start + time_limit
 # end::mcts-signature[]
 
 # tag::mcts-rounds[]
-        for i in range(self.num_rounds):
+        num_rounds = 0
+        while self._keep_searching(root, num_rounds, start, deadline):
+            num_rounds += 1
             node = root
-            while (not node.can_add_child()) and (not node.is_terminal()):
-                node = self.select_child(node)
+            path = self._path = [node]  # <3>
+            indices = []  # <4>
+            while (not node.can_add_child(self.max_children(node))) and (not node.is_terminal()):
+                index = self.select_child_index(node)
+                indices.append(index)
+                node = node.children[index]
+                path.append(node)
+                if self.table is not None:
+                    self.table.touch(node.game_state.position_key)  # <5>
 
             # Add a new child node into the tree.
-            if node.can_add_child():
-                node = node.add_random_child()
+            if node.can_add_child(self.max_children(node)):
+                node = node.add_random_child(self.table, path)
+                indices.append(len(path[-1].children) - 1)
+                path.append(node)
 
-            # Simulate a random game from this node.
-            winner = self.simulate_random_game(node.game_state)
+            # Simulate random games from this node.
+            games = self.simulate(node.game_state)
+            num_rollouts = len(games)
+            black_wins = sum(self.black_value(margin, node.game_state) for _, margin in games)
 
             # Propagate scores back up the tree.
-            while node is not None:
-                node.record_win(winner)
-                node = node.parent
+            for node in path:
+                node.record_rollouts(black_wins, num_rollouts)
+            for node, index in zip(path, indices):
+                node.record_child_rollouts(index, black_wins, num_rollouts)
+            if self.rave_equivalence is not None:
+                for rollout_moves, margin in games:
+                    self._record_amaf(path, indices, rollout_moves, Player.black if margin > 0 else Player.white)
 # end::mcts-rounds[]
 
+        rollouts = root.child_rollouts[:len(root.children)]
+        win_pcts = root.child_wins[:len(root.children)] / np.maximum(rollouts, 1)
         scored_moves = [
-            (child.winning_frac(game_state.next_player), child.move, child.num_rollouts)
-            for child in root.children
+            (win_pct, move, num_rollouts)
+            for win_pct, move, num_rollouts in zip(win_pcts, root.child_moves, rollouts)
         ]
         scored_moves.sort(key=lambda x: x[0], reverse=True)
         #for s, m, n in scored_moves[:10]:
@@ -85,45 +373,257 @@ class MCTSAgent(base.Agent):
         # now pick a move.
         best_move = None
         best_pct = -1.0
-        for child in root.children:
-            child_pct = child.winning_frac(game_state.next_player)
+        for child_pct, move, _ in zip(win_pcts, root.child_moves, rollouts):
             if child_pct > best_pct:
                 best_pct = child_pct
-                best_move = child.move
+                best_move = move
+        if self.early_stop and len(rollouts):
+            best_move = root.child_moves[int(np.argmax(rollouts))]  # <6>
         # print('Select move %s with win pct %.3f' % (best_move, best_pct))
+        if self.clock is not None:
+            self.clock.spend(time.perf_counter() - start)
         return best_move
 # end::mcts-selection[]
 
+    # <1> the root always gets the actual game state, so the superko history of the game is the one that counts
+    # at the root, also when its node comes from the tree of the previous move or from the table
+    # <2> the new root and path are in place before anything goes into the table, so an eviction never takes a node
+    # of the line about to be searched
+    # <3> the nodes this round went through; with transpositions a node can have several parents, so the path is
+    # what gets the result, not node.parent
+    # <4> indices[i] is the index of path[i + 1] among the children of path[i]
+    # <5> under 'lru' the nodes in use stay in the table and the ones off the busy lines go first
+    # <6> the stopping rule guarantees the most visited move, not the best win rate
+
+    def simulate(self, game_state):
+        """Play rollouts_per_expansion games out from game_state. Return a (moves, margin) pair for every game: the
+        stones played as for simulate_random_game when RAVE needs them, an empty list otherwise, and black's score
+        minus white's score and komi at the end."""
+        num_games = self.rollouts_per_expansion
+        if game_state.is_over():
+            return [([], score_margin(game_state))] * num_games
+        if self.batch_rollouts:
+            scores = BatchBoard.from_game_state(game_state, num_games).play_out(self.max_rollout_moves, self.mercy)
+            return [([], float(score)) for score in scores]
+        games = []
+        for _ in range(num_games):
+            moves = None if self.rave_equivalence is None else []
+            if self.light_playouts:
+                margin = play_out(game_state, self.max_rollout_moves, moves, self.mercy)
+            else:
+                margin = score_margin(self.play_random_game(game_state, moves, self.max_rollout_moves, self.mercy))
+            games.append(([] if moves is None else moves, margin))
+        return games
+
+    def black_value(self, margin, game_state):
+        """Return what a rollout with the given score margin from game_state is worth to black, from 0 to 1."""
+        won = 1.0 if margin > 0 else 0.0
+        if not self.margin_weight:
+            return won
+        board = game_state.board
+        num_points = board.num_rows * board.num_cols
+        points = min(max(0.5 + margin / (2 * num_points), 0.0), 1.0)
+        return (1 - self.margin_weight) * won + self.margin_weight * points
+
+    @staticmethod
+    def _record_amaf(path, indices, rollout_moves, winner):
+        """Update the AMAF statistics of the nodes on path, from the leaf up."""
+        board = path[0].game_state.board
+        first_player = np.zeros(board.num_rows * board.num_cols + 1, dtype=np.int8)
+        for color, index in reversed(rollout_moves):  # <1>
+            first_player[index] = color
+        path[-1].record_amaf(first_player, winner)
+        for depth in range(len(indices) - 1, -1, -1):
+            node = path[depth]
+            point = node.child_points[indices[depth]]  # <2>
+            if point >= 0:
+                first_player[point] = node.game_state.next_player.value
+            node.record_amaf(first_player, winner)
+
+    # <1> in reverse, so the player who got to a point first has the last word
+    # <2> the move from path[depth] to path[depth + 1], which comes before everything recorded so far
+
+    def max_children(self, node):
+        """Return how many children node may have now, or None if there is no limit."""
+        if self.widening is None:
+            return None
+        return max(1, int(self.widening * node.num_rollouts ** self.widening_exponent))
+
+    def _time_limit(self, game_state):
+        """Return the seconds the search of game_state may take, or None if only num_rounds counts."""
+        time_limit = self.time_limit
+        if self.clock is not None:
+            budget = self.clock.time_for_move(game_state)
+            time_limit = budget if time_limit is None else min(time_limit, budget)
+        return time_limit
+
+    def _keep_searching(self, root, num_rounds, start, deadline):
+        """Decide if another round is worth it, after num_rounds rounds since start."""
+        if num_rounds == 0:
+            return True  # <3>
+        if self.num_rounds is not None and num_rounds >= self.num_rounds:
+            return False
+        if deadline is None and not self.early_stop:
+            return True
+        now = time.perf_counter()
+        if deadline is not None and now >= deadline:
+            return False
+        if not self.early_stop or not root.children:
+            return True
+        rounds_left = math.inf
+        if self.num_rounds is not None:
+            rounds_left = self.num_rounds - num_rounds
+        if deadline is not None and now > start:
+            rounds_left = min(rounds_left, num_rounds / (now - start) * (deadline - now))  # <1>
+        rollouts_left = rounds_left * self.rollouts_per_expansion
+        rollouts = root.child_rollouts
+        if len(rollouts) == 1:
+            return False
+        runner_up, leader = np.partition(rollouts, -2)[-2:]
+        return leader - runner_up <= rollouts_left  # <2>
+
+    # <1> estimated from the rounds per second so far
+    # <2> even if every round left went to the runner up, it would not get more visits than the leader
+    # <3> there is always a first round, so even without any time left the root gets a child to play
+
+    def _select_move_parallel(self, game_state):
+        start = time.perf_counter()
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.num_workers)
+        num_rounds = None
+        if self.num_rounds is not None:
+            num_rounds = -(-self.num_rounds // self.num_workers)  # <1>
+        state = _detached(game_state)
+        jobs = [(state, num_rounds, self._time_limit(game_state), random.getrandbits(32), self._worker_options)
+                for _ in range(self.num_workers)]  # <2>
+
+        totals = {}
+        for moves, rollouts, wins in self._pool.map(_search_root, jobs):
+            for move, num_rollouts, num_wins in zip(moves, rollouts, wins):
+                total = totals.setdefault(move, [0, 0])
+                total[0] += num_rollouts
+                total[1] += num_wins
+        if self.clock is not None:
+            self.clock.spend(time.perf_counter() - start)
+        if not totals:
+            return None
+        if self.early_stop:
+            return max(totals, key=lambda move: totals[move][0])
+        return max(totals, key=lambda move: totals[move][1] / max(totals[move][0], 1))
+
+    # <1> every worker does its share of the rounds, rounded up
+    # <2> the pool processes are forked with the same random state, so every job brings its own seed
+
+    def close(self):
+        """Shut down the worker pool of a root parallel agent."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
 # tag::mcts-uct[]
     def select_child(self, node):
         """Select a child according to the upper confidence bound for
         trees (UCT) metric.
         """
-        total_rollouts = sum(child.num_rollouts for child in node.children)
-        log_rollouts = math.log(total_rollouts)
-
-        best_score = -1
-        best_child = None
-        # Loop over each child.
-        for child in node.children:
-            # Calculate the UCT score.
-            win_percentage = child.winning_frac(node.game_state.next_player)
-            exploration_factor = math.sqrt(log_rollouts / child.num_rollouts)
-            uct_score = win_percentage + self.temperature * exploration_factor
-            # Check if this is the largest we've seen so far.
-            if uct_score > best_score:
-                best_score = uct_score
-                best_child = child
-        return best_child
+        return node.children[self.select_child_index(node)]
+
+    def select_child_index(self, node):
+        """Return the index of the child select_child picks. The UCT score of all children is one array expression
+        over the child statistics of node, and the total is kept up to date by record_child_win."""
+        num_children = len(node.children)
+        rollouts = node.child_rollouts[:num_children]
+        win_percentage = node.child_wins[:num_children] / rollouts
+        if self.rave_equivalence is not None:
+            amaf_rollouts = node.child_amaf_rollouts[:num_children]
+            amaf_percentage = node.child_amaf_wins[:num_children] / np.maximum(amaf_rollouts, 1)
+            beta = np.sqrt(self.rave_equivalence / (3 * rollouts + self.rave_equivalence))
+            win_percentage = (1 - beta) * win_percentage + beta * amaf_percentage
+        exploration_factor = np.sqrt(math.log(node.child_total) / rollouts)
+        uct_score = win_percentage + self.temperature * exploration_factor
+        return int(np.argmax(uct_score))
 # end::mcts-uct[]
 
     @staticmethod
-    def simulate_random_game(game):
+    def simulate_random_game(game, moves=None, max_moves=None):
+        """Play random moves until the game is over and return the winner. If moves is a list, the stones played are
+        appended to it as (Player.value, point index) pairs. After max_moves moves the game is scored as it stands."""
+        game = MCTSAgent.play_random_game(game, moves, max_moves)
+        return Player.black if score_margin(game) > 0 else Player.white
+
+    @staticmethod
+    def play_random_game(game, moves=None, max_moves=None, mercy=None):
+        """Play random moves like simulate_random_game, and return the last GameState. With mercy set, the game
+        also stops as soon as one side has more than mercy stones more on the board than the other."""
         bots = {
             Player.black: RandomBot(),
             Player.white: RandomBot(),
         }
-        while not game.is_over():
+        num_cols = game.board.num_cols
+        num_moves = 0
+        if mercy is not None:
+            lead = stone_lead(game.board)
+            num_empty = len(game.board.empty_points())
+        while not game.is_over() and (max_moves is None or num_moves < max_moves):
             bot_move = bots[game.next_player].select_move(game)
+            if moves is not None and bot_move.is_play:
+                moves.append((game.next_player.value, (bot_move.point.row - 1) * num_cols + bot_move.point.col - 1))
+            player = game.next_player
             game = game.apply_move(bot_move)
-        return game.winner()
\ No newline at end of file
+            num_moves += 1
+            if mercy is not None and bot_move.is_play:
+                previous_empty, num_empty = num_empty, len(game.board.empty_points())
+                gained = 2 + num_empty - previous_empty  # <1>
+                lead += gained if player == Player.black else -gained
+                if abs(lead) > mercy:
+                    break
+        return game
+
+    # <1> the stone played, and one for every captured stone, as in playout.PlayoutBoard.play_out
+
+
+def score_margin(game_state):
+    """Return black's score minus white's score and komi for game_state, finished or not. A resigned game counts as
+    lost by the whole board."""
+    board = game_state.board
+    if game_state.last_move is not None and game_state.last_move.is_resign:
+        num_points = board.num_rows * board.num_cols
+        return num_points if game_state.next_player == Player.black else -num_points  # <1>
+    result = compute_game_result(game_state)
+    return result.b - result.w - result.komi
+
+# <1> the player who resigned is not the one to move
+
+
+def stone_lead(board):
+    """Return black's stones minus white's stones on board."""
+    lead = 0
+    for point in board_geometry((board.num_rows, board.num_cols)).points:
+        color = board.get(point)
+        if color == Player.black:
+            lead += 1
+        elif color == Player.white:
+            lead -= 1
+    return lead
+
+
+def _detached(game_state):
+    """Return a copy of game_state that only keeps the state before it, which is all that is_over looks at, so
+    that sending it to another process doesn't pickle the whole game."""
+    state = copy.copy(game_state)
+    if state.previous_state is not None:
+        state.previous_state = copy.copy(state.previous_state)
+        state.previous_state.previous_state = None
+    return state
+
+
+def _search_root(job):
+    """Search one tree in a worker process; return the moves, rollouts and wins of its root."""
+    game_state, num_rounds, time_limit, seed, options = job
+    random.seed(seed)
+    np.random.seed(seed)
+    agent = MCTSAgent(num_rounds, time_limit=time_limit, reuse_tree=False, **options)
+    agent.select_move(game_state)
+    root = agent._root
+    num_children = len(root.children)
+    return root.child_moves, root.child_rollouts[:num_children].tolist(), root.child_wins[:num_children].tolist()
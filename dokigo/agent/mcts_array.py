@@ -0,0 +1,274 @@
+"""
+Monte Carlo tree search with the tree kept in flat NumPy arrays.
+
+MCTSAgent builds an MCTSNode object per position, each holding a GameState, a dict of win counts, a list of children
+and a list of unvisited moves, which adds up to kilobytes per node. Here a node is just an index into a few
+preallocated arrays, 22 bytes per node:
+
+    visits, wins             rollouts through the node, and how many were won by the player who moved into it
+    parent, first_child,     the tree: the children of a node are the num_children nodes from first_child on
+    num_children
+    num_tried                how many of the children have had a rollout; they are tried in order, and the order is
+                               random
+    move                     the move into the node: a point index of geometry.Geometry, or num_points for a pass
+
+Since the children of a node are next to each other, their statistics are slices of visits and wins, and picking the
+child with the best UCT score is a single NumPy argmax.
+
+No game state is stored at all. Every round replays the moves from the root state down to the node it works on.
+
+A SearchTree made with shared=True keeps its arrays in shared memory, so worker processes can search the same tree
+at once; see ArrayMCTSAgent. A shared tree can't grow, so it has to be made big enough for the whole search.
+"""
+import contextlib
+import ctypes
+import math
+import multiprocessing
+import random
+
+import numpy as np
+
+from dokigo.agent import base
+from dokigo.agent.mcts import MCTSAgent
+from dokigo.geometry import board_geometry
+from dokigo.goboard import Move, move_table
+
+__all__ = [
+    'ArrayMCTSAgent',
+    'SearchTree',
+]
+
+
+FIELDS = [
+    ('visits', np.int32, 0),
+    ('wins', np.float32, 0),
+    ('parent', np.int32, -1),
+    ('first_child', np.int32, -1),
+    ('num_children', np.int16, 0),
+    ('num_tried', np.int16, 0),
+    ('move', np.int16, -1),
+    ('_num_nodes', np.int64, 1),  # <1>
+]
+
+# <1> a single value, the number of nodes in use; node 0 is the root
+
+
+class SearchTree:
+    def __init__(self, capacity=4096, shared=False):
+        self.shared = shared
+        self._buffers = {}  # <1>
+        for name, dtype, fill in FIELDS:
+            size = 1 if name == '_num_nodes' else capacity
+            if shared:
+                self._buffers[name] = multiprocessing.RawArray(ctypes.c_byte, size * np.dtype(dtype).itemsize)
+                array = np.frombuffer(self._buffers[name], dtype=dtype)
+                array[:] = fill
+            else:
+                array = np.full(size, fill, dtype=dtype)
+            setattr(self, name, array)
+
+    # <1> the shared memory behind the arrays of a shared tree
+
+    def __getstate__(self):
+        if not self.shared:
+            return self.__dict__
+        return {'shared': True, '_buffers': self._buffers}  # <1>
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.shared:
+            for name, dtype, _ in FIELDS:
+                setattr(self, name, np.frombuffer(self._buffers[name], dtype=dtype))
+
+    # <1> a worker process gets the shared memory, not a copy of the arrays; multiprocessing only allows this when the
+    # process is started
+
+    @property
+    def capacity(self):
+        return len(self.visits)
+
+    @property
+    def num_nodes(self):
+        return int(self._num_nodes[0])
+
+    @num_nodes.setter
+    def num_nodes(self, num_nodes):
+        self._num_nodes[0] = num_nodes
+
+    def _grow(self, needed):
+        if self.shared:
+            raise ValueError('A shared SearchTree of %d nodes has no room for %d' % (self.capacity, needed))
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name, _, fill in FIELDS:
+            if name == '_num_nodes':
+                continue
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def expand(self, node, moves):
+        """Give node one child per move. The children are tried in random order."""
+        moves = list(moves)
+        random.shuffle(moves)
+        first = self.num_nodes
+        end = first + len(moves)
+        if end > self.capacity:
+            self._grow(end)
+        self.parent[first:end] = node
+        self.move[first:end] = moves
+        self.first_child[node] = first
+        self.num_children[node] = len(moves)
+        self.num_nodes = end
+
+    def is_expanded(self, node):
+        return self.first_child[node] >= 0
+
+    def next_untried(self, node):
+        """Return the next child of node without a rollout, or -1 if all of them have one."""
+        tried = self.num_tried[node]
+        if tried == self.num_children[node]:
+            return -1
+        self.num_tried[node] = tried + 1
+        return int(self.first_child[node] + tried)
+
+    def children(self, node):
+        first = int(self.first_child[node])
+        return range(first, first + int(self.num_children[node]))
+
+    def record(self, path, winner_is_root_player):
+        """Count a rollout for every node on path, a list of nodes from the root down."""
+        self.visits[path] += 1
+        self.wins[path[1::2] if winner_is_root_player else path[0::2]] += 1  # <1>
+
+    # <1> the root player moved into the nodes at odd depth, the opponent into the ones at even depth
+
+
+class ArrayMCTSAgent(base.Agent):
+    """MCTSAgent on a SearchTree. It plays the same algorithm: a node first gets a rollout for each of its moves in
+    random order, after that the child with the best UCT score is followed.
+
+    With num_workers above 1 the search is tree parallel: that many processes search one shared tree, each doing its
+    share of num_rounds. A worker only holds the lock of the tree while it reads or changes it, one step down at a
+    time, and while it backs a result up; replaying the moves and the rollout happen outside it. Every node a worker
+    enters on the way down gets virtual_loss visits without wins, so the line looks worse to the other workers until
+    the real result is backed up and the virtual visits are taken away again. That spreads the workers over
+    different branches instead of sending them all down the current best one.
+    """
+
+    def __init__(self, num_rounds, temperature, num_workers=1, virtual_loss=3):
+        base.Agent.__init__(self)
+        if num_workers > 1 and virtual_loss < 1:
+            raise ValueError('Tree parallel search needs a virtual loss of at least one visit')
+        self.num_rounds = num_rounds
+        self.temperature = temperature
+        self.num_workers = num_workers
+        self.virtual_loss = virtual_loss
+
+    def select_move(self, game_state):
+        board = game_state.board
+        moves = move_table((board.num_rows, board.num_cols)) + [Move.pass_turn()]  # <1>
+        if self.num_workers > 1:
+            tree = self._search_parallel(game_state)
+        else:
+            tree = SearchTree()
+            self._search(tree, game_state, self.num_rounds)
+
+        best_move = None
+        best_pct = -1.0
+        for child in tree.children(0):
+            if tree.visits[child] == 0:
+                continue
+            child_pct = tree.wins[child] / tree.visits[child]
+            if child_pct > best_pct:
+                best_pct = child_pct
+                best_move = moves[tree.move[child]]
+        return best_move
+
+    # <1> moves[move index] is the Move for a move index of the tree
+
+    def _search(self, tree, game_state, num_rounds, lock=None):
+        """Play num_rounds rounds on tree, whose root is game_state. With a lock, other workers search the same tree
+        at the same time."""
+        board = game_state.board
+        geometry = board_geometry((board.num_rows, board.num_cols))
+        moves = move_table((board.num_rows, board.num_cols)) + [Move.pass_turn()]
+        root_player = game_state.next_player
+        virtual_loss = 0
+        if lock is None:
+            lock = contextlib.nullcontext()
+        else:
+            virtual_loss = self.virtual_loss
+
+        for i in range(num_rounds):
+            node = 0
+            path = [node]
+            state = game_state
+            with lock:
+                tree.visits[node] += virtual_loss
+            while not state.is_over():
+                if not tree.is_expanded(node):
+                    legal_moves = [geometry.index(point) for point in state.legal_points()] + [geometry.num_points]
+                    with lock:
+                        if not tree.is_expanded(node):  # <1>
+                            tree.expand(node, legal_moves)
+                with lock:
+                    child = tree.next_untried(node)
+                    if child < 0:
+                        child = self.select_child(tree, node)
+                    is_new = tree.visits[child] == 0
+                    tree.visits[child] += virtual_loss
+                state = state.apply_move(moves[tree.move[child]])  # <2>
+                node = child
+                path.append(node)
+                if is_new:
+                    break
+
+            winner = MCTSAgent.simulate_random_game(state)
+            with lock:
+                tree.visits[path] -= virtual_loss
+                tree.record(path, winner == root_player)
+
+    # <1> another worker may have expanded the node while the moves were listed
+    # <2> replay the move instead of storing the state; stop at the first node without a rollout
+
+    def _search_parallel(self, game_state):
+        board = game_state.board
+        num_points = board.num_rows * board.num_cols
+        tree = SearchTree(self.num_rounds * (num_points + 1) + 1, shared=True)  # <1>
+        lock = multiprocessing.Lock()
+        workers = []
+        for worker in range(self.num_workers):
+            num_rounds = self.num_rounds // self.num_workers + (worker < self.num_rounds % self.num_workers)
+            seed = random.randrange(2 ** 32)  # <2>
+            process = multiprocessing.Process(target=_search_worker,
+                                              args=(self, tree, game_state, num_rounds, lock, seed))
+            process.start()
+            workers.append(process)
+        for process in workers:
+            process.join()
+        if any(process.exitcode != 0 for process in workers):
+            raise RuntimeError('A tree parallel search worker failed')
+        return tree
+
+    # <1> a round expands at most one node, by at most every point and a pass
+    # <2> forked workers start with the random state of this process, so every worker brings its own seed
+
+    def select_child(self, tree, node):
+        """Select a child according to the upper confidence bound for trees (UCT) metric. The parent's visit count is
+        the total of the log term, it is kept up to date by SearchTree.record."""
+        first = tree.first_child[node]
+        end = first + tree.num_children[node]
+        visits = tree.visits[first:end]
+        uct_score = tree.wins[first:end] / visits + \
+            self.temperature * np.sqrt(math.log(tree.visits[node]) / visits)
+        return int(first + np.argmax(uct_score))
+
+
+def _search_worker(agent, tree, game_state, num_rounds, lock, seed):
+    """Search the shared tree in a worker process of ArrayMCTSAgent._search_parallel."""
+    random.seed(seed)
+    np.random.seed(seed)
+    agent._search(tree, game_state, num_rounds, lock)
@@ -0,0 +1,33 @@
+"""
+Time control for searching agents.
+
+A GameClock holds the main time left for one player's moves and hands out a budget per move. The expected number
+of moves still to play is estimated from the empty points: each side fills about half of them before the game ends.
+The budget is the time left, minus a safety margin, spread evenly over those moves, so the agent thinks longer early
+in the game when the moves matter most and never runs out of time.
+"""
+
+__all__ = [
+    'GameClock',
+]
+
+
+class GameClock:
+    def __init__(self, main_time, min_moves_left=10, safety_margin=0.5):
+        self.remaining = main_time  # <1>
+        self.min_moves_left = min_moves_left  # <2>
+        self.safety_margin = safety_margin  # <3>
+
+    # <1> seconds left on the clock
+    # <2> never plan for fewer moves than this, so the last moves of the game still get some time
+    # <3> seconds kept back for the time spent outside the search
+
+    def moves_left(self, game_state):
+        return max(self.min_moves_left, len(game_state.board.empty_points()) // 2)
+
+    def time_for_move(self, game_state):
+        """Return the number of seconds to spend on the next move of game_state."""
+        return max(0.0, self.remaining - self.safety_margin) / self.moves_left(game_state)
+
+    def spend(self, seconds):
+        self.remaining -= seconds
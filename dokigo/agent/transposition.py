@@ -0,0 +1,89 @@
+"""
+A bounded transposition table for tree search.
+
+The same position is often reached by different move orders. A TranspositionTable maps GameState.position_key to the
+search node of that position, so the search can share one node, and its statistics, between all of them. The table
+holds at most capacity nodes. When it is full, adding a node evicts another one, chosen by the eviction policy:
+
+    'lru'   the node that was looked up, touched or added longest ago
+    'fifo'  the node that was added first
+
+An evicted node is only forgotten by the table; the caller decides what else to do with it through on_evict. A
+search refreshes the nodes it walks through with touch, so under 'lru' the busy top of the tree stays, and it can
+protect nodes from eviction with can_evict, for example the ones on the path it is working on.
+"""
+from collections import OrderedDict
+
+__all__ = [
+    'TranspositionTable',
+]
+
+EVICTION_POLICIES = ('lru', 'fifo')
+
+
+class TranspositionTable:
+    def __init__(self, capacity, policy='lru', on_evict=None, can_evict=None):
+        if capacity < 1:
+            raise ValueError('A transposition table needs room for at least one node')
+        if policy not in EVICTION_POLICIES:
+            raise ValueError('Unknown eviction policy %r, use one of %s' % (policy, ', '.join(EVICTION_POLICIES)))
+        self.capacity = capacity
+        self.policy = policy
+        self.on_evict = on_evict  # <1>
+        self.can_evict = can_evict  # <3>
+        self._nodes = OrderedDict()  # <2>
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # <1> called with every evicted node
+    # <2> the first entry is the next one to be evicted
+    # <3> called with an eviction candidate; if it returns False the next oldest node is tried instead. When no node
+    # may go, the table holds more than capacity nodes until one may.
+
+    def get(self, key):
+        """Return the node stored for key, or None."""
+        node = self._nodes.get(key)
+        if node is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.policy == 'lru':
+            self._nodes.move_to_end(key)
+        return node
+
+    def put(self, key, node):
+        """Store node for key, evicting a node if the table is full."""
+        if key in self._nodes:
+            self._nodes[key] = node
+            if self.policy == 'lru':
+                self._nodes.move_to_end(key)
+            return
+        if len(self._nodes) >= self.capacity:
+            self._evict()
+        self._nodes[key] = node
+
+    def touch(self, key):
+        """Mark the node stored for key as just used, if there is one. Only the 'lru' policy cares."""
+        if self.policy == 'lru' and key in self._nodes:
+            self._nodes.move_to_end(key)
+
+    def _evict(self):
+        for key, node in self._nodes.items():
+            if self.can_evict is None or self.can_evict(node):
+                break
+        else:
+            return
+        del self._nodes[key]
+        self.evictions += 1
+        if self.on_evict is not None:
+            self.on_evict(node)
+
+    def clear(self):
+        self._nodes.clear()
+
+    def __contains__(self, key):
+        return key in self._nodes
+
+    def __len__(self):
+        return len(self._nodes)
@@ -1,4 +1,4 @@
-from dokigo.base import Point
+from dokigo.geometry import board_geometry
 
 
 __all__=['is_point_an_eye']
@@ -7,33 +7,28 @@ __all__=['is_point_an_eye']
 #This implementation doesn't cover all the cases where an point is an eye. For simplicity, let's keep it for now.
 
 def is_point_an_eye(board, point, color):
+    if hasattr(board, 'is_point_an_eye'):  # bitboard.BitBoard tests this with a few masks
+        return board.is_point_an_eye(point, color)
+
     if board.get(point) is not None:
         return False
 
-    for neighbor in point.neighbors():
-        if board.is_on_grid(neighbor):
-            neighbor_color = board.get(neighbor)
-            if neighbor_color != color:
-                return False
+    geometry = board_geometry((board.num_rows, board.num_cols))  # neighbors and corners are looked up, not rebuilt
+    index = geometry.index(point)
+    for neighbor in geometry.neighbor_points[index]:
+        neighbor_color = board.get(neighbor)
+        if neighbor_color != color:
+            return False
 
     friendly_corners = 0
-    off_board_corners =0
-
-    corners = [
-        Point(point.row-1, point.col-1),
-        Point(point.row - 1, point.col + 1),
-        Point(point.row + 1, point.col - 1),
-        Point(point.row + 1, point.col + 1),
-    ]
+    corners = geometry.diagonal_points[index]
+    off_board_corners = 4 - len(corners)
 
     for corner in corners:
-        if board.is_on_grid(corner):
-            corner_color = board.get(corner)
-            if corner_color == color:
-                friendly_corners += 1
-        else:
-            off_board_corners += 1
+        corner_color = board.get(corner)
+        if corner_color == color:
+            friendly_corners += 1
 
     if off_board_corners > 0:
         return off_board_corners+friendly_corners == 4
-    return friendly_corners >=3
\ No newline at end of file
+    return friendly_corners >=3
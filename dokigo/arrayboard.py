@@ -0,0 +1,514 @@
+"""
+An array backed go board, a drop-in replacement for goboard.Board.
+
+Everything lives in flat integer lists. Point (row, col) is index row * (num_cols + 2) + col, so a border of BORDER
+sentinels surrounds the board and the neighbors of index i are i - stride, i + stride, i - 1 and i + 1.
+
+Every stone points straight at the root stone of its string, which holds the number of stones and the pseudo
+liberties of the string, so finding the string of a stone is one lookup. The stones of a string also form a circular
+linked list (next_stone), so a string can be walked without a flood fill. Merging two strings splices the two lists
+and points the stones of the smaller string at the root of the larger one; undo walks the smaller string again to
+point it back. A stone is relabeled at most log2(n) times that way.
+
+Pseudo liberties count every (stone, empty neighbor) pair of a string, so a liberty next to two stones of the string
+counts twice. Unlike real liberties they can be updated in O(1) when a stone is placed, captured or merged. A string
+is captured when it has no pseudo liberties, and it is in atari when all its pseudo liberties are the same point,
+which we know from their count, their sum and the sum of their squares: n * sum_of_squares == sum * sum. The exact
+liberties are only counted when someone asks for a GoString.
+"""
+import itertools
+from collections import namedtuple
+
+from dokigo.base import Player
+from dokigo.geometry import board_geometry
+from dokigo.goboard import GoString, neighbor_tables, corner_tables, init_neighbor_table, init_corner_table
+from dokigo import zobrist
+
+__all__ = [
+    'ArrayBoard',
+]
+
+EMPTY = 0
+BLACK = Player.black.value
+WHITE = Player.white.value
+BORDER = 3
+
+COLOR_TO_PLAYER = {
+    BLACK: Player.black,
+    WHITE: Player.white,
+}
+
+hash_tables = {}  # <1>
+mark_tables = {}  # <2>
+point_tables = {}  # <3>
+mark_ids = itertools.count(1)
+
+
+# <1> hash_tables[dim, hash_bits][color][index] is the zobrist code of a stone of the given color on the given index
+# <2> scratch marks for liberty counting, shared by all boards of the same size
+# <3> point_tables[dim][index] is the Point at the given index
+
+
+def init_hash_table(dim, hash_bits=64):
+    rows, cols = dim
+    stride = cols + 2
+    size = (rows + 2) * stride
+    table = [None, [0] * size, [0] * size]
+    codes = zobrist.hash_table(dim, hash_bits)
+    for color in (BLACK, WHITE):
+        for index, point in enumerate(board_geometry(dim).points):
+            table[color][point.row * stride + point.col] = codes[color][index]
+    hash_tables[dim, hash_bits] = table
+
+
+def init_point_table(dim):
+    rows, cols = dim
+    stride = cols + 2
+    table = [None] * ((rows + 2) * stride)
+    for point in board_geometry(dim).points:  # <1>
+        table[point.row * stride + point.col] = point
+    point_tables[dim] = table
+
+# <1> reuse the interned Points
+
+
+class MoveRecord(namedtuple('MoveRecord', 'index hash parent next_stone num_stones merges liberties captured')):
+    """Everything ArrayBoard.undo needs to take a move back: the previous hash and links of the played point, the
+    merged strings, the old pseudo liberties of every string that changed and the captured strings."""
+    pass
+
+
+class ArrayBoard:
+    def __init__(self, num_rows, num_cols, hash_bits=64):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.hash_bits = hash_bits
+        self._stride = num_cols + 2
+        size = (num_rows + 2) * self._stride
+        self._stones = [BORDER] * size
+        for row in range(1, num_rows + 1):
+            for col in range(1, num_cols + 1):
+                self._stones[row * self._stride + col] = EMPTY
+        self._parent = [0] * size  # <1>
+        self._next_stone = [0] * size  # <2>
+        self._num_stones = [0] * size  # <3>
+        self._liberties = [0] * size  # <3>
+        self._liberty_sum = [0] * size  # <3>
+        self._liberty_sum_squares = [0] * size  # <3>
+        self._empty = [index for index in range(size) if self._stones[index] == EMPTY]  # <4>
+        self._empty_position = [0] * size
+        for position, index in enumerate(self._empty):
+            self._empty_position[index] = position
+        self._hash = zobrist.EMPTY_BOARD
+
+        dim = (num_rows, num_cols)
+        if (dim, hash_bits) not in hash_tables:
+            init_hash_table(dim, hash_bits)
+        if dim not in neighbor_tables:
+            init_neighbor_table(dim)
+        if dim not in corner_tables:
+            init_corner_table(dim)
+        if dim not in mark_tables:
+            mark_tables[dim] = [0] * size
+        if dim not in point_tables:
+            init_point_table(dim)
+        self._hash_table = hash_tables[dim, hash_bits]
+        self._marks = mark_tables[dim]
+        self._points = point_tables[dim]
+        self._offsets = (-self._stride, self._stride, -1, 1)
+        self._diagonal_offsets = (-self._stride - 1, -self._stride + 1, self._stride - 1, self._stride + 1)
+        self.neighbor_table = neighbor_tables[dim]
+        self.corner_table = corner_tables[dim]
+
+    # <1> the root stone of the string of a stone, a root is its own parent
+    # <2> the stones of a string form a circular linked list
+    # <3> only meaningful on the root stone of a string; _liberties are pseudo liberties
+    # <4> the indices of the empty points, in no particular order; _empty_position[i] is where i is in _empty
+
+    def neighbors(self, point):
+        return self.neighbor_table[point]
+
+    def corners(self, point):
+        return self.corner_table[point]
+
+    def _index(self, point):
+        return point.row * self._stride + point.col
+
+    def _point(self, index):
+        return self._points[index]
+
+    def _add_empty(self, index):
+        self._empty_position[index] = len(self._empty)
+        self._empty.append(index)
+
+    def _remove_empty(self, index):
+        last = self._empty.pop()  # <1>
+        if last != index:
+            position = self._empty_position[index]
+            self._empty[position] = last
+            self._empty_position[last] = position
+
+    # <1> move the last empty point into the hole, so removal is O(1)
+
+    def empty_points(self):
+        """Return the empty points of the board."""
+        points = self._points
+        return [points[index] for index in self._empty]
+
+    def _in_atari(self, root):
+        num_liberties = self._liberties[root]
+        liberty_sum = self._liberty_sum[root]
+        return num_liberties > 0 and num_liberties * self._liberty_sum_squares[root] == liberty_sum * liberty_sum
+
+    def _string_stones(self, root):
+        next_stone = self._next_stone
+        stones = [root]
+        stone = next_stone[root]
+        while stone != root:
+            stones.append(stone)
+            stone = next_stone[stone]
+        return stones
+
+    def place_stone(self, player, point):
+        assert self.is_on_grid(point)  # make sure it is on grid
+        self._place_stone(player.value, point.row * self._stride + point.col, None)
+
+    def play(self, player, move):
+        """Play a move on this board in place and return an undo record.
+
+        Passing the record to undo() takes the move back, so search code can walk one board forward and back
+        instead of copying it on every move. Records have to be undone in reverse order.
+        """
+        if not move.is_play:
+            return None
+        assert self.is_on_grid(move.point)
+        index = move.point.row * self._stride + move.point.col
+        record = MoveRecord(index, self._hash,
+                            self._parent[index], self._next_stone[index], self._num_stones[index], [], [], [])
+        self._place_stone(player.value, index, record)
+        return record
+
+    def undo(self, record):
+        """Take back the move that returned the record."""
+        if record is None:
+            return
+        stones = self._stones
+        parent = self._parent
+        next_stone = self._next_stone
+        for captured_root, color in record.captured:  # <1>
+            stone = captured_root
+            while True:
+                stones[stone] = color
+                self._remove_empty(stone)
+                stone = next_stone[stone]
+                if stone == captured_root:
+                    break
+        liberties = self._liberties
+        liberty_sum = self._liberty_sum
+        liberty_sum_squares = self._liberty_sum_squares
+        for root, num_liberties, total, total_squares in reversed(record.liberties):
+            liberties[root] = num_liberties
+            liberty_sum[root] = total
+            liberty_sum_squares[root] = total_squares
+        for root_a, root_b, next_a, next_b in reversed(record.merges):
+            next_stone[root_a] = next_a
+            next_stone[root_b] = next_b
+            self._num_stones[root_a] -= self._num_stones[root_b]
+            stone = root_b
+            while True:
+                parent[stone] = root_b
+                stone = next_stone[stone]
+                if stone == root_b:
+                    break
+        index = record.index
+        stones[index] = EMPTY
+        self._add_empty(index)
+        parent[index] = record.parent
+        next_stone[index] = record.next_stone
+        self._num_stones[index] = record.num_stones
+        self._hash = record.hash
+
+    # <1> captured stones keep their parents and list links, so a captured string can be put back by walking its list
+
+    def _log_liberties(self, record, root):
+        record.liberties.append((root, self._liberties[root],
+                                 self._liberty_sum[root], self._liberty_sum_squares[root]))
+
+    def _place_stone(self, color, index, record):
+        stones = self._stones
+        liberties = self._liberties
+        liberty_sum = self._liberty_sum
+        liberty_sum_squares = self._liberty_sum_squares
+        assert stones[index] == EMPTY  # no existing stone on point
+        stones[index] = color
+        self._remove_empty(index)
+        self._parent[index] = index
+        self._next_stone[index] = index
+        self._num_stones[index] = 1
+        self._hash ^= self._hash_table[color][index]
+
+        # 0. The new stone takes a pseudo liberty from every adjacent stone, and gets one for every empty neighbor.
+        own_liberties = 0
+        own_sum = 0
+        own_sum_squares = 0
+        own_roots = []
+        opposite_roots = []
+        for offset in self._offsets:
+            neighbor = index + offset
+            neighbor_color = stones[neighbor]
+            if neighbor_color == EMPTY:
+                own_liberties += 1
+                own_sum += neighbor
+                own_sum_squares += neighbor * neighbor
+            elif neighbor_color != BORDER:
+                root = self._parent[neighbor]
+                if record is not None:
+                    self._log_liberties(record, root)
+                liberties[root] -= 1
+                liberty_sum[root] -= index
+                liberty_sum_squares[root] -= index * index
+                if neighbor_color == color:
+                    if root not in own_roots:
+                        own_roots.append(root)
+                elif root not in opposite_roots:
+                    opposite_roots.append(root)
+        liberties[index] = own_liberties
+        liberty_sum[index] = own_sum
+        liberty_sum_squares[index] = own_sum_squares
+
+        # 1. Merge any adjacent strings of the same color.
+        own_root = index
+        for root in own_roots:
+            own_root = self._merge(own_root, root, record)
+
+        # 2. If any adjacent opposite color strings now have no liberties, remove them.
+        for opposite_root in opposite_roots:
+            if liberties[opposite_root] == 0:
+                self._remove_string(opposite_root, record)
+
+    def _merge(self, root_a, root_b, record):
+        """Merge two strings of the same color and return the root of the merged string."""
+        if self._num_stones[root_a] < self._num_stones[root_b]:
+            root_a, root_b = root_b, root_a
+        next_stone = self._next_stone
+        if record is not None:
+            record.merges.append((root_a, root_b, next_stone[root_a], next_stone[root_b]))
+            self._log_liberties(record, root_a)
+        parent = self._parent
+        stone = root_b
+        while True:  # <1>
+            parent[stone] = root_a
+            stone = next_stone[stone]
+            if stone == root_b:
+                break
+        next_stone[root_a], next_stone[root_b] = next_stone[root_b], next_stone[root_a]  # <2>
+        self._num_stones[root_a] += self._num_stones[root_b]
+        self._liberties[root_a] += self._liberties[root_b]
+        self._liberty_sum[root_a] += self._liberty_sum[root_b]
+        self._liberty_sum_squares[root_a] += self._liberty_sum_squares[root_b]
+        return root_a
+
+    # <1> point the stones of the smaller string at the root of the larger one
+    # <2> splice the two circular lists into one
+
+    def _count_liberties(self, root):
+        """Return the exact number of liberties of a string."""
+        stones = self._stones
+        next_stone = self._next_stone
+        marks = self._marks
+        mark_id = next(mark_ids)  # <1>
+        count = 0
+        stone = root
+        while True:
+            for offset in self._offsets:
+                neighbor = stone + offset
+                if stones[neighbor] == EMPTY and marks[neighbor] != mark_id:
+                    marks[neighbor] = mark_id
+                    count += 1
+            stone = next_stone[stone]
+            if stone == root:
+                return count
+
+    # <1> marks[i] == mark_id means i was already counted, so no set has to be allocated for a recount
+
+    def _remove_string(self, root, record):
+        stones = self._stones
+        liberties = self._liberties
+        liberty_sum = self._liberty_sum
+        liberty_sum_squares = self._liberty_sum_squares
+        removed = self._string_stones(root)
+        if record is not None:
+            record.captured.append((root, stones[root]))
+        table = self._hash_table[stones[root]]
+        for stone in removed:
+            stones[stone] = EMPTY
+            self._add_empty(stone)
+            # Remove filled point hash code.
+            self._hash ^= table[stone]
+        for stone in removed:
+            # Removing a string gives every adjacent stone a pseudo liberty.
+            for offset in self._offsets:
+                neighbor = stone + offset
+                if stones[neighbor] == EMPTY or stones[neighbor] == BORDER:
+                    continue
+                neighbor_root = self._parent[neighbor]
+                if record is not None:
+                    self._log_liberties(record, neighbor_root)
+                liberties[neighbor_root] += 1
+                liberty_sum[neighbor_root] += stone
+                liberty_sum_squares[neighbor_root] += stone * stone
+
+    def is_self_capture(self, player, point):
+        index = point.row * self._stride + point.col
+        stones = self._stones
+        for offset in self._offsets:  # <1>
+            if stones[index + offset] == EMPTY:
+                return False
+        return self._is_self_capture(player.value, index)
+
+    # <1> most points have an empty neighbor, so that is ruled out before looking at any string
+
+    def _is_self_capture(self, color, index):
+        stones = self._stones
+        parent = self._parent
+        liberties = self._liberties
+        liberty_sum = self._liberty_sum
+        liberty_sum_squares = self._liberty_sum_squares
+        for offset in self._offsets:
+            neighbor = index + offset
+            neighbor_color = stones[neighbor]
+            if neighbor_color == EMPTY:
+                # This point has a liberty. Can't be self capture.
+                return False
+            elif neighbor_color != BORDER:
+                root = parent[neighbor]
+                total = liberty_sum[root]
+                in_atari = liberties[root] * liberty_sum_squares[root] == total * total  # <1>
+                if neighbor_color == color:
+                    if not in_atari:
+                        # A friendly string with another liberty keeps the stone alive.
+                        return False
+                elif in_atari:
+                    # This move is real capture, not a self capture.
+                    return False
+        return True
+
+    # <1> _in_atari written out; a string next to the empty point index always has a pseudo liberty
+
+    def is_on_grid(self, point):
+        return 1 <= point.row <= self.num_rows and \
+               1 <= point.col <= self.num_cols
+
+    def is_point_an_eye(self, point, color):
+        """ArrayBoard version of agent.utilities.is_point_an_eye, on the padded indices instead of Points."""
+        stones = self._stones
+        index = point.row * self._stride + point.col
+        if stones[index] != EMPTY:
+            return False
+        color = color.value
+        for offset in self._offsets:
+            neighbor_color = stones[index + offset]
+            if neighbor_color != color and neighbor_color != BORDER:
+                return False
+        friendly_corners = 0
+        off_board_corners = 0
+        for offset in self._diagonal_offsets:
+            corner_color = stones[index + offset]
+            if corner_color == color:
+                friendly_corners += 1
+            elif corner_color == BORDER:
+                off_board_corners += 1
+        if off_board_corners > 0:
+            return off_board_corners + friendly_corners == 4
+        return friendly_corners >= 3
+
+    def get(self, point):
+        """Return the content of a point on the board.
+
+        Returns None if the point is empty, or a Player if there is a
+        stone on that point.
+        """
+        return COLOR_TO_PLAYER.get(self._stones[point.row * self._stride + point.col])
+
+    def get_go_string(self, point):
+        """Return the entire string of stones at a point.
+
+        Returns None if the point is empty, or a GoString if there is
+        a stone on that point. The GoString is built on demand from the arrays.
+        """
+        index = point.row * self._stride + point.col
+        color = COLOR_TO_PLAYER.get(self._stones[index])
+        if color is None:
+            return None
+        stones = self._string_stones(self._parent[index])
+        marks = self._marks
+        mark_id = next(mark_ids)
+        liberties = []
+        for stone in stones:
+            for offset in self._offsets:
+                neighbor = stone + offset
+                if self._stones[neighbor] == EMPTY and marks[neighbor] != mark_id:
+                    marks[neighbor] = mark_id
+                    liberties.append(neighbor)
+        points = self._points
+        return GoString(color,
+                        [points[stone] for stone in stones],
+                        lambda: [points[liberty] for liberty in liberties],  # <1>
+                        len(liberties))
+
+    # <1> the liberty Points are only made if someone reads GoString.liberties; most callers just want the count
+
+    def __eq__(self, other):
+        return isinstance(other, ArrayBoard) and \
+               self.num_rows == other.num_rows and \
+               self.num_cols == other.num_cols and \
+               self._stones == other._stones
+
+    def __deepcopy__(self, memodict={}):
+        copied = ArrayBoard.__new__(ArrayBoard)
+        copied.__dict__.update(self.__dict__)  # <1>
+        copied._stones = self._stones[:]
+        copied._parent = self._parent[:]
+        copied._next_stone = self._next_stone[:]
+        copied._num_stones = self._num_stones[:]
+        copied._liberties = self._liberties[:]
+        copied._liberty_sum = self._liberty_sum[:]
+        copied._liberty_sum_squares = self._liberty_sum_squares[:]
+        copied._empty = self._empty[:]
+        copied._empty_position = self._empty_position[:]
+        return copied
+
+    # <1> the geometry and hash tables are shared, only the state arrays are copied.
+
+    def position(self):
+        """Return the full position as a hashable value, for checking that equal hashes mean equal positions."""
+        return tuple(self._stones)
+
+    def zobrist_hash(self):
+        return self._hash
+
+    def zobrist_hash_after(self, player, point):
+        """Return the hash the board would have after player places a stone on point, without changing the board."""
+        index = point.row * self._stride + point.col
+        stones = self._stones
+        color = player.value
+        opposite = BLACK + WHITE - color
+        new_hash = self._hash ^ self._hash_table[color][index]
+        captured = ()
+        for offset in self._offsets:
+            neighbor = index + offset
+            if stones[neighbor] != opposite:
+                continue
+            neighbor_root = self._parent[neighbor]
+            if neighbor_root not in captured and self._in_atari(neighbor_root):  # <1>
+                captured += (neighbor_root,)
+                table = self._hash_table[opposite]
+                stone = neighbor_root
+                while True:
+                    new_hash ^= table[stone]
+                    stone = self._next_stone[stone]
+                    if stone == neighbor_root:
+                        break
+        return new_hash
+
+    # <1> an adjacent opposite color string in atari gets captured, so its stones leave the hash
@@ -3,7 +3,8 @@ from collections import namedtuple
 
 __all__ = [
     'Player',
-    'Point'
+    'Point',
+    'point_table',
 ]
 
 class Player(enum.Enum):
@@ -16,8 +17,25 @@ class Player(enum.Enum):
 
 
 class Point(namedtuple('Point',['row','col'])):
+    __slots__ = ()
+
     def neighbors(self):
         return [Point(self.row-1,self.col),
                 Point(self.row+1,self.col),
                 Point(self.row, self.col-1),
                 Point(self.row,self.col+1)]
+
+
+point_tables = {}  # <1>
+
+
+def point_table(dim):
+    """Return the interned Points of a board of size dim = (num_rows, num_cols) in row major order, so the Point at
+    (row, col) is point_table(dim)[(row - 1) * num_cols + (col - 1)]. Hot loops can reuse these instead of
+    allocating new Points."""
+    if dim not in point_tables:
+        rows, cols = dim
+        point_tables[dim] = [Point(row=r, col=c) for r in range(1, rows + 1) for c in range(1, cols + 1)]
+    return point_tables[dim]
+
+# <1> point_tables[(9, 9)] holds the 81 Points of a 9x9 board
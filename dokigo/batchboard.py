@@ -0,0 +1,266 @@
+"""
+Step many independent games at once with NumPy.
+
+A BatchBoard holds K games in one int8 array of shape (K, rows, cols), and every move is played in all K games by
+the same few array operations. It is meant for random playouts, so it knows only the simple ko rule.
+"""
+import numpy as np
+
+from dokigo.base import Player
+from dokigo.geometry import board_geometry
+from dokigo.scoring import KOMI
+
+__all__ = [
+    'BatchBoard',
+]
+
+EMPTY = 0
+BLACK = Player.black.value
+WHITE = Player.white.value
+
+
+def _dilate(mask):
+    """Return the points next to a point of mask, for every board of the batch."""
+    grown = np.zeros_like(mask)
+    grown[:, 1:, :] |= mask[:, :-1, :]
+    grown[:, :-1, :] |= mask[:, 1:, :]
+    grown[:, :, 1:] |= mask[:, :, :-1]
+    grown[:, :, :-1] |= mask[:, :, 1:]
+    return grown
+
+
+def _count_neighbors(mask):
+    """Return for every point how many of its neighbors are in mask."""
+    count = np.zeros(mask.shape, dtype=np.int8)
+    count[:, 1:, :] += mask[:, :-1, :]
+    count[:, :-1, :] += mask[:, 1:, :]
+    count[:, :, 1:] += mask[:, :, :-1]
+    count[:, :, :-1] += mask[:, :, 1:]
+    return count
+
+
+def _reach(seed, plane):
+    """Return the points of plane connected to seed, for every board of the batch."""
+    region = seed & plane
+    size = np.count_nonzero(region)
+    while True:
+        region = (region | _dilate(region)) & plane
+        grown_size = np.count_nonzero(region)  # <1>
+        if grown_size == size:
+            return region
+        size = grown_size
+
+# <1> the region only ever grows, so it stopped changing when its size did
+
+
+def _string_has_liberty(stones, colors, starts, next_to_empty):
+    """Grow the string of colors[m] through the flat point starts[m] of board m of stones, for every m, until it
+    reaches a point of next_to_empty[m]. Return whether it did, and the strings that did not, grown to the end.
+
+    A string with a liberty nearby costs a step or two this way; only a string without any is grown all the way.
+    """
+    num_strings = len(stones)
+    rows = np.arange(num_strings)
+    alive = next_to_empty.reshape(num_strings, -1)[rows, starts]
+    dead = np.zeros_like(stones, dtype=bool)
+    pending = np.nonzero(~alive)[0]  # <1>
+    plane = stones[pending] == colors[pending, None, None]
+    next_to_empty = next_to_empty[pending] & plane
+    region = np.zeros_like(plane)
+    region.reshape(len(pending), -1)[np.arange(len(pending)), starts[pending]] = True
+    while len(pending):
+        grown = (region | _dilate(region)) & plane
+        reached = (grown & next_to_empty).any(axis=(1, 2))
+        stopped = ~reached & (grown.sum(axis=(1, 2)) == region.sum(axis=(1, 2)))
+        alive[pending[reached]] = True
+        dead[pending[stopped]] = grown[stopped]
+        growing = ~reached & ~stopped
+        pending, region, plane, next_to_empty = pending[growing], grown[growing], plane[growing], next_to_empty[growing]
+    return alive, dead
+
+# <1> only the strings still growing are kept in the arrays, so every step works on fewer boards
+
+
+class BatchBoard:
+    def __init__(self, num_games, num_rows, num_cols):
+        self.num_games = num_games
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.stones = np.zeros((num_games, num_rows, num_cols), dtype=np.int8)
+        self.next_player = np.full(num_games, BLACK, dtype=np.int8)
+        self.ko_point = np.full(num_games, -1, dtype=np.int64)  # <1>
+        self.passes = np.zeros(num_games, dtype=np.int8)  # <2>
+        self.num_moves = np.zeros(num_games, dtype=np.int64)
+        self._games = np.arange(num_games)
+
+        geometry = board_geometry((num_rows, num_cols))
+        self._num_neighbors = (geometry.neighbors >= 0).sum(axis=1).reshape(num_rows, num_cols)  # <3>
+        self._num_corners = (geometry.diagonals >= 0).sum(axis=1).reshape(num_rows, num_cols)
+        self._neighbors = geometry.neighbors
+        self._second_neighbors = np.where(geometry.neighbors[:, :, None] >= 0,
+                                          geometry.neighbors[geometry.neighbors], -1)  # <4>
+
+    # <1> flat index of the point that can't be played because of ko, -1 if there is none
+    # <2> number of passes in a row; a game is over after two
+    # <3> number of on board neighbors and diagonals of every point
+    # <4> _second_neighbors[i, j] are the neighbors of the j-th neighbor of i, -1 off the board
+
+    @classmethod
+    def from_game_state(cls, game_state, num_games):
+        """Return a batch of num_games copies of the position of game_state."""
+        board = game_state.board
+        batch = cls(num_games, board.num_rows, board.num_cols)
+        for index, point in enumerate(board_geometry((board.num_rows, board.num_cols)).points):
+            color = board.get(point)
+            if color is not None:
+                batch.stones.reshape(num_games, -1)[:, index] = color.value
+        batch.next_player[:] = game_state.next_player.value
+        if game_state.ko_point is not None:
+            batch.ko_point[:] = (game_state.ko_point.row - 1) * board.num_cols + game_state.ko_point.col - 1
+        batch.passes[:] = min(game_state.num_passes, 2)
+        return batch
+
+    @property
+    def is_over(self):
+        return self.passes >= 2
+
+    def _own_eyes(self):
+        """Return the empty points that are an eye of the player to move, see agent.utilities.is_point_an_eye."""
+        own = self.stones == self.next_player[:, None, None]
+        empty = self.stones == EMPTY
+        surrounded = _count_neighbors(own) == self._num_neighbors
+        padded = np.zeros((self.num_games, self.num_rows + 2, self.num_cols + 2), dtype=np.int8)
+        padded[:, 1:-1, 1:-1] = own
+        friendly_corners = padded[:, :-2, :-2] + padded[:, :-2, 2:] + padded[:, 2:, :-2] + padded[:, 2:, 2:]
+        off_board_corners = 4 - self._num_corners
+        eyes = np.where(off_board_corners > 0,
+                        friendly_corners + off_board_corners == 4,
+                        friendly_corners >= 3)
+        return empty & surrounded & eyes
+
+    def _try(self, games, points, next_to_empty):
+        """Play a stone of the player to move on the flat index points[m] of a copy of game games[m], for every m; a
+        game can come up more than once. next_to_empty holds the points next to an empty point of every game before
+        the moves. Return the copied boards after the moves, whether each move was suicide and the ko point each move
+        leaves, -1 if none.
+
+        Captures and suicide are found from the points around the move: only the strings next to it that might have
+        lost their last liberty are grown, see _string_has_liberty.
+        """
+        num_moves = len(games)
+        rows = np.arange(num_moves)
+        stones = self.stones[games]
+        flat = stones.reshape(num_moves, -1)
+        player = self.next_player[games]
+        opponent = 3 - player
+        flat[rows, points] = player
+
+        neighbors = self._neighbors[points]
+        neighbor_colors = np.where(neighbors >= 0, flat[rows[:, None], neighbors], -1)
+        second = self._second_neighbors[points]
+        has_liberty = ((second >= 0) & (flat[rows[:, None, None], second] == EMPTY)).any(axis=2)  # <1>
+
+        next_to_empty = next_to_empty[games]
+        cut_off = np.nonzero((neighbor_colors > EMPTY) & ~has_liberty)
+        next_to_empty.reshape(num_moves, -1)[cut_off[0], neighbors[cut_off]] = False  # <2>
+
+        seeds = (neighbor_colors == opponent[:, None]) & ~has_liberty
+        captured = np.zeros_like(stones, dtype=bool)
+        if seeds.any():
+            seed_moves, seed_sides = np.nonzero(seeds)
+            alive, strings = _string_has_liberty(stones[seed_moves], opponent[seed_moves],
+                                                 neighbors[seed_moves, seed_sides], next_to_empty[seed_moves])
+            np.logical_or.at(captured, seed_moves[~alive], strings[~alive])  # <3>
+            stones[captured] = EMPTY
+        num_captured = captured.sum(axis=(1, 2))
+
+        own = neighbor_colors == player[:, None]
+        empty_neighbors = (neighbor_colors == EMPTY).sum(axis=1)
+        suicide = (empty_neighbors == 0) & (num_captured == 0) & ~(own & has_liberty).any(axis=1)  # <4>
+        if suicide.any():
+            unsure = np.nonzero(suicide)[0]
+            alive, _ = _string_has_liberty(stones[unsure], player[unsure], points[unsure], next_to_empty[unsure])
+            suicide[unsure] = ~alive
+
+        is_ko = (num_captured == 1) & ~own.any(axis=1) & (empty_neighbors == 0)  # <5>
+        ko_point = np.where(is_ko, captured.reshape(num_moves, -1).argmax(axis=1), -1)
+        return stones, suicide, ko_point
+
+    # <1> has_liberty[m, j]: the j-th neighbor of the move has an empty neighbor of its own, so its string lives
+    # <2> the move only changes next_to_empty for the stones next to it whose only empty neighbor it took
+    # <3> before the move every string had a liberty, so a string next to the move without one now is captured
+    # <4> a move next to an empty point, a capture or a friendly stone with a liberty of its own is no suicide;
+    #     only the other moves grow their own string to find out; no stone was captured, so next_to_empty still holds
+    # <5> a lone stone that captured a single stone and has that point as its only liberty can be taken back: ko
+
+    def play_random_moves(self):
+        """Play one random move in every game that is not over: an empty point that is not ko, not suicide and not
+        an eye of the player to move, or a pass if there is none."""
+        active = ~self.is_over
+        empty = self.stones == EMPTY
+        candidates = (empty & ~self._own_eyes()).reshape(self.num_games, -1) & active[:, None]
+        crowded = (_count_neighbors(empty) == 0).reshape(self.num_games, -1)  # <1>
+        has_ko = self.ko_point >= 0
+        candidates[has_ko, self.ko_point[has_ko]] = False
+        next_to_empty = _dilate(empty)
+        moves = np.full(self.num_games, -1, dtype=np.int64)
+        priorities = np.where(candidates, np.random.random(candidates.shape), -1.0)  # <2>
+        pending = np.nonzero(active)[0]
+        while len(pending):
+            choice = priorities[pending].argmax(axis=1)
+            has_move = priorities[pending, choice] >= 0
+            moves[pending] = np.where(has_move, choice, -1)
+            games = pending[has_move]
+            if not len(games):
+                break
+            stones, suicide, ko_point = self._try(games, moves[games], next_to_empty)
+            placed = games[~suicide]
+            self.stones[placed] = stones[~suicide]
+            self.ko_point[placed] = ko_point[~suicide]
+            pending = games[suicide]
+            priorities[pending, moves[pending]] = -1.0
+            rows, points = np.nonzero(crowded[pending] & (priorities[pending] >= 0))  # <3>
+            if len(rows):
+                _, suicide, _ = self._try(pending[rows], points, next_to_empty)
+                priorities[pending[rows[suicide]], points[suicide]] = -1.0
+        self.passes = np.where(active, np.where(moves >= 0, 0, self.passes + 1), self.passes)
+        self.ko_point = np.where(moves >= 0, self.ko_point, -1)
+        self.next_player = np.where(active, 3 - self.next_player, self.next_player).astype(np.int8)
+        self.num_moves += active
+        return moves
+
+    # <1> only a point without an empty neighbor can be suicide
+    # <2> a random priority for every candidate; the best legal one is played
+    # <3> a game whose best candidate was suicide tries all its other crowded candidates at once, so its next choice
+    #     is legal and the loop runs at most twice
+
+    def play_out(self, max_moves=None, mercy=None):
+        """Play random moves until every game is over, or until max_moves moves have been played. With mercy set, a
+        game also ends as soon as one side has more than mercy stones more on the board than the other."""
+        start = self.num_moves.copy()
+        while not self.is_over.all():
+            if max_moves is not None and (self.num_moves - start >= max_moves).all():
+                break
+            self.play_random_moves()
+            if mercy is not None:
+                lead = (self.stones == BLACK).sum(axis=(1, 2)) - (self.stones == WHITE).sum(axis=(1, 2))
+                self.passes[np.abs(lead) > mercy] = 2  # <1>
+        return self.scores()
+
+    # <1> over, as if both players had passed
+
+    def scores(self):
+        """Return black's area score minus white's area score and komi, for every game."""
+        black = self.stones == BLACK
+        white = self.stones == WHITE
+        empty = self.stones == EMPTY
+        reach_black = _reach(_dilate(black), empty)
+        reach_white = _reach(_dilate(white), empty)
+        black_area = (black | (reach_black & ~reach_white)).sum(axis=(1, 2))
+        white_area = (white | (reach_white & ~reach_black)).sum(axis=(1, 2))
+        return black_area - (white_area + KOMI)
+
+    def winners(self):
+        """Return the winner of every game as an array of Player values."""
+        return np.where(self.scores() > 0, BLACK, WHITE)
+
@@ -0,0 +1,357 @@
+"""
+Go board with one Python int per color.
+
+Point (row, col) is bit (row - 1) * (num_cols + 1) + (col - 1). The extra column of every row stays zero, so a
+plane shifted one bit left or right never wraps onto the next row, and the neighbors of all stones of a plane are
+four shifts and an or. Copying a board copies a few ints.
+"""
+from dokigo.base import Player
+from dokigo.geometry import board_geometry
+from dokigo.goboard import GoString, neighbor_tables, corner_tables, init_neighbor_table, init_corner_table
+from dokigo.scoring import Territory
+from dokigo import zobrist
+
+__all__ = [
+    'BitBoard',
+]
+
+BLACK = Player.black.value
+WHITE = Player.white.value
+
+geometries = {}  # <1>
+hash_tables = {}  # <2>
+
+
+# <1> geometries[dim] holds the masks and tables shared by all boards of the same size
+# <2> hash_tables[dim, hash_bits][player.value][i] is the zobrist code of a stone of player on bit i
+
+
+def init_hash_table(dim, hash_bits=64):
+    geometry = geometries[dim]
+    codes = zobrist.hash_table(dim, hash_bits)
+    table = [None, [0] * geometry.num_bits, [0] * geometry.num_bits]
+    for index, point in enumerate(board_geometry(dim).points):
+        i = geometry.bit_index(point.row, point.col)
+        for player in Player:
+            table[player.value][i] = codes[player.value][index]
+    hash_tables[dim, hash_bits] = table
+
+
+class BitGeometry:
+    def __init__(self, dim):
+        rows, cols = dim
+        self.width = cols + 1
+        self.num_bits = rows * self.width
+        self.on_board = 0
+        self.index_of = {}  # <1>
+        self.neighbor_masks = [0] * self.num_bits  # <2>
+        self.corner_masks = [0] * self.num_bits
+        self.off_board_corners = [0] * self.num_bits
+        geometry = board_geometry(dim)
+        bit_of = [self.bit_index(point.row, point.col) for point in geometry.points]
+        for index, point in enumerate(geometry.points):
+            i = bit_of[index]
+            self.on_board |= 1 << i
+            self.index_of[point] = i
+            self.neighbor_masks[i] = sum(1 << bit_of[n] for n in geometry.neighbor_lists[index])  # <3>
+            self.corner_masks[i] = sum(1 << bit_of[n] for n in geometry.diagonal_lists[index])
+            self.off_board_corners[i] = 4 - len(geometry.diagonal_lists[index])
+        point_of = {i: point for point, i in self.index_of.items()}
+        self.byte_points = []  # <4>
+        for first in range(0, self.num_bits, 8):
+            self.byte_points.append([tuple(point_of[i] for i in range(first, first + 8)
+                                           if byte >> (i - first) & 1 and i in point_of)
+                                     for byte in range(256)])
+
+    # <1> maps a Point to its bit position, which is quicker than working it out from row and col
+    # <2> the tables of the points are lists indexed by bit position, the spare bit of every row holds 0
+    # <3> the bits are all different, so their sum is their union
+    # <4> byte_points[k][byte] holds the points of the bits of byte, read as bits 8 * k to 8 * k + 7 of a plane
+
+    def bit_index(self, row, col):
+        return (row - 1) * self.width + (col - 1)
+
+    def points_of(self, plane):
+        """Return the Points of plane as a list, a byte of the plane at a time."""
+        points = []
+        for table in self.byte_points:
+            if not plane:
+                break
+            points += table[plane & 255]
+            plane >>= 8
+        return points
+
+    def neighbors(self, plane):
+        """Return the points next to any point of plane."""
+        width = self.width
+        return ((plane << 1) | (plane >> 1) | (plane << width) | (plane >> width)) & self.on_board
+
+    def neighbor_counts(self, plane):
+        """Return the points next to at least one point of plane, and the points next to at least two."""
+        width = self.width
+        left, right, up, down = plane << 1, plane >> 1, plane << width, plane >> width
+        return ((left | right | up | down) & self.on_board,
+                ((left & right) | ((left | right) & (up | down)) | (up & down)) & self.on_board)
+
+    def flood(self, seed, plane):
+        """Return the strings of plane that contain a point of seed."""
+        width = self.width
+        region = seed
+        while True:
+            grown = (region | (region << 1) | (region >> 1) | (region << width) | (region >> width)) & plane  # <1>
+            if grown == region:
+                return region
+            region = grown
+
+    # <1> plane is on the board, so unlike in neighbors there is nothing to mask off
+
+
+def bit_indices(plane):
+    """Yield the positions of the set bits of plane."""
+    while plane:
+        bit = plane & -plane
+        yield bit.bit_length() - 1
+        plane ^= bit
+
+
+class BitBoard:
+    def __init__(self, num_rows, num_cols, hash_bits=64):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.hash_bits = hash_bits
+        self._planes = [None, 0, 0]  # <1>
+        self._hash = zobrist.EMPTY_BOARD
+
+        dim = (num_rows, num_cols)
+        if dim not in geometries:
+            geometries[dim] = BitGeometry(dim)
+        if (dim, hash_bits) not in hash_tables:
+            init_hash_table(dim, hash_bits)
+        if dim not in neighbor_tables:
+            init_neighbor_table(dim)
+        if dim not in corner_tables:
+            init_corner_table(dim)
+        self._geometry = geometries[dim]
+        self._hash_codes = hash_tables[dim, hash_bits]
+        self._index_of = self._geometry.index_of
+        self._empty = self._geometry.on_board  # <2>
+        self._liberties, self._two_liberties = self._geometry.neighbor_counts(self._empty)  # <3>
+        self._empty_points = (None, None)  # <4>
+        self.neighbor_table = neighbor_tables[dim]
+        self.corner_table = corner_tables[dim]
+
+    # <1> _planes[player.value] is the plane of the stones of player
+    # <2> the plane of the empty points, kept up to date with the stones instead of worked out on every call
+    # <3> the points with at least one and with at least two empty neighbors; a stone with two keeps a liberty
+    #     whatever is played next
+    # <4> the empty plane empty_points last listed, and the list
+
+    def neighbors(self, point):
+        return self.neighbor_table[point]
+
+    def corners(self, point):
+        return self.corner_table[point]
+
+    def _captured_by(self, color, index, seeds):
+        """Return the opposite color stones a stone of color on bit index would capture, given the opposite color
+        stones next to it that have no other liberty."""
+        opposite = self._planes[3 - color]
+        alive = self._alive_after(index)
+        width = self._geometry.width
+        captured = 0
+        while seeds:
+            string = seeds & -seeds
+            while True:
+                grown = (string | (string << 1) | (string >> 1) | (string << width) | (string >> width)) & opposite
+                if grown & alive:  # <1>
+                    break
+                if grown == string:
+                    captured |= string
+                    break
+                string = grown
+            seeds &= ~grown
+        return captured
+
+    # <1> the string keeps a liberty, so it stops growing here; most strings next to a move are found alive within
+    #     a step or two, and only a captured string is flood filled to the end
+
+    def _alive_after(self, index):
+        """Return the points that still have an empty neighbor once bit index is taken."""
+        return self._two_liberties | (self._liberties & ~self._geometry.neighbor_masks[index])  # <1>
+
+    # <1> a point next to bit index keeps a liberty if it has two, any other point if it has one
+
+    def _hash_of(self, color, plane):
+        codes = self._hash_codes[color]
+        code = 0
+        for i in bit_indices(plane):
+            code ^= codes[i]
+        return code
+
+    def place_stone(self, player, point):
+        assert self.is_on_grid(point)  # make sure it is on grid
+        color = player.value
+        index = self._index_of[point]
+        bit = 1 << index
+        assert self._empty & bit  # no existing stone on point
+        geometry = self._geometry
+        seeds = geometry.neighbor_masks[index] & self._planes[3 - color] & ~self._two_liberties
+        captured = self._captured_by(color, index, seeds) if seeds else 0
+        self._planes[color] |= bit
+        self._empty ^= bit | captured
+        self._liberties, self._two_liberties = geometry.neighbor_counts(self._empty)
+        self._hash ^= self._hash_codes[color][index]
+        if captured:
+            self._planes[3 - color] ^= captured
+            self._hash ^= self._hash_of(3 - color, captured)
+
+    def play(self, player, move):
+        """Play a move on this board in place and return an undo record.
+
+        The whole position is two ints and a hash, so the record is just the previous values of the three; undo works
+        the empty plane and the liberty planes out again from them.
+        """
+        if not move.is_play:
+            return None
+        record = (self._planes[BLACK], self._planes[WHITE], self._hash)
+        self.place_stone(player, move.point)
+        return record
+
+    def undo(self, record):
+        """Take back the move that returned the record."""
+        if record is None:
+            return
+        self._planes[BLACK], self._planes[WHITE], self._hash = record
+        self._empty = self._geometry.on_board & ~(self._planes[BLACK] | self._planes[WHITE])
+        self._liberties, self._two_liberties = self._geometry.neighbor_counts(self._empty)
+
+    def is_self_capture(self, player, point):
+        geometry = self._geometry
+        index = self._index_of[point]
+        neighbors = geometry.neighbor_masks[index]
+        if neighbors & self._empty:
+            # This point has a liberty. Can't be self capture.
+            return False
+        color = player.value
+        seeds = neighbors & self._planes[3 - color] & ~self._two_liberties
+        if seeds and self._captured_by(color, index, seeds):
+            # This move is real capture, not a self capture.
+            return False
+        own = self._planes[color]
+        friends = neighbors & own
+        if not friends:
+            return True
+        if friends & self._two_liberties:
+            return False
+        return not geometry.flood(friends, own) & self._alive_after(index)
+
+    def is_on_grid(self, point):
+        return 1 <= point.row <= self.num_rows and \
+               1 <= point.col <= self.num_cols
+
+    def empty_points(self):
+        """Return the empty points of the board. The list is shared until the board changes, don't modify it."""
+        empty, points = self._empty_points
+        if empty != self._empty:
+            points = self._geometry.points_of(self._empty)
+            self._empty_points = (self._empty, points)
+        return points
+
+    def get(self, point):
+        """Return the content of a point on the board.
+
+        Returns None if the point is empty, or a Player if there is a
+        stone on that point.
+        """
+        if not self.is_on_grid(point):
+            return None
+        bit = 1 << self._index_of[point]
+        if self._planes[BLACK] & bit:
+            return Player.black
+        if self._planes[WHITE] & bit:
+            return Player.white
+        return None
+
+    def get_go_string(self, point):
+        """Return the entire string of stones at a point.
+
+        Returns None if the point is empty, or a GoString if there is
+        a stone on that point. The GoString is built on demand from the planes.
+        """
+        color = self.get(point)
+        if color is None:
+            return None
+        geometry = self._geometry
+        string = geometry.flood(1 << self._index_of[point], self._planes[color.value])
+        liberties = geometry.neighbors(string) & self._empty
+        return GoString(color,
+                        geometry.points_of(string),
+                        lambda: geometry.points_of(liberties),  # <1>
+                        liberties.bit_count())
+
+    # <1> liberties is an int, so it still holds the liberties of the string when someone asks for them later
+
+    def is_point_an_eye(self, point, color):
+        """Bitboard version of agent.utilities.is_point_an_eye."""
+        geometry = self._geometry
+        index = self._index_of[point]
+        own = self._planes[color.value]
+        if not self._empty >> index & 1:
+            return False
+        if geometry.neighbor_masks[index] & ~own:
+            return False
+        friendly_corners = (geometry.corner_masks[index] & own).bit_count()
+        off_board_corners = geometry.off_board_corners[index]
+        if off_board_corners > 0:
+            return off_board_corners + friendly_corners == 4
+        return friendly_corners >= 3
+
+    def evaluate_territory(self):
+        """Bitboard version of scoring.evaluate_territory: every empty region is flood filled in one go."""
+        geometry = self._geometry
+        black = self._planes[BLACK]
+        white = self._planes[WHITE]
+        status = dict.fromkeys(geometry.points_of(black), Player.black)
+        status.update(dict.fromkeys(geometry.points_of(white), Player.white))
+        empty = self._empty
+        while empty:
+            region = geometry.flood(empty & -empty, empty)
+            empty &= ~region
+            border = geometry.neighbors(region) & ~region
+            if border & black and not border & white:
+                fill_with = 'territory_b'
+            elif border & white and not border & black:
+                fill_with = 'territory_w'
+            else:
+                fill_with = 'dame'
+            status.update(dict.fromkeys(geometry.points_of(region), fill_with))
+        return Territory(status)
+
+    def __eq__(self, other):
+        return isinstance(other, BitBoard) and \
+               self.num_rows == other.num_rows and \
+               self.num_cols == other.num_cols and \
+               self._planes == other._planes
+
+    def __deepcopy__(self, memodict={}):
+        copied = BitBoard.__new__(BitBoard)
+        copied.__dict__.update(self.__dict__)
+        copied._planes = self._planes[:]
+        return copied
+
+    def position(self):
+        """Return the full position as a hashable value, for checking that equal hashes mean equal positions."""
+        return tuple(self._planes)
+
+    def zobrist_hash(self):
+        return self._hash
+
+    def zobrist_hash_after(self, player, point):
+        """Return the hash the board would have after player places a stone on point, without changing the board."""
+        color = player.value
+        index = self._index_of[point]
+        new_hash = self._hash ^ self._hash_codes[color][index]
+        seeds = self._geometry.neighbor_masks[index] & self._planes[3 - color] & ~self._two_liberties
+        if seeds:
+            new_hash ^= self._hash_of(3 - color, self._captured_by(color, index, seeds))
+        return new_hash
@@ -1,7 +1,7 @@
 import numpy as np
 
 from dokigo.encoders.base import Encoder
-from dokigo.base import Point
+from dokigo.geometry import board_geometry
 
 
 class OnePlaneEncoder(Encoder):
@@ -14,10 +14,11 @@ class OnePlaneEncoder(Encoder):
 
     def encode(self, game_state):  # <1>
         board_matrix = np.zeros(self.shape())
+        points = board_geometry((self.board_height, self.board_width)).points
         next_player = game_state.next_player
         for r in range(self.board_height):
             for c in range(self.board_width):
-                p = Point(row=r + 1, col=c + 1)
+                p = points[r * self.board_width + c]
                 go_string = game_state.board.get_go_string(p)
                 if go_string is None:
                     continue
@@ -33,9 +34,7 @@ class OnePlaneEncoder(Encoder):
         return self.board_width * (point.row - 1) + point.col - 1
 
     def decode_point_index(self, index):
-        row = index // self.board_width
-        col = index % self.board_width
-        return Point(row=row + 1, col=col + 1)
+        return board_geometry((self.board_height, self.board_width)).points[index]
 
     def num_points(self):
         return self.board_width * self.board_height
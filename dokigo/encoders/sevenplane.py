@@ -2,7 +2,8 @@
 import numpy as np
 
 from dokigo.encoders.base import Encoder
-from dokigo.goboard import Move, Point
+from dokigo.goboard import Move
+from dokigo.geometry import board_geometry
 
 
 class SevenPlaneEncoder(Encoder):
@@ -17,11 +18,12 @@ class SevenPlaneEncoder(Encoder):
 # tag::sevenplane_encode[]
     def encode(self, game_state):
         board_tensor = np.zeros(self.shape())
+        points = board_geometry((self.board_height, self.board_width)).points
         base_plane = {game_state.next_player: 0,
                       game_state.next_player.other: 3}
         for row in range(self.board_height):
             for col in range(self.board_width):
-                p = Point(row=row + 1, col=col + 1)
+                p = points[row * self.board_width + col]
                 go_string = game_state.board.get_go_string(p)
                 if go_string is None:
                     if game_state.does_move_violate_ko(game_state.next_player,
@@ -41,9 +43,7 @@ class SevenPlaneEncoder(Encoder):
         return self.board_width * (point.row - 1) + (point.col - 1)
 
     def decode_point_index(self, index):
-        row = index // self.board_width
-        col = index % self.board_width
-        return Point(row=row + 1, col=col + 1)
+        return board_geometry((self.board_height, self.board_width)).points[index]
 
     def num_points(self):
         return self.board_width * self.board_height
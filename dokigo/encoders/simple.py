@@ -2,7 +2,8 @@ import numpy as np
 
 from dokigo.encoders.base import Encoder
 from dokigo.goboard import Move
-from dokigo.base import Player, Point
+from dokigo.base import Player
+from dokigo.geometry import board_geometry
 
 class SimpleEncoder(Encoder):
     def __init__(self, board_size):
@@ -23,13 +24,14 @@ class SimpleEncoder(Encoder):
 
     def encode(self, game_state):
         board_tensor = np.zeros(self.shape())
+        points = board_geometry((self.board_height, self.board_width)).points
         if game_state.next_player == Player.black:
             board_tensor[8] = 1
         else:
             board_tensor[9] = 1
         for r in range(self.board_height):
             for c in range(self.board_width):
-                p = Point(row=r + 1, col=c + 1)
+                p = points[r * self.board_width + c]
                 go_string = game_state.board.get_go_string(p)
 
                 if go_string is None:
@@ -51,9 +53,7 @@ class SimpleEncoder(Encoder):
 
     def decode_point_index(self, index):
         """Turn an integer index into a board point."""
-        row = index // self.board_width
-        col = index % self.board_width
-        return Point(row=row + 1, col=col + 1)
+        return board_geometry((self.board_height, self.board_width)).points[index]
 
     def num_points(self):
         return self.board_width * self.board_height
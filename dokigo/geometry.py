@@ -0,0 +1,68 @@
+"""
+Board geometry shared by everything that walks a board.
+
+Which points are next to a point and which are diagonal to it only depend on the size of the board, yet the boards,
+the eye test and scoring used to work them out again and again by building Points and checking them against the
+grid. A Geometry works it out once per board size with the points numbered in row major order, the same numbering
+as base.point_table and the encoders: point (row, col) is index (row - 1) * num_cols + (col - 1). The encoders only
+need that numbering, through points.
+
+The neighbor and diagonal tables exist twice. The NumPy arrays are for vectorized code like BatchBoard. The tuples
+of ints and lists of Points are for plain Python loops in the boards, the eye test and scoring, where indexing a
+NumPy array one element at a time is slower than indexing a list.
+"""
+import numpy as np
+
+from dokigo.base import point_table
+
+__all__ = [
+    'Geometry',
+    'board_geometry',
+]
+
+geometries = {}  # <1>
+
+
+# <1> geometries[(9, 9)] is the Geometry of a 9x9 board
+
+
+def board_geometry(dim):
+    """Return the Geometry of a board of size dim = (num_rows, num_cols)."""
+    if dim not in geometries:
+        geometries[dim] = Geometry(dim)
+    return geometries[dim]
+
+
+class Geometry:
+    def __init__(self, dim):
+        rows, cols = dim
+        self.num_rows = rows
+        self.num_cols = cols
+        self.num_points = rows * cols
+        self.points = point_table(dim)  # <1>
+
+        grid = np.arange(self.num_points).reshape(rows, cols)
+        padded = np.full((rows + 2, cols + 2), -1, dtype=np.int32)
+        padded[1:-1, 1:-1] = grid
+        self.neighbors = self._shifted(padded, ((-1, 0), (1, 0), (0, -1), (0, 1)))  # <2>
+        self.diagonals = self._shifted(padded, ((-1, -1), (-1, 1), (1, -1), (1, 1)))
+
+        self.neighbor_lists = [tuple(int(n) for n in row if n >= 0) for row in self.neighbors]
+        self.diagonal_lists = [tuple(int(n) for n in row if n >= 0) for row in self.diagonals]
+        self.neighbor_points = [[self.points[n] for n in row] for row in self.neighbor_lists]
+        self.diagonal_points = [[self.points[n] for n in row] for row in self.diagonal_lists]
+
+    # <1> the interned Points, points[index] is the Point at index
+    # <2> neighbors[i] holds the four neighbors of index i, and -1 where the neighbor would be off the board
+
+    @staticmethod
+    def _shifted(padded, deltas):
+        rows, cols = padded.shape[0] - 2, padded.shape[1] - 2
+        columns = [padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols].ravel() for dr, dc in deltas]
+        return np.stack(columns, axis=1)
+
+    def index(self, point):
+        return (point.row - 1) * self.num_cols + (point.col - 1)
+
+    def is_on_grid(self, point):
+        return 1 <= point.row <= self.num_rows and 1 <= point.col <= self.num_cols
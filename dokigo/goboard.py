@@ -14,14 +14,17 @@ If success, we can ignore goboardv2
 This is a fast go board implementation by adding init_neighbor_table and init_corner_table from goboardv1
 """
 import copy
-from dokigo.base import Player, Point
+from dokigo.base import Player, point_table
 from dokigo.scoring import compute_game_result
+from dokigo.history import PositionHistory
+from dokigo.geometry import board_geometry
 from dokigo import zobrist
 
 __all__ = [
     'Board',
     'GameState',
     'Move',
+    'move_table',
 ]
 
 neighbor_tables = {}  # <1>
@@ -33,61 +36,77 @@ corner_tables = {}  # <2>
 
 
 def init_neighbor_table(dim):
-    rows, cols = dim
-    new_table = {}
-    for r in range(1, rows + 1):
-        for c in range(1, cols + 1):
-            p = Point(row=r, col=c)
-            full_neighbors = p.neighbors()
-            true_neighbors = [
-                n for n in full_neighbors
-                if 1 <= n.row <= rows and 1 <= n.col <= cols]
-            new_table[p] = true_neighbors
-    neighbor_tables[dim] = new_table
+    geometry = board_geometry(dim)
+    neighbor_tables[dim] = dict(zip(geometry.points, geometry.neighbor_points))
 
 
 def init_corner_table(dim):
-    rows, cols = dim
-    new_table = {}
-    for r in range(1, rows + 1):
-        for c in range(1, cols + 1):
-            p = Point(row=r, col=c)
-            full_corners = [
-                Point(row=p.row - 1, col=p.col - 1),
-                Point(row=p.row - 1, col=p.col + 1),
-                Point(row=p.row + 1, col=p.col - 1),
-                Point(row=p.row + 1, col=p.col + 1),
-            ]
-            true_corners = [
-                n for n in full_corners
-                if 1 <= n.row <= rows and 1 <= n.col <= cols]
-            new_table[p] = true_corners
-    corner_tables[dim] = new_table
+    geometry = board_geometry(dim)
+    corner_tables[dim] = dict(zip(geometry.points, geometry.diagonal_points))
 
 
 class IllegalMoveError(Exception):
     pass
 
 
+MAX_PENDING_CHANGES = 32  # <1>
+
+# <1> a string builds its liberty set after this many liberty changes that nobody looked at, see GoString._changed
+
+
 class GoString:
     """Stones that are linked by a chain of connected stones of the
     same color.
+
+    num_liberties is always exact, but the liberty set itself is only built when someone reads liberties. Most
+    callers only want the count, so without_liberty and with_liberty just adjust it and remember the change.
+    liberties can also be passed as a function that returns them, together with num_liberties.
     """
 
-    def __init__(self, color, stones, liberties):
+    def __init__(self, color, stones, liberties, num_liberties=None):
         self.color = color
-        self.stones = set(stones)
-        self.liberties = set(liberties)
+        self.stones = frozenset(stones)  # <1>
+        if callable(liberties):
+            self._liberties = None
+            self._find_liberties = liberties
+            self.num_liberties = num_liberties
+        else:
+            self._liberties = frozenset(liberties)
+            self._find_liberties = None
+            self.num_liberties = len(self._liberties)
+        self._pending = 0
+
+    # <1> frozenset(stones) returns stones itself if it already is a frozenset, so derived strings share their stones
+
+    @property
+    def liberties(self):
+        if self._liberties is None:
+            self._liberties = frozenset(self._find_liberties())
+            self._find_liberties = None  # <1>
+            self._pending = 0
+        return self._liberties
+
+    # <1> let go of the strings this one was derived from
+
+    def _changed(self, change, num_liberties):
+        """Return a copy of this string with num_liberties liberties, whose liberty set is change(self.liberties)."""
+        if self._pending >= MAX_PENDING_CHANGES:
+            self.liberties  # <1>
+        string = GoString(self.color, self.stones, lambda: change(self.liberties), num_liberties)
+        string._pending = self._pending + 1
+        return string
+
+    # <1> building the set walks the chain of pending changes recursively, so keep that chain short
 
     def without_liberty(self, point):
-        new_liberties = self.liberties - {point}
-        return GoString(self.color, self.stones, new_liberties)  # <1>
+        """Return this string without the liberty point, which has to be one of its liberties."""
+        return self._changed(lambda liberties: liberties - {point}, self.num_liberties - 1)  # <1>
 
     # <1> the reason that we return a new instance instead of simply use self.liberties.remove(point) is that we want
     # to avoid deepcopy a board which cost significant amount of time.
     def with_liberty(self, point):
-        new_liberties = self.liberties | {point}
-        return GoString(self.color, self.stones, new_liberties)
+        """Return this string with the new liberty point, which must not be one of its liberties yet."""
+        return self._changed(lambda liberties: liberties | {point}, self.num_liberties + 1)
 
     def merged_with(self, string):
         """Return a new string containing all stones in both strings."""
@@ -98,25 +117,27 @@ class GoString:
             combined_stones,
             (self.liberties | string.liberties) - combined_stones)
 
-    @property
-    def num_liberties(self):
-        return len(self.liberties)
-
     def __eq__(self, other):
         return isinstance(other, GoString) and \
                self.color == other.color and \
                self.stones == other.stones and \
+               self.num_liberties == other.num_liberties and \
                self.liberties == other.liberties
 
     def __deepcopy__(self, memodict={}):
-        return GoString(self.color, self.stones, copy.deepcopy(self.liberties))  # maynot copy.deepcopy since it is
-        # immutable
+        return self  # GoStrings are immutable, so a copy can share everything
+
+    def __reduce__(self):
+        return GoString, (self.color, self.stones, self.liberties)  # <1>
+
+    # <1> pickle the liberty set itself, the pending changes are local functions
 
 
 class Board:
-    def __init__(self, num_rows, num_cols):
+    def __init__(self, num_rows, num_cols, hash_bits=64):
         self.num_rows = num_rows
         self.num_cols = num_cols
+        self.hash_bits = hash_bits  # <3>
         self._grid = {}
         self._hash = zobrist.EMPTY_BOARD
 
@@ -128,6 +149,12 @@ class Board:
             init_corner_table(dim)
         self.neighbor_table = neighbor_tables[dim]
         self.corner_table = corner_tables[dim]
+        self._hash_codes = zobrist.hash_table(dim, hash_bits)  # <2>
+        self._empty = set(self.neighbor_table)  # <1>
+
+    # <1> the empty points are kept up to date as stones are placed and captured, see empty_points
+    # <2> _hash_codes[player.value][(row - 1) * num_cols + (col - 1)] is the code of a stone of player on (row, col)
+    # <3> 64 or 128, the width of zobrist_hash(); see zobrist.hash_table
 
     def neighbors(self, point):
         return self.neighbor_table[point]
@@ -159,8 +186,9 @@ class Board:
             new_string = new_string.merged_with(same_color_string)
         for new_string_point in new_string.stones:
             self._grid[new_string_point] = new_string
+        self._empty.discard(point)
         # Add filled point hash code.
-        self._hash ^= zobrist.HASH_CODE[point, player]
+        self._hash ^= self._hash_codes[player.value][(point.row - 1) * self.num_cols + point.col - 1]
         # end::apply_zobrist[]
 
         # 2. Reduce liberties of any adjacent strings of the opposite
@@ -174,6 +202,49 @@ class Board:
             else:
                 self._remove_string(other_color_string)
 
+    def play(self, player, move):
+        """Play a move on this board in place and return an undo record.
+
+        The record holds the previous hash and the previous string of every point the move touches: the played
+        point, the adjacent strings that get merged or lose a liberty, and the strings next to captured stones that
+        gain one. Passing it to undo() takes the move back. Records have to be undone in reverse order.
+        """
+        if not move.is_play:
+            return None
+        point = move.point
+        touched = {point: self._grid.get(point)}
+        for neighbor in self.neighbor_table[point]:
+            neighbor_string = self._grid.get(neighbor)
+            if neighbor_string is None or neighbor in touched:
+                continue
+            for stone in neighbor_string.stones:
+                touched[stone] = neighbor_string
+            if neighbor_string.color != player and neighbor_string.num_liberties == 1:  # <1>
+                for stone in neighbor_string.stones:
+                    for captured_neighbor in self.neighbor_table[stone]:
+                        string = self._grid.get(captured_neighbor)
+                        if string is not None and captured_neighbor not in touched:
+                            for string_stone in string.stones:
+                                touched[string_stone] = string
+        record = (self._hash, list(touched.items()))
+        self.place_stone(player, point)
+        return record
+
+    # <1> this string will be captured, so the strings around it will gain liberties
+
+    def undo(self, record):
+        """Take back the move that returned the record."""
+        if record is None:
+            return
+        previous_hash, touched = record
+        for point, string in touched:
+            self._grid[point] = string
+            if string is None:
+                self._empty.add(point)
+            else:
+                self._empty.discard(point)
+        self._hash = previous_hash
+
     def _replace_string(self, new_string):
         for point in new_string.stones:
             self._grid[point] = new_string
@@ -181,15 +252,21 @@ class Board:
     def _remove_string(self, string):
         for point in string.stones:
             # Removing a string can create liberties for other strings.
+            neighbor_strings = []
             for neighbor in self.neighbor_table[point]:
                 neighbor_string = self._grid.get(neighbor)
                 if neighbor_string is None:
                     continue
-                if neighbor_string is not string:
-                    self._replace_string(neighbor_string.with_liberty(point))
+                if neighbor_string is not string and neighbor_string not in neighbor_strings:  # <1>
+                    neighbor_strings.append(neighbor_string)
+            for neighbor_string in neighbor_strings:
+                self._replace_string(neighbor_string.with_liberty(point))
             self._grid[point] = None
+            self._empty.add(point)
             # Remove filled point hash code.
-            self._hash ^= zobrist.HASH_CODE[point, string.color]
+            self._hash ^= self._hash_codes[string.color.value][(point.row - 1) * self.num_cols + point.col - 1]
+
+    # <1> a string next to the point with two of its stones gains the liberty only once
 
     def is_self_capture(self, player, point):
         friendly_strings = []
@@ -213,6 +290,10 @@ class Board:
         return 1 <= point.row <= self.num_rows and \
                1 <= point.col <= self.num_cols
 
+    def empty_points(self):
+        """Return the empty points of the board. The collection is kept up to date by the board, don't modify it."""
+        return self._empty
+
     def get(self, point):
         """Return the content of a point on the board.
 
@@ -242,18 +323,41 @@ class Board:
                self._hash() == other._hash()
 
     def __deepcopy__(self, memodict={}):
-        copied = Board(self.num_rows, self.num_cols)
+        copied = Board(self.num_rows, self.num_cols, self.hash_bits)
         # Can do a shallow copy b/c the dictionary maps tuples
         # (immutable) to GoStrings (also immutable)
         copied._grid = copy.copy(self._grid)
         # copy.deepcopy is about 10x slower than copy.copy. So the major time saving comes from this line, and this is why we develop string class in such way to avoid deepcopy.
         copied._hash = self._hash
+        copied._empty = set(self._empty)
         return copied
 
+    def position(self):
+        """Return the full position as a hashable value, for checking that equal hashes mean equal positions."""
+        return frozenset((point, string.color) for point, string in self._grid.items() if string is not None)
+
     # tag::return_zobrist[]
     def zobrist_hash(self):
         return self._hash
 
+    def zobrist_hash_after(self, player, point):
+        """Return the hash the board would have after player places a stone on point, without changing the board.
+
+        Only the played stone and the adjacent opposite color strings in atari (they get captured) change the hash.
+        """
+        num_cols = self.num_cols
+        new_hash = self._hash ^ self._hash_codes[player.value][(point.row - 1) * num_cols + point.col - 1]
+        captured = []
+        for neighbor in self.neighbor_table[point]:
+            neighbor_string = self._grid.get(neighbor)
+            if neighbor_string is not None and neighbor_string.color != player and \
+                    neighbor_string.num_liberties == 1 and neighbor_string not in captured:
+                captured.append(neighbor_string)
+                codes = self._hash_codes[neighbor_string.color.value]
+                for stone in neighbor_string.stones:
+                    new_hash ^= codes[(stone.row - 1) * num_cols + stone.col - 1]
+        return new_hash
+
 
 # end::return_zobrist[]
 
@@ -262,7 +366,10 @@ class Move():
     """Any action a player can play on a turn.
 
     Exactly one of is_play, is_pass, is_resign will be set.
+    Moves are immutable and interned: Move.play returns the same object for the same point, so hot loops don't
+    allocate and equal moves usually compare by identity.
     """
+    __slots__ = ('point', 'is_play', 'is_pass', 'is_resign', '_hash')
 
     def __init__(self, point=None, is_pass=False, is_resign=False):
         assert (point is not None) ^ is_pass ^ is_resign
@@ -270,19 +377,23 @@ class Move():
         self.is_play = (self.point is not None)
         self.is_pass = is_pass
         self.is_resign = is_resign
+        self._hash = hash((self.is_play, self.is_pass, self.is_resign, self.point))
 
     @classmethod
     def play(cls, point):
         """A move that places a stone on the board."""
-        return Move(point=point)
+        move = play_moves.get(point)
+        if move is None:
+            move = play_moves[point] = Move(point=point)
+        return move
 
     @classmethod
     def pass_turn(cls):
-        return Move(is_pass=True)
+        return PASS
 
     @classmethod
     def resign(cls):
-        return Move(is_resign=True)
+        return RESIGN
 
     def __str__(self):
         if self.is_pass:
@@ -292,13 +403,11 @@ class Move():
         return '(r %d, c %d)' % (self.point.row, self.point.col)
 
     def __hash__(self):
-        return hash((
-            self.is_play,
-            self.is_pass,
-            self.is_resign,
-            self.point))
+        return self._hash
 
     def __eq__(self, other):
+        if self is other:
+            return True
         return (
                    self.is_play,
                    self.is_pass,
@@ -309,19 +418,63 @@ class Move():
                    other.is_resign,
                    other.point)
 
+    def __reduce__(self):
+        if self.is_play:
+            return Move.play, (self.point,)  # <1>
+        if self.is_pass:
+            return Move.pass_turn, ()
+        return Move.resign, ()
+
+    # <1> unpickling and copying go through the factories, so they give back the interned moves
+
+
+play_moves = {}  # <1>
+PASS = Move(is_pass=True)
+RESIGN = Move(is_resign=True)
+move_tables = {}
+
+
+# <1> the interned play moves, keyed by Point
+
+
+def move_table(dim):
+    """Return the interned play moves of a board of size dim in the order of base.point_table(dim)."""
+    if dim not in move_tables:
+        move_tables[dim] = [Move.play(point) for point in point_table(dim)]
+    return move_tables[dim]
+
 
 class GameState():
+    collision_counter = None  # <2>
+
     def __init__(self, board, next_player, previous, move):
         self.board = board
         self.next_player = next_player
         self.previous_state = previous
         if previous is None:
-            self.previous_states = set()
+            self.previous_states = PositionHistory()
+            self.num_passes = 0
+            self.ko_point = None
         else:
-            self.previous_states = set(
-                previous.previous_states |
-                {(previous.next_player, previous.board.zobrist_hash())})
+            self.previous_states = previous.previous_states.add(previous.situation_hash)  # <1>
+            self.num_passes = previous.num_passes + 1 if move.is_pass else 0  # <3>
+            self.ko_point = _ko_point(previous.board, board, move) if move.is_play else None
         self.last_move = move
+        self.situation_hash = board.zobrist_hash() ^ zobrist.SIDE_CODES[next_player.value]  # <4>
+        key = self.situation_hash ^ zobrist.PASS_CODES[min(self.num_passes, 2)]
+        if self.ko_point is not None:
+            key ^= zobrist.KO_CODES[(self.ko_point.row - 1) * zobrist.MAX_BOARD_SIZE + self.ko_point.col - 1]
+        self.position_key = key  # <5>
+        if GameState.collision_counter is not None:
+            GameState.collision_counter.check(board.zobrist_hash(), board.position())
+
+    # <1> previous_states is a persistent set, so adding a situation shares the history with the previous state
+    # instead of copying it.
+    # <2> debug mode: set to a zobrist.CollisionCounter and every new state checks its hash against its position
+    # <3> the number of passes in a row; the game is over after two
+    # <4> the board and the player to move as one int; this is what the positional superko history holds
+    # <5> one int for board, player to move, ko point and passes, for transposition tables and caches. Two states
+    # with the same key play exactly the same from here on, apart from superko.
 
     def apply_move(self, move):
         """Return the new GameState after applying the move."""
@@ -333,10 +486,14 @@ class GameState():
         return GameState(next_board, self.next_player.other, self, move)
 
     @classmethod
-    def new_game(cls, board_size):
+    def new_game(cls, board_size, board_class=None, hash_bits=64):
+        """Start a new game. board_class selects the board implementation, e.g. arrayboard.ArrayBoard;
+        the dict based Board is used by default. hash_bits is the width of the zobrist hashes, 64 or 128."""
         if isinstance(board_size, int):
             board_size = (board_size, board_size)
-        board = Board(*board_size)
+        if board_class is None:
+            board_class = Board
+        board = board_class(*board_size, hash_bits=hash_bits)
         return GameState(board, Player.black, None, None)
 
     def is_move_self_capture(self, player, move):
@@ -351,9 +508,7 @@ class GameState():
     def does_move_violate_ko(self, player, move):
         if not move.is_play:
             return False
-        next_board = copy.deepcopy(self.board)
-        next_board.place_stone(player, move.point)
-        next_situation = (player.other, next_board.zobrist_hash())
+        next_situation = self.board.zobrist_hash_after(player, move.point) ^ zobrist.SIDE_CODES[player.other.value]
         return next_situation in self.previous_states
 
     def is_valid_move(self, move):
@@ -376,15 +531,28 @@ class GameState():
             return False
         return self.last_move.is_pass and second_last_move.is_pass
 
+    def legal_points(self):
+        """Yield the points the next player can legally play on.
+
+        Only the empty points are visited, which the board keeps up to date as stones are placed and captured. The
+        self capture test returns at the first empty neighbor and the ko test is a speculative hash lookup, so no
+        board is copied.
+        """
+        if self.is_over():
+            return
+        board = self.board
+        player = self.next_player
+        side_code = zobrist.SIDE_CODES[player.other.value]
+        previous_states = self.previous_states
+        for point in board.empty_points():
+            if not board.is_self_capture(player, point) and \
+                    board.zobrist_hash_after(player, point) ^ side_code not in previous_states:
+                yield point
+
     def legal_moves(self):
         if self.is_over():
             return []
-        moves = []
-        for row in range(1, self.board.num_rows + 1):
-            for col in range(1, self.board.num_cols + 1):
-                move = Move.play(Point(row, col))
-                if self.is_valid_move(move):
-                    moves.append(move)
+        moves = [Move.play(point) for point in self.legal_points()]
         # These two moves are always legal.
         moves.append(Move.pass_turn())
         moves.append(Move.resign())
@@ -398,3 +566,32 @@ class GameState():
             return self.next_player
         game_result = compute_game_result(self)
         return game_result.winner
+
+
+def _ko_point(previous_board, board, move):
+    """Return the point the opponent can't take back right away after move, or None if there is no simple ko.
+
+    That is the case when the played stone has no friendly neighbor, captured a single stone and has that point as
+    its only liberty.
+    """
+    point = move.point
+    player = board.get(point)
+    liberty = None
+    for neighbor in board.neighbors(point):
+        color = board.get(neighbor)
+        if color == player:
+            return None
+        if color is None:
+            if liberty is not None:
+                return None
+            liberty = neighbor
+    if liberty is None or previous_board.get(liberty) is None:  # <1>
+        return None
+    for neighbor in board.neighbors(liberty):
+        if neighbor != point and board.get(neighbor) is None:  # <2>
+            return None
+    return liberty
+
+# <1> the only liberty has to be the point of a captured stone
+# <2> before the move the captured string had no liberty but point, so an empty point next to it now was captured
+# with it: more than one stone was taken
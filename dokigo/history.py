@@ -0,0 +1,91 @@
+"""
+Positional superko history shared between game states.
+
+GameState used to copy the whole set of previous situations for every new state, which makes a game of N moves cost
+O(N^2). PositionHistory is a persistent hash set instead: add() returns a new set and leaves the old one untouched,
+but the two share everything except the path to the new entry. It is a hash array mapped trie with 32 way nodes, so
+a game of a few hundred moves is never more than two or three nodes deep and both add() and `in` cost a handful of
+tuple operations no matter how long the game is. A branch of an MCTS tree that is thrown away frees its own entries
+with it, because there is no index shared between branches.
+"""
+
+__all__ = [
+    'PositionHistory',
+]
+
+BITS = 5
+MASK = (1 << BITS) - 1
+HASH_MASK = (1 << 64) - 1
+
+
+class _Node:
+    __slots__ = ('bitmap', 'children')
+
+    def __init__(self, bitmap, children):
+        self.bitmap = bitmap  # <1>
+        self.children = children  # <2>
+
+# <1> bit i is set if there is a child for the 5 hash bits with value i at this level
+# <2> a child is either a _Node or a leaf tuple (hash, keys); keys only holds more than one key on a full hash collision
+
+
+EMPTY_NODE = _Node(0, ())
+
+
+def _contains(node, h, key):
+    shift = 0
+    while True:
+        bit = 1 << ((h >> shift) & MASK)
+        if not node.bitmap & bit:
+            return False
+        child = node.children[(node.bitmap & (bit - 1)).bit_count()]
+        if type(child) is tuple:
+            return child[0] == h and key in child[1]
+        node = child
+        shift += BITS
+
+
+def _add(node, h, key, shift):
+    """Return the node with key added, or the node itself if it already holds key."""
+    bit = 1 << ((h >> shift) & MASK)
+    index = (node.bitmap & (bit - 1)).bit_count()
+    children = node.children
+    if not node.bitmap & bit:
+        return _Node(node.bitmap | bit, children[:index] + ((h, (key,)),) + children[index:])
+    child = children[index]
+    if type(child) is tuple:
+        if child[0] == h:
+            if key in child[1]:
+                return node
+            new_child = (h, child[1] + (key,))
+        else:  # <1>
+            child_bit = 1 << ((child[0] >> (shift + BITS)) & MASK)
+            new_child = _add(_Node(child_bit, (child,)), h, key, shift + BITS)
+    else:
+        new_child = _add(child, h, key, shift + BITS)
+        if new_child is child:
+            return node
+    return _Node(node.bitmap, children[:index] + (new_child,) + children[index + 1:])
+
+# <1> two different hashes share the bits so far, so push the existing leaf one level down and split there
+
+
+class PositionHistory:
+    """An immutable set of situations. add() returns a new PositionHistory that shares its structure with this one."""
+    __slots__ = ('_root', '_size')
+
+    def __init__(self, root=EMPTY_NODE, size=0):
+        self._root = root
+        self._size = size
+
+    def add(self, situation):
+        root = _add(self._root, hash(situation) & HASH_MASK, situation, 0)
+        if root is self._root:
+            return self
+        return PositionHistory(root, self._size + 1)
+
+    def __contains__(self, situation):
+        return _contains(self._root, hash(situation) & HASH_MASK, situation)
+
+    def __len__(self):
+        return self._size
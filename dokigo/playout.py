@@ -0,0 +1,332 @@
+"""
+Light random playouts on one reusable board.
+
+A PlayoutBoard is an ArrayBoard that plays a random game out in place, without a GameState or a board copy per move.
+One PlayoutBoard per board size serves every rollout: the position is loaded into it, and the game then runs in a
+single loop over the board's own list of empty points. Moves follow the random bots, which never fill their own
+eyes, and ko is the simple ko rule only.
+"""
+import random
+
+from dokigo.arrayboard import ArrayBoard, EMPTY, BLACK, WHITE, BORDER, mark_ids
+from dokigo import zobrist
+from dokigo.scoring import KOMI
+
+__all__ = [
+    'PlayoutBoard',
+    'play_out',
+]
+
+OTHER_COLOR = [None, WHITE, BLACK]
+
+playout_boards = {}  # <1>
+
+# <1> playout_boards[(9, 9)] is the PlayoutBoard play_out uses for 9x9 games
+
+
+def play_out(game_state, max_moves=None, moves=None, mercy=None):
+    """Play game_state out with random moves and return black's score minus white's score and komi.
+
+    game_state itself is not changed. See PlayoutBoard.play_out for max_moves and mercy. If moves is a list, the stones
+    played are appended to it as (Player.value, point index) pairs, with the point index of geometry.Geometry.
+    """
+    board = game_state.board
+    dim = (board.num_rows, board.num_cols)
+    if dim not in playout_boards:
+        playout_boards[dim] = PlayoutBoard(*dim)
+    playout_board = playout_boards[dim]
+    playout_board.load(board)
+    ko = game_state.ko_point
+    return playout_board.play_out(game_state.next_player.value,
+                                  0 if ko is None else ko.row * playout_board._stride + ko.col,
+                                  game_state.num_passes, max_moves, moves, mercy)
+
+
+class PlayoutBoard(ArrayBoard):
+    def __init__(self, num_rows, num_cols):
+        ArrayBoard.__init__(self, num_rows, num_cols)
+        self._interior = [index for index in range(len(self._stones)) if self._stones[index] == EMPTY]
+        self._point_index = [-1] * len(self._stones)  # <1>
+        for index in self._interior:
+            row, col = divmod(index, self._stride)
+            self._point_index[index] = (row - 1) * num_cols + col - 1
+        stride = self._stride
+        self._neighbors = [None] * len(self._stones)  # <2>
+        self._diagonals = [None] * len(self._stones)
+        self._off_board_corners = [0] * len(self._stones)
+        diagonal_offsets = (-stride - 1, -stride + 1, stride - 1, stride + 1)
+        for index in self._interior:
+            self._neighbors[index] = tuple(index + offset for offset in self._offsets)
+            self._diagonals[index] = tuple(index + offset for offset in diagonal_offsets)
+            self._off_board_corners[index] = sum(self._stones[corner] == BORDER for corner in self._diagonals[index])
+
+    # <1> _point_index[i] is the geometry point index of the padded index i
+    # <2> _neighbors[i] and _diagonals[i] are the padded indices next to and diagonal to the point i, border
+    # included; _off_board_corners[i] is how many of the diagonals are border
+
+    def load(self, board):
+        """Make this board a copy of board, a board of the same size of any kind, reusing the lists of this one."""
+        if isinstance(board, ArrayBoard):
+            self._stones[:] = board._stones  # <1>
+            self._parent[:] = board._parent
+            self._next_stone[:] = board._next_stone
+            self._num_stones[:] = board._num_stones
+            self._liberties[:] = board._liberties
+            self._liberty_sum[:] = board._liberty_sum
+            self._liberty_sum_squares[:] = board._liberty_sum_squares
+            self._empty[:] = board._empty
+            self._empty_position[:] = board._empty_position
+            self._hash = board._hash
+        else:
+            self._rebuild(board)
+
+    # <1> slice assignment copies into the existing lists
+
+    def _rebuild(self, board):
+        """Set up the position of a board that is not an ArrayBoard stone by stone."""
+        stones = self._stones
+        for index in self._interior:
+            stones[index] = EMPTY
+        self._empty[:] = self._interior
+        for position, index in enumerate(self._empty):
+            self._empty_position[index] = position
+        self._hash = zobrist.EMPTY_BOARD
+        points = self._points
+        for index in self._interior:
+            player = board.get(points[index])
+            if player is not None:
+                self._place_stone(player.value, index, None)  # <1>
+
+    # <1> no string of a legal position is without liberties, so placing its stones in any order captures nothing
+
+    def play_out(self, color, ko=0, num_passes=0, max_moves=None, moves=None, mercy=None):
+        """Play random moves in place, color to move first, and return the score like score(). ko is the padded
+        index color may not play on because of a ko, 0 if there is none; num_passes is the passes in a row so far.
+
+        The game stops early after max_moves moves, 3 per point by default, or with mercy set, as soon as one side has
+        more than mercy stones more on the board than the other. The score is then the one of the unfinished game.
+
+        This is the hot loop of every light rollout, so the eye test, the suicide test and placing the stone with its
+        captures (ArrayBoard._place_stone without undo records and without the hash) are all written out inline, on
+        local names."""
+        stones = self._stones
+        parent = self._parent
+        next_stone = self._next_stone
+        num_stones = self._num_stones
+        liberties = self._liberties
+        liberty_sum = self._liberty_sum
+        liberty_sum_squares = self._liberty_sum_squares
+        empty = self._empty
+        empty_position = self._empty_position
+        point_index = self._point_index
+        neighbors = self._neighbors
+        diagonals = self._diagonals
+        off_board_corners = self._off_board_corners
+        uniform = random.random
+        lead = 0  # <1>
+        if mercy is not None:
+            lead = stones.count(BLACK) - stones.count(WHITE)
+        if max_moves is None:
+            max_moves = 3 * self.num_rows * self.num_cols
+        for _ in range(max_moves):
+            if num_passes >= 2:
+                break
+            other = OTHER_COLOR[color]
+            num_empty = len(empty)
+            start = int(uniform() * num_empty)
+            index = 0
+            if num_empty:
+                candidate = empty[start]
+                north, south, west, east = neighbors[candidate]
+                if candidate != ko and (stones[north] == EMPTY or stones[south] == EMPTY or
+                                        stones[west] == EMPTY or stones[east] == EMPTY):  # <2>
+                    index = candidate
+            for candidate in (() if index else empty[start:] + empty[:start]):  # <3>
+                if candidate == ko:
+                    continue
+                candidate_neighbors = neighbors[candidate]
+                north, south, west, east = candidate_neighbors
+                a = stones[north]
+                b = stones[south]
+                c = stones[west]
+                d = stones[east]
+                if a == EMPTY or b == EMPTY or c == EMPTY or d == EMPTY:
+                    index = candidate
+                    break
+                if a != other and b != other and c != other and d != other:  # <4>
+                    corner_a, corner_b, corner_c, corner_d = diagonals[candidate]
+                    friendly_corners = (stones[corner_a] == color) + (stones[corner_b] == color) + \
+                        (stones[corner_c] == color) + (stones[corner_d] == color)
+                    off_board = off_board_corners[candidate]
+                    if off_board:
+                        if off_board + friendly_corners == 4:
+                            continue
+                    elif friendly_corners >= 3:
+                        continue
+                for neighbor in candidate_neighbors:  # <5>
+                    neighbor_color = stones[neighbor]
+                    if neighbor_color == BORDER:
+                        continue
+                    root = parent[neighbor]
+                    total = liberty_sum[root]
+                    if (liberties[root] * liberty_sum_squares[root] == total * total) != (neighbor_color == color):
+                        index = candidate
+                        break
+                if index:
+                    break
+            if not index:
+                num_passes += 1
+                ko = 0
+                color = other
+                continue
+            num_passes = 0
+            ko = 0
+
+            stones[index] = color  # <6>
+            last = empty.pop()
+            if last != index:
+                position = empty_position[index]
+                empty[position] = last
+                empty_position[last] = position
+            own_root = index  # <7>
+            own_liberties = 0
+            own_sum = 0
+            own_sum_squares = 0
+            square = index * index
+            capture = False
+            index_neighbors = neighbors[index]
+            for neighbor in index_neighbors:
+                neighbor_color = stones[neighbor]
+                if neighbor_color == EMPTY:
+                    own_liberties += 1
+                    own_sum += neighbor
+                    own_sum_squares += neighbor * neighbor
+                    continue
+                if neighbor_color == BORDER:
+                    continue
+                root = parent[neighbor]
+                liberties[root] -= 1
+                liberty_sum[root] -= index
+                liberty_sum_squares[root] -= square
+                if neighbor_color != color:
+                    if not liberties[root]:
+                        capture = True
+                elif own_root == index:
+                    own_root = root
+                elif root != own_root:
+                    if num_stones[own_root] < num_stones[root]:  # <8>
+                        own_root, root = root, own_root
+                    stone = root
+                    while True:
+                        parent[stone] = own_root
+                        stone = next_stone[stone]
+                        if stone == root:
+                            break
+                    next_stone[own_root], next_stone[root] = next_stone[root], next_stone[own_root]
+                    num_stones[own_root] += num_stones[root]
+                    liberties[own_root] += liberties[root]
+                    liberty_sum[own_root] += liberty_sum[root]
+                    liberty_sum_squares[own_root] += liberty_sum_squares[root]
+            if own_root == index:
+                parent[index] = index
+                next_stone[index] = index
+                num_stones[index] = 1
+                liberties[index] = own_liberties
+                liberty_sum[index] = own_sum
+                liberty_sum_squares[index] = own_sum_squares
+            else:
+                parent[index] = own_root
+                next_stone[index] = next_stone[own_root]
+                next_stone[own_root] = index
+                num_stones[own_root] += 1
+                liberties[own_root] += own_liberties
+                liberty_sum[own_root] += own_sum
+                liberty_sum_squares[own_root] += own_sum_squares
+
+            num_captured = 0
+            if capture:
+                for neighbor in index_neighbors:  # <9>
+                    if stones[neighbor] != other:
+                        continue
+                    root = parent[neighbor]
+                    if liberties[root]:
+                        continue
+                    stone = root
+                    while True:
+                        stones[stone] = EMPTY
+                        empty_position[stone] = len(empty)
+                        empty.append(stone)
+                        num_captured += 1
+                        stone = next_stone[stone]
+                        if stone == root:
+                            break
+                    while True:
+                        for neighbor_stone in neighbors[stone]:
+                            if stones[neighbor_stone] == color:  # <11>
+                                string = parent[neighbor_stone]
+                                liberties[string] += 1
+                                liberty_sum[string] += stone
+                                liberty_sum_squares[string] += stone * stone
+                        stone = next_stone[stone]
+                        if stone == root:
+                            break
+                if num_captured == 1 and own_root == index and liberties[index] == 1:  # <10>
+                    ko = liberty_sum[index]
+
+            if moves is not None:
+                moves.append((color, point_index[index]))
+            if mercy is not None:
+                gained = 1 + num_captured
+                lead += gained if color == BLACK else -gained
+                if lead > mercy or -lead > mercy:
+                    break
+            color = other
+        return self.score()
+
+    # <1> black's stones minus white's stones, only kept up to date for the mercy rule
+    # <2> a point next to an empty point is neither an eye nor suicide, which settles most candidates at once
+    # <3> when the point at the start can't be played right away: the empty points from there on, wrapping around;
+    # a copy, since placing the stone changes the list
+    # <4> the eye test of agent.utilities.is_point_an_eye: no neighbor is empty or the opponent's, so all of them are
+    # the player's own or off the board, and so are enough of the diagonals
+    # <5> ArrayBoard._is_self_capture for a point without empty neighbors: the stone lives if it captures an opposite
+    # string in atari, or connects to an own string that is not
+    # <6> ArrayBoard._place_stone: take the point out of the empty list, and join the stone to the own strings next
+    # to it
+    # <7> the string the stone joins; the first own string next to it, the others are merged into that one, and the
+    # stone is linked in at the end. It stays index if the stone is a string of its own.
+    # <8> point the stones of the smaller string at the root of the larger one, as ArrayBoard._merge does
+    # <9> ArrayBoard._remove_string for every opposite string without liberties left; removing a string gives each
+    # stone next to it a pseudo liberty
+    # <10> one stone was captured by a stone that is still a string of its own, and whose only liberty is that point:
+    # the opponent may not take back right away. With a single pseudo liberty, their sum is the point itself.
+    # <11> the stones next to a captured string are the player's own, and everything else is empty or border
+    def score(self, komi=KOMI):
+        """Return black's area score minus white's area score and komi."""
+        stones = self._stones
+        neighbors = self._neighbors
+        marks = self._marks
+        mark_id = next(mark_ids)
+        score = stones.count(BLACK) - stones.count(WHITE)
+        for start in self._empty:
+            if marks[start] == mark_id:
+                continue
+            marks[start] = mark_id
+            region = [start]
+            borders = 0  # <1>
+            for index in region:  # the list grows while we walk it
+                for neighbor in neighbors[index]:
+                    neighbor_color = stones[neighbor]
+                    if neighbor_color == EMPTY:
+                        if marks[neighbor] != mark_id:
+                            marks[neighbor] = mark_id
+                            region.append(neighbor)
+                    elif neighbor_color != BORDER:
+                        borders |= neighbor_color
+            if borders == BLACK:
+                score += len(region)
+            elif borders == WHITE:
+                score -= len(region)
+        return score - komi
+
+    # <1> BLACK | WHITE when the region touches both colors, which makes it dame
@@ -1,5 +1,8 @@
 from collections import namedtuple
-from dokigo.base import Player, Point
+from dokigo.base import Player
+from dokigo.geometry import board_geometry
+
+KOMI = 7.5
 
 
 # tag::scoring_territory[]
@@ -61,32 +64,36 @@ trivially dead groups.
 
 # tag::scoring_evaluate_territory[]
 def evaluate_territory(board):
+    if hasattr(board, 'evaluate_territory'):  # <0>
+        return board.evaluate_territory()
 
+    geometry = board_geometry((board.num_rows, board.num_cols))
+    colors = [board.get(p) for p in geometry.points]  # <1>
     status = {}
-    for r in range(1, board.num_rows + 1):
-        for c in range(1, board.num_cols + 1):
-            p = Point(row=r, col=c)
-            if p in status:  # <1>
-                continue
-            stone = board.get(p)
-            if stone is not None:  # <2>
-                status[p] = board.get(p)  # return the color of the stone
+    for index, p in enumerate(geometry.points):
+        if p in status:  # <2>
+            continue
+        stone = colors[index]
+        if stone is not None:  # <3>
+            status[p] = stone  # return the color of the stone
+        else:
+            group, neighbors = _collect_region(index, colors, geometry)
+            if len(neighbors) == 1:  # <4>
+                neighbor_stone = neighbors.pop()
+                stone_str = 'b' if neighbor_stone == Player.black else 'w'
+                fill_with = 'territory_' + stone_str
             else:
-                group, neighbors = _collect_region(p, board)
-                if len(neighbors) == 1:  # <3>
-                    neighbor_stone = neighbors.pop()
-                    stone_str = 'b' if neighbor_stone == Player.black else 'w'
-                    fill_with = 'territory_' + stone_str
-                else:
-                    fill_with = 'dame'  # <4>
-                for pos in group:
-                    status[pos] = fill_with
+                fill_with = 'dame'  # <5>
+            for pos in group:
+                status[geometry.points[pos]] = fill_with
     return Territory(status)
 
-# <1> Skip the point, if you already visited this as part of a different group.
-# <2> If the point is a stone, add it as status.
-# <3> If a point is completely surrounded by black or white stones, count it as territory.
-# <4> Otherwise the point has to be a neutral point, so we add it to dame.
+# <0> Boards with a faster way to find the regions, like bitboard.BitBoard, do it themselves.
+# <1> Look every point up once; the regions are then walked by index with the neighbor lists of the geometry.
+# <2> Skip the point, if you already visited this as part of a different group.
+# <3> If the point is a stone, add it as status.
+# <4> If a point is completely surrounded by black or white stones, count it as territory.
+# <5> Otherwise the point has to be a neutral point, so we add it to dame.
 
 
 
@@ -97,28 +104,20 @@ identify all the boundary points.
 """
 
 
-def _collect_region(start_pos, board, visited=None):
-
-    if visited is None:
-        visited = {}
-    if start_pos in visited:
-        return [], set()
-    all_points = [start_pos]
+def _collect_region(start, colors, geometry):
+    here = colors[start]
+    all_points = [start]
     all_borders = set()
-    visited[start_pos] = True
-    here = board.get(start_pos)
-    deltas = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    for delta_r, delta_c in deltas:
-        next_p = Point(row=start_pos.row + delta_r, col=start_pos.col + delta_c)
-        if not board.is_on_grid(next_p):
-            continue
-        neighbor = board.get(next_p)
-        if neighbor == here:
-            points, borders = _collect_region(next_p, board, visited)
-            all_points += points
-            all_borders |= borders
-        else:
-            all_borders.add(neighbor)
+    visited = {start}
+    neighbor_lists = geometry.neighbor_lists
+    for index in all_points:  # the list grows while we walk it, which makes this a breadth first search
+        for neighbor in neighbor_lists[index]:
+            color = colors[neighbor]
+            if color != here:
+                all_borders.add(color)
+            elif neighbor not in visited:
+                visited.add(neighbor)
+                all_points.append(neighbor)
     return all_points, all_borders
 
 
@@ -129,5 +128,5 @@ def compute_game_result(game_state):
     return GameResult(
         territory.num_black_territory + territory.num_black_stones,
         territory.num_white_territory + territory.num_white_stones,
-        komi=7.5)
+        komi=KOMI)
 # end::scoring_compute_game_result[]
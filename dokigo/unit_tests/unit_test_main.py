@@ -8,6 +8,27 @@ from dokigo.utilities import print_board,print_move,point_from_coords
 from dokigo.sgfio.adaptor import SGF_to_DokiGo
 
 from dokigo import goboard
+from dokigo.arrayboard import ArrayBoard
+from dokigo.bitboard import BitBoard
+from dokigo.history import PositionHistory
+from dokigo.scoring import evaluate_territory, compute_game_result
+from dokigo.batchboard import BatchBoard
+from dokigo import playout
+from dokigo.playout import play_out
+from dokigo.agent.utilities import is_point_an_eye
+from dokigo.geometry import board_geometry
+from dokigo.agent.transposition import TranspositionTable
+from dokigo.agent.mcts import MCTSAgent, MCTSNode, stone_lead
+from dokigo.agent.mcts_array import ArrayMCTSAgent, SearchTree
+from dokigo.agent.timecontrol import GameClock
+from dokigo import base
+from dokigo import zobrist
+import random
+import copy
+import pickle
+import itertools
+from unittest import mock
+import math
 
 class TestSGFIO(unittest.TestCase):
     def test_generator(self):
@@ -59,9 +80,11 @@ class TestSGFIO(unittest.TestCase):
 
 class TestGoBoard(unittest.TestCase):
 
+    board_class = goboard.Board
+
     def test_ko(self):
         board_size = 9
-        game = goboard.GameState.new_game(board_size)
+        game = goboard.GameState.new_game(board_size, self.board_class)
         single_ko_moves = ['A2','A3','C2','C3','B1','B4','B3','B2']
         the_single_ko_move = 'B3'
         for item in single_ko_moves:
@@ -94,6 +117,570 @@ class TestGoBoard(unittest.TestCase):
         # print_board(game.board)
         # the above code can visualize the ko situation
 
+    def test_play_undo(self):
+        random.seed(1)
+        game = goboard.GameState.new_game(9, self.board_class)
+        board = self.board_class(9, 9)
+        records = []
+        snapshots = []
+        while not game.is_over():
+            move = random.choice(game.legal_moves()[:-1])  # never resign
+            snapshots.append(self._snapshot(board))
+            records.append(board.play(game.next_player, move))
+            game = game.apply_move(move)
+            self.assertEqual(self._snapshot(board), self._snapshot(game.board))
+        for record, snapshot in zip(reversed(records), reversed(snapshots)):
+            board.undo(record)
+            self.assertEqual(self._snapshot(board), snapshot)
+
+    def test_zobrist_hash_after(self):
+        random.seed(2)
+        game = goboard.GameState.new_game(9, self.board_class)
+        while not game.is_over():
+            for row in range(1, 10):
+                for col in range(1, 10):
+                    point = Point(row, col)
+                    if game.board.get(point) is None:
+                        board = copy.deepcopy(game.board)
+                        board.place_stone(game.next_player, point)
+                        self.assertEqual(board.zobrist_hash(),
+                                         game.board.zobrist_hash_after(game.next_player, point))
+            game = game.apply_move(random.choice(game.legal_moves()[:-1]))
+
+    def test_legal_moves(self):
+        random.seed(4)
+        game = goboard.GameState.new_game(9, self.board_class)
+        while not game.is_over():
+            expected = [goboard.Move.play(Point(row, col)) for row in range(1, 10) for col in range(1, 10)]
+            expected = [move for move in expected if game.is_valid_move(move)]
+            legal_moves = game.legal_moves()
+            self.assertEqual(set(legal_moves), set(expected + [goboard.Move.pass_turn(), goboard.Move.resign()]))
+            game = game.apply_move(random.choice(legal_moves[:-1]))
+
+    def test_liberty_counts(self):
+        random.seed(6)
+        game = goboard.GameState.new_game(9, self.board_class)
+        while not game.is_over():  # the liberty sets are only built at the end
+            game = game.apply_move(random.choice(game.legal_moves()[:-1]))
+        for row in range(1, 10):
+            for col in range(1, 10):
+                string = game.board.get_go_string(Point(row, col))
+                if string is not None:
+                    expected = {neighbor for stone in string.stones for neighbor in game.board.neighbors(stone)
+                                if game.board.get(neighbor) is None}
+                    self.assertEqual(string.num_liberties, len(expected))
+                    self.assertEqual(string.liberties, expected)
+
+    def test_position_key(self):
+        random.seed(9)
+        game = goboard.GameState.new_game(9, self.board_class)
+        while not game.is_over():
+            game = game.apply_move(random.choice(game.legal_moves()[:-1]))
+            previous = game.previous_state
+            for point in game.board.empty_points():  # <1>
+                takes_back = game.board.zobrist_hash_after(game.next_player, point) == previous.board.zobrist_hash()
+                self.assertEqual(takes_back, point == game.ko_point)
+            self.assertNotEqual(game.position_key, previous.position_key)
+
+        moves = [goboard.Move.play(Point(3, 3)), goboard.Move.play(Point(5, 5)), goboard.Move.play(Point(7, 7))]
+        first = goboard.GameState.new_game(9, self.board_class)
+        second = goboard.GameState.new_game(9, self.board_class)
+        for move, transposed in zip(moves, reversed(moves)):
+            first = first.apply_move(move)
+            second = second.apply_move(transposed)
+        self.assertEqual(first.position_key, second.position_key)
+        passed = first.apply_move(goboard.Move.pass_turn())
+        self.assertEqual(passed.position_key,
+                         first.position_key ^ zobrist.SIDE_CODES[2] ^ zobrist.PASS_CODES[1])
+
+    # <1> a stone on the ko point would take back the last move, no other move can bring the board back
+
+    @staticmethod
+    def _snapshot(board):
+        strings = [board.get_go_string(Point(row, col))
+                   for row in range(1, board.num_rows + 1)
+                   for col in range(1, board.num_cols + 1)]
+        return board.zobrist_hash(), strings
+
+
+class TestArrayBoard(TestGoBoard):
+    board_class = ArrayBoard
+
+    def test_same_as_board(self):
+        random.seed(0)
+        for _ in range(5):
+            game = goboard.GameState.new_game(9)
+            array_game = goboard.GameState.new_game(9, self.board_class)
+            while not game.is_over():
+                move = random.choice(game.legal_moves()[:-1])  # never resign
+                game = game.apply_move(move)
+                array_game = array_game.apply_move(move)
+                self.assertEqual(game.board.zobrist_hash(), array_game.board.zobrist_hash())
+                for row in range(1, 10):
+                    for col in range(1, 10):
+                        point = Point(row, col)
+                        self.assertEqual(game.board.get_go_string(point), array_game.board.get_go_string(point))
+
+
+class TestBitBoard(TestArrayBoard):
+    board_class = BitBoard
+
+    def test_territory_and_eyes(self):
+        random.seed(5)
+        game = goboard.GameState.new_game(9)
+        bit_game = goboard.GameState.new_game(9, BitBoard)
+        while not game.is_over():
+            move = random.choice(game.legal_moves()[:-1])  # never resign
+            game = game.apply_move(move)
+            bit_game = bit_game.apply_move(move)
+            territory = evaluate_territory(game.board)
+            bit_territory = evaluate_territory(bit_game.board)
+            territory.dame_points.sort()
+            bit_territory.dame_points.sort()
+            self.assertEqual(vars(territory), vars(bit_territory))
+            for row in range(1, 10):
+                for col in range(1, 10):
+                    for player in base.Player:
+                        self.assertEqual(is_point_an_eye(game.board, Point(row, col), player),
+                                         is_point_an_eye(bit_game.board, Point(row, col), player))
+
+
+class TestBatchBoard(unittest.TestCase):
+    def test_same_as_game_state(self):
+        np.random.seed(6)
+        batch = BatchBoard(8, 9, 9)
+        games = [goboard.GameState.new_game(9) for _ in range(batch.num_games)]
+        while not batch.is_over.all():
+            moves = batch.play_random_moves()
+            for k, game in enumerate(games):
+                if game.is_over():
+                    continue
+                if moves[k] >= 0:
+                    move = goboard.move_table((9, 9))[moves[k]]
+                    self.assertTrue(game.is_valid_move(move))
+                else:
+                    move = goboard.Move.pass_turn()
+                games[k] = game = game.apply_move(move)
+                for index, point in enumerate(base.point_table((9, 9))):
+                    color = game.board.get(point)
+                    self.assertEqual(batch.stones[k].flat[index], 0 if color is None else color.value)
+        for game, score in zip(games, batch.scores()):
+            result = compute_game_result(game)
+            self.assertAlmostEqual(result.b - result.w - result.komi, score)
+
+
+    def test_from_game_state(self):
+        np.random.seed(7)
+        game = goboard.GameState.new_game(5)
+        for move in [(2, 1), (1, 3), (1, 2), (3, 3), (3, 2), (2, 4), (5, 5), (2, 2), (2, 3)]:
+            game = game.apply_move(goboard.Move.play(Point(*move)))
+        self.assertEqual(game.ko_point, Point(2, 2))  # black took the white stone on (2, 2)
+        batch = BatchBoard.from_game_state(game, 64)
+        self.assertTrue(np.all(batch.ko_point == 6))
+        self.assertFalse(np.any(batch.play_random_moves() == 6))  # white can't take back right away
+
+        game = game.apply_move(goboard.Move.pass_turn())
+        batch = BatchBoard.from_game_state(game, 4)
+        self.assertTrue(np.all(batch.passes == 1))
+        self.assertTrue(np.all(batch.ko_point == -1))
+
+
+class TestPlayout(unittest.TestCase):
+    def test_play_out(self):
+        geometry = board_geometry((5, 5))
+        for board_class in (None, ArrayBoard):
+            random.seed(18)
+            game = goboard.GameState.new_game(5, board_class)
+            for move in [(3, 3), (2, 3), (3, 2)]:
+                game = game.apply_move(goboard.Move.play(Point(*move)))
+            moves = []
+            score = play_out(game, moves=moves)
+            self.assertGreater(len(moves), 10)
+            for color, index in moves:
+                if base.Player(color) != game.next_player:
+                    game = game.apply_move(goboard.Move.pass_turn())
+                move = goboard.Move.play(geometry.points[index])
+                self.assertTrue(game.is_valid_move(move))
+                game = game.apply_move(move)
+            result = compute_game_result(game)
+            self.assertAlmostEqual(result.b - result.w - result.komi, score)
+
+    def test_early_termination(self):
+        game = goboard.GameState.new_game(9, ArrayBoard)
+        random.seed(21)
+        full = []
+        play_out(game, moves=full)
+        random.seed(21)
+        capped = []
+        play_out(game, max_moves=20, moves=capped)
+        self.assertEqual(capped, full[:20])
+        random.seed(21)
+        mercy = []
+        score = play_out(game, moves=mercy, mercy=10)
+        self.assertEqual(mercy, full[:len(mercy)])
+        board = playout.playout_boards[9, 9]
+        lead = board._stones.count(base.Player.black.value) - board._stones.count(base.Player.white.value)
+        self.assertGreater(abs(lead), 10)
+        self.assertLess(len(mercy), len(full))
+        self.assertAlmostEqual(score, board.score())
+
+    def test_agent(self):
+        random.seed(19)
+        game = goboard.GameState.new_game(5, ArrayBoard)
+        agent = MCTSAgent(60, 1.5, light_playouts=True, rave_equivalence=300)
+        move = agent.select_move(game)
+        self.assertTrue(game.is_valid_move(move))
+        self.assertEqual(agent._root.num_rollouts, 60)
+
+        agent = MCTSAgent(60, 1.5, light_playouts=True, mercy=8, max_rollout_moves=50, margin_weight=0.5)
+        move = agent.select_move(game)
+        self.assertTrue(game.is_valid_move(move))
+        root = agent._root
+        self.assertAlmostEqual(sum(root.win_counts.values()), 60)
+        self.assertNotEqual(root.win_counts[base.Player.black], round(root.win_counts[base.Player.black]))
+        self.assertEqual(agent.black_value(100, game), 1.0)
+        self.assertEqual(agent.black_value(-0.5, game), 0.5 * (0.5 - 0.5 / 50))
+
+
+class TestMove(unittest.TestCase):
+    def test_interned(self):
+        self.assertIs(goboard.Move.play(Point(3, 4)), goboard.Move.play(Point(row=3, col=4)))
+        self.assertIs(goboard.Move.pass_turn(), goboard.Move.pass_turn())
+        moves = goboard.move_table((9, 9))
+        for index, point in enumerate(base.point_table((9, 9))):
+            self.assertEqual(index, 9 * (point.row - 1) + point.col - 1)
+            self.assertIs(moves[index], goboard.Move.play(point))
+        for move in (moves[5], goboard.Move.pass_turn(), goboard.Move.resign()):
+            self.assertIs(copy.deepcopy(move), move)
+            self.assertIs(pickle.loads(pickle.dumps(move)), move)
+        self.assertFalse(hasattr(moves[5], '__dict__'))
+        self.assertFalse(hasattr(Point(1, 1), '__dict__'))
+
+
+class TestPositionHistory(unittest.TestCase):
+    def test_add_is_persistent(self):
+        random.seed(3)
+        history = PositionHistory()
+        snapshots = [(history, set())]
+        expected = set()
+        for _ in range(2000):
+            situation = (random.choice(list(base.Player)), random.getrandbits(random.choice([4, 64])))
+            history = history.add(situation)
+            expected = expected | {situation}
+            snapshots.append((history, expected))
+        for history, expected in snapshots[::100]:
+            self.assertEqual(len(history), len(expected))
+            for situation in list(snapshots[-1][1])[:100]:
+                self.assertEqual(situation in history, situation in expected)
+
+
+class TestGeometry(unittest.TestCase):
+    def test_tables(self):
+        for dim in [(9, 9), (5, 7)]:
+            geometry = board_geometry(dim)
+            self.assertIs(geometry, board_geometry(dim))
+            for index, point in enumerate(geometry.points):
+                self.assertEqual(geometry.index(point), index)
+                self.assertEqual(geometry.neighbor_points[index],
+                                 [n for n in point.neighbors() if geometry.is_on_grid(n)])
+                on_edge = point.row in (1, dim[0]) or point.col in (1, dim[1])
+                self.assertEqual(len(geometry.diagonal_lists[index]) < 4, on_edge)
+
+
+class TestZobrist(unittest.TestCase):
+    def test_tables(self):
+        codes = zobrist.CODES[1] + zobrist.CODES[2]
+        self.assertEqual(len(set(codes)), 2 * zobrist.MAX_BOARD_SIZE ** 2)
+        self.assertEqual(zobrist._generate_codes(), zobrist.CODES)
+        for dim in [(9, 9), (19, 19), (7, 25)]:
+            table = zobrist.hash_table(dim)
+            for index, point in enumerate(board_geometry(dim).points):
+                for player in base.Player:
+                    self.assertEqual(table[player.value][index], zobrist.HASH_CODE[point, player])
+        self.assertRaises(ValueError, zobrist.hash_table, (26, 26))
+
+    def test_128_bits(self):
+        random.seed(7)
+        for board_class in [goboard.Board, ArrayBoard, BitBoard]:
+            game = goboard.GameState.new_game(9, board_class)
+            wide_game = goboard.GameState.new_game(9, board_class, hash_bits=128)
+            while not game.is_over():
+                move = random.choice(game.legal_moves()[:-1])
+                game = game.apply_move(move)
+                wide_game = wide_game.apply_move(move)
+                self.assertEqual(wide_game.board.zobrist_hash() & (2 ** 64 - 1), game.board.zobrist_hash())
+                self.assertGreater(wide_game.board.zobrist_hash().bit_length(), 64)
+
+    def test_collision_counter(self):
+        counter = zobrist.CollisionCounter()
+        self.assertFalse(counter.check(1, 'a'))
+        self.assertFalse(counter.check(1, 'a'))
+        self.assertTrue(counter.check(1, 'b'))
+        self.assertEqual((counter.hits, counter.collisions), (2, 1))
+
+        counter = zobrist.CollisionCounter()
+        goboard.GameState.collision_counter = counter
+        try:
+            random.seed(8)
+            game = goboard.GameState.new_game(9, ArrayBoard)
+            while not game.is_over():
+                game = game.apply_move(random.choice(game.legal_moves()[:-1]))
+        finally:
+            goboard.GameState.collision_counter = None
+        self.assertGreater(len(counter.positions), 50)
+        self.assertEqual(counter.collisions, 0)
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_eviction(self):
+        for policy, kept in [('lru', {'a', 'c', 'd'}), ('fifo', {'b', 'c', 'd'})]:
+            evicted = []
+            table = TranspositionTable(3, policy, on_evict=evicted.append)
+            for key in 'abc':
+                table.put(key, key.upper())
+            self.assertEqual(table.get('a'), 'A')
+            table.put('d', 'D')
+            self.assertEqual({key for key in 'abcd' if key in table}, kept)
+            self.assertEqual(len(evicted), 1)
+            self.assertIsNone(table.get(evicted[0].lower()))
+
+    def test_touch_and_can_evict(self):
+        table = TranspositionTable(3, 'lru', can_evict=lambda node: node != 'B')
+        for key in 'abc':
+            table.put(key, key.upper())
+        table.touch('a')
+        table.put('d', 'D')  # 'b' is the oldest, but may not go
+        self.assertEqual({key for key in 'abcd' if key in table}, {'a', 'b', 'd'})
+
+
+class TestMCTSAgent(unittest.TestCase):
+    def test_transpositions(self):
+        random.seed(10)
+        np.random.seed(10)
+        game = goboard.GameState.new_game(5, ArrayBoard)
+        agent = MCTSAgent(120, 1.5, table_size=100, eviction='fifo', widening=1)  # narrow trees transpose more
+        for _ in range(4):
+            move = agent.select_move(game)
+            self.assertTrue(game.is_valid_move(move))
+            game = game.apply_move(move)
+        self.assertEqual(len(agent.table), 100)
+        self.assertGreater(agent.table.hits, 0)
+
+    def test_lru_keeps_root_children(self):
+        random.seed(10)
+        np.random.seed(10)
+        game = goboard.GameState.new_game(5, ArrayBoard)
+        agent = MCTSAgent(300, 1.5, table_size=40, eviction='lru', widening=1)
+        agent.select_move(game)
+        root = agent._root
+        self.assertGreater(agent.table.evictions, 0)
+        for child in root.children:
+            self.assertIn(child.game_state.position_key, agent.table)
+            if child.num_rollouts > 1:
+                self.assertEqual(child.child_total, child.num_rollouts - 1)  # no subtree was forgotten
+
+    def test_root_from_table(self):
+        random.seed(24)
+        np.random.seed(24)
+        game = goboard.GameState.new_game(5, ArrayBoard)
+        agent = MCTSAgent(60, 1.5, table_size=40, reuse_tree=False)
+        move = agent.select_move(game)
+        child = agent._root.children[agent._root.child_moves.index(move)]
+        kept = child.num_rollouts
+        game = game.apply_move(move)
+        agent.select_move(game)
+        self.assertIs(agent._root, child)  # the node from the table, not a new one over it
+        self.assertIs(agent._root.game_state, game)
+        self.assertEqual(agent._root.num_rollouts, kept + 60)
+
+    def test_reuse_tree(self):
+        random.seed(13)
+        np.random.seed(13)
+        game = goboard.GameState.new_game(5, ArrayBoard)
+        agent = MCTSAgent(100, 1.5)
+        move = agent.select_move(game)
+        child = agent._root.children[agent._root.child_moves.index(move)]
+        reply = int(np.argmax(child.child_rollouts))  # a reply the tree already searched
+        kept = child.children[reply].num_rollouts
+        self.assertGreater(kept, 0)
+        game = game.apply_move(move).apply_move(child.child_moves[reply])
+        agent.select_move(game)
+        self.assertEqual(agent._root.num_rollouts, kept + 100)
+        self.assertIs(agent._root.game_state, game)
+
+    def test_select_child(self):
+        random.seed(12)
+        np.random.seed(12)
+        game = goboard.GameState.new_game(5, ArrayBoard)
+        agent = MCTSAgent(120, 1.5)
+        agent.select_move(game)
+        root = agent._root
+        self.assertEqual(root.child_total, sum(child.num_rollouts for child in root.children))
+        scores = [child.winning_frac(game.next_player) +
+                  1.5 * math.sqrt(math.log(root.child_total) / child.num_rollouts) for child in root.children]
+        self.assertEqual(agent.select_child_index(root), scores.index(max(scores)))
+
+    def test_widening(self):
+        random.seed(16)
+        np.random.seed(16)
+        game = goboard.GameState.new_game(5, ArrayBoard)
+        node = MCTSNode(game)
+        self.assertIsNone(node.unvisited_moves)
+        self.assertTrue(node.can_add_child())
+        self.assertEqual(len(node.unvisited_moves), 27)
+        self.assertEqual(node.unvisited_moves[:2], [goboard.Move.resign(), goboard.Move.pass_turn()])
+        agent = MCTSAgent(100, 1.5, widening=1)
+        agent.select_move(game)
+        root = agent._root
+        self.assertEqual(agent.max_children(root), 10)
+        self.assertEqual(len(root.children), 9)  # the last child was added at 81 rollouts
+        self.assertGreater(max(child.num_rollouts for child in root.children), 10)
+
+    def test_rave(self):
+        random.seed(17)
+        np.random.seed(17)
+        game = goboard.GameState.new_game(5, ArrayBoard)
+        agent = MCTSAgent(100, 1.5, rave_equivalence=300)
+        move = agent.select_move(game)
+        self.assertTrue(game.is_valid_move(move))
+        root = agent._root
+        num_children = len(root.children)
+        rollouts = root.child_rollouts[:num_children]
+        amaf_rollouts = root.child_amaf_rollouts[:num_children]
+        self.assertTrue(np.all(amaf_rollouts[root.child_points[:num_children] >= 0] >=
+                               rollouts[root.child_points[:num_children] >= 0]))  # a child's own move counts too
+        self.assertGreater(amaf_rollouts.sum(), 2 * rollouts.sum())
+        self.assertTrue(np.all(root.child_amaf_wins[:num_children] <= amaf_rollouts))
+
+    def test_rollouts_per_expansion(self):
+        game = goboard.GameState.new_game(5, ArrayBoard)
+        for batch_rollouts in (False, True):
+            random.seed(20)
+            np.random.seed(20)
+            agent = MCTSAgent(20, 1.5, rollouts_per_expansion=4, batch_rollouts=batch_rollouts)
+            move = agent.select_move(game)
+            self.assertTrue(game.is_valid_move(move))
+            root = agent._root
+            self.assertEqual(root.num_rollouts, 80)
+            self.assertEqual(root.child_total, 80)
+            self.assertEqual(sum(root.win_counts.values()), 80)
+            self.assertTrue(np.all(root.child_rollouts[:len(root.children)] % 4 == 0))
+
+    def test_mercy(self):
+        game = goboard.GameState.new_game(9, ArrayBoard)
+        np.random.seed(22)
+        full = []
+        MCTSAgent.play_random_game(game, full)
+        np.random.seed(22)
+        moves = []
+        end = MCTSAgent.play_random_game(game, moves, mercy=10)
+        self.assertEqual(moves, full[:len(moves)])
+        self.assertLess(len(moves), len(full))
+        self.assertGreater(abs(stone_lead(end.board)), 10)
+
+        np.random.seed(22)
+        full = BatchBoard.from_game_state(game, 8)
+        full.play_out()
+        np.random.seed(22)
+        batch = BatchBoard.from_game_state(game, 8)
+        batch.play_out(mercy=10)
+        lead = (batch.stones == base.Player.black.value).sum(axis=(1, 2)) - \
+            (batch.stones == base.Player.white.value).sum(axis=(1, 2))
+        stopped = batch.num_moves < full.num_moves  # the same games, cut short
+        self.assertTrue(stopped.any())
+        self.assertTrue((np.abs(lead[stopped]) > 10).all())
+        self.assertTrue((batch.stones[~stopped] == full.stones[~stopped]).all())
+
+    def test_time_control(self):
+        random.seed(14)
+        np.random.seed(14)
+        game = goboard.GameState.new_game(5, ArrayBoard)
+        clock = GameClock(2.0, safety_margin=1.0)
+        self.assertAlmostEqual(clock.time_for_move(game), 1.0 / 12)
+        clock.spend(0.5)
+        self.assertAlmostEqual(clock.time_for_move(game), 0.5 / 12)
+        clock = GameClock(2.0, safety_margin=1.0)
+        agent = MCTSAgent(None, 1.5, clock=clock)
+        ticks = itertools.count(1)
+        with mock.patch('dokigo.agent.mcts.time.perf_counter', lambda: next(ticks) / 100):  # 10ms per reading
+            move = agent.select_move(game)
+        self.assertTrue(game.is_valid_move(move))
+        # the search starts at 0.01 and the first round needs no reading; the deadline is 1 / 12 later, the readings
+        # at 0.02 to 0.09 each allow another round, the one at 0.10 stops the search and the move is charged at 0.11
+        self.assertEqual(agent._root.num_rollouts, 9)
+        self.assertAlmostEqual(clock.remaining, 1.9)
+
+        for agent in [MCTSAgent(None, 1.5, time_limit=0.0), MCTSAgent(None, 1.5, clock=GameClock(0.4))]:
+            move = agent.select_move(game)  # no time at all still gets one round
+            self.assertTrue(game.is_valid_move(move))
+            self.assertEqual(agent._root.num_rollouts, 1)
+
+        random.seed(14)
+        np.random.seed(14)
+        agent = MCTSAgent(400, 0.2, early_stop=True, reuse_tree=False)  # a low temperature lets one move pull ahead
+        agent.select_move(game)
+        rollouts = sorted(agent._root.child_rollouts)
+        self.assertLess(agent._root.num_rollouts, 400)
+        self.assertGreater(rollouts[-1] - rollouts[-2], 400 - agent._root.num_rollouts)
+        self.assertRaises(ValueError, MCTSAgent, None, 1.5)
+
+    def test_root_parallel(self):
+        random.seed(15)
+        game = goboard.GameState.new_game(5)
+        for move in [(3, 3), (2, 3), (3, 2)]:
+            game = game.apply_move(goboard.Move.play(Point(*move)))
+        agent = MCTSAgent(60, 1.5, num_workers=2)
+        try:
+            for _ in range(2):
+                move = agent.select_move(game)
+                self.assertTrue(game.is_valid_move(move))
+                game = game.apply_move(move)
+        finally:
+            agent.close()
+
+
+class TestArrayMCTSAgent(unittest.TestCase):
+    def test_select_move(self):
+        random.seed(11)
+        np.random.seed(11)
+        game = goboard.GameState.new_game(5, ArrayBoard)
+        agent = ArrayMCTSAgent(80, 1.5)
+        for _ in range(3):
+            move = agent.select_move(game)
+            self.assertTrue(game.is_valid_move(move))
+            game = game.apply_move(move)
+
+    def test_tree_parallel(self):
+        random.seed(23)
+        game = goboard.GameState.new_game(5, ArrayBoard)
+        agent = ArrayMCTSAgent(60, 1.5, num_workers=3)
+        tree = agent._search_parallel(game)
+        children = tree.children(0)
+        self.assertEqual(tree.visits[0], 60)  # every virtual loss was taken back
+        self.assertEqual(tree.visits[children.start:children.stop].sum(), 60)
+        self.assertEqual(tree.num_tried[0], 26)  # 25 points and a pass, no move handed out twice
+        self.assertTrue(game.is_valid_move(agent.select_move(game)))
+        self.assertRaises(ValueError, ArrayMCTSAgent, 60, 1.5, num_workers=3, virtual_loss=0)
+
+    def test_shared_tree(self):
+        tree = SearchTree(capacity=4, shared=True)
+        tree.expand(0, [3, 4, 5])
+        self.assertEqual(tree.num_nodes, 4)
+        self.assertRaises(ValueError, tree.expand, 1, [7])
+
+    def test_tree(self):
+        tree = SearchTree(capacity=2)
+        tree.expand(0, [3, 4, 5])
+        self.assertEqual(sorted(tree.move[child] for child in tree.children(0)), [3, 4, 5])
+        tried = [tree.next_untried(0) for _ in range(3)]
+        self.assertEqual(sorted(tried), [1, 2, 3])
+        self.assertEqual(tree.next_untried(0), -1)
+        tree.expand(2, [7])
+        tree.record([0, 2, 4], winner_is_root_player=True)
+        self.assertEqual(list(tree.visits[:5]), [1, 0, 1, 0, 1])
+        self.assertEqual(list(tree.wins[:5]), [0, 0, 1, 0, 0])
+        self.assertEqual(list(tree.parent[:5]), [-1, 0, 0, 0, 2])
+
 
 if __name__ == '__main__':
     unittest.main()
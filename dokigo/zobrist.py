@@ -1,730 +1,150 @@
+"""
+Zobrist hash codes.
+
+The codes are drawn from a seeded random generator when this module is imported, so they are the same in every run
+and every process. There is one flat table per color: CODES[player.value][(row - 1) * MAX_BOARD_SIZE + (col - 1)]
+is the code of a stone of player on (row, col), for any board up to MAX_BOARD_SIZE x MAX_BOARD_SIZE. Boards index
+hash_table(dim) with the row major point index of their own size instead, see geometry.Geometry.index.
+
+The codes of the 19x19 points are drawn first and in the same order as the old generated module did, so positions on
+boards up to 19x19 hash exactly as before.
+
+63 bit hashes start to collide once a transposition table holds millions of positions, so hash_table(dim, 128) gives
+128 bit codes instead: a second, independently seeded 64 bit code on top of the usual one. The low 64 bits of a
+128 bit hash are the 64 bit hash. A CollisionCounter measures how often hashes of either width collide.
+
+GameState combines the board hash with SIDE_CODES, KO_CODES and PASS_CODES into one position key, see
+goboard.GameState.position_key.
+"""
+import random
+
 from dokigo.base import Player, Point
 
-__all__ = ['HASH_CODE', 'EMPTY_BOARD']
+__all__ = [
+    'HASH_CODE',
+    'EMPTY_BOARD',
+    'MAX_BOARD_SIZE',
+    'hash_table',
+    'CollisionCounter',
+    'SIDE_CODES',
+    'KO_CODES',
+    'PASS_CODES',
+]
+
+SEED = 0
+HIGH_SEED = 1
+KEY_SEED = 2
+MAX63 = 0x7fffffffffffffff
+MAX64 = 0xffffffffffffffff
+HASH_BITS = (64, 128)
+MAX_BOARD_SIZE = 25
+EMPTY_BOARD = 0  # <1>
+
+# <1> we only need zobrist code for black and white, no need for empty.
+# Because empty = A, black = B, white = C is equivalent to empty = 0, black = A xor B, white = A xor C.
+
+
+def _generate_codes(seed=SEED, max_code=MAX63):
+    rng = random.Random(seed)
+    codes = [None, [0] * (MAX_BOARD_SIZE * MAX_BOARD_SIZE), [0] * (MAX_BOARD_SIZE * MAX_BOARD_SIZE)]
+    seen = set()
+    first = [(row, col) for row in range(1, 20) for col in range(1, 20)]
+    rest = [(row, col) for row in range(1, MAX_BOARD_SIZE + 1) for col in range(1, MAX_BOARD_SIZE + 1)
+            if row > 19 or col > 19]
+    for row, col in first + rest:
+        for player in (Player.black, Player.white):
+            code = rng.randint(1, max_code)
+            while code in seen:  # <1>
+                code = rng.randint(1, max_code)
+            seen.add(code)
+            codes[player.value][(row - 1) * MAX_BOARD_SIZE + (col - 1)] = code
+    return codes
+
+# <1> never hand out the same code twice
+
+
+def _generate_key_codes():
+    rng = random.Random(KEY_SEED)
+    side_codes = [None, 0, rng.randint(1, MAX63)]  # <1>
+    ko_codes = [rng.randint(1, MAX63) for _ in range(MAX_BOARD_SIZE * MAX_BOARD_SIZE)]
+    pass_codes = [0, rng.randint(1, MAX63), rng.randint(1, MAX63)]
+    return side_codes, ko_codes, pass_codes
+
+# <1> indexed by player.value; black to move adds nothing, so with no ko and no pass the key is the board hash
+
+
+CODES = _generate_codes()
+SIDE_CODES, KO_CODES, PASS_CODES = _generate_key_codes()  # <1>
+high_codes = []  # <2>
+hash_tables = {}  # <3>
+
+
+# <1> KO_CODES is indexed like CODES, PASS_CODES by the number of passes in a row
+# <2> the upper 64 bits of the 128 bit codes, made the first time someone asks for 128 bit codes
+# <3> hash_tables[(9, 9), 64][player.value][index] is the code of a stone of player on index of a 9x9 board
+
+
+def hash_table(dim, bits=64):
+    """Return the codes of a board of size dim = (num_rows, num_cols) as [None, black codes, white codes], indexed by
+    player.value and then by the row major point index (row - 1) * num_cols + (col - 1). bits is 64 or 128."""
+    if (dim, bits) not in hash_tables:
+        rows, cols = dim
+        if not (1 <= rows <= MAX_BOARD_SIZE and 1 <= cols <= MAX_BOARD_SIZE):
+            raise ValueError('Zobrist codes only go up to %dx%d boards' % (MAX_BOARD_SIZE, MAX_BOARD_SIZE))
+        if bits not in HASH_BITS:
+            raise ValueError('Zobrist hashes have 64 or 128 bits, not %r' % (bits,))
+        if bits == 128 and not high_codes:
+            high_codes.extend(_generate_codes(HIGH_SEED, MAX64))
+        table = [None]
+        for color in (Player.black.value, Player.white.value):
+            codes = CODES[color]
+            if bits == 128:
+                codes = [high << 64 | low for high, low in zip(high_codes[color], codes)]
+            table.append([codes[row * MAX_BOARD_SIZE + col] for row in range(rows) for col in range(cols)])
+        hash_tables[dim, bits] = table
+    return hash_tables[dim, bits]
+
+
+class CollisionCounter:
+    """Debug aid that measures hash collisions.
+
+    check() is given a hash and the full position it was computed from. It remembers the first position seen for
+    every hash, and when a hash comes back (a hit) it compares the positions: a different position is a collision.
+    This keeps every position in memory, so it is meant for measuring collision rates, not for normal play.
+    """
+
+    def __init__(self):
+        self.positions = {}
+        self.hits = 0
+        self.collisions = 0
+
+    def check(self, hash_code, position):
+        """Record that position hashes to hash_code. Returns True if another position had the same hash."""
+        seen = self.positions.get(hash_code)
+        if seen is None:
+            self.positions[hash_code] = position
+            return False
+        self.hits += 1
+        if seen != position:
+            self.collisions += 1
+            return True
+        return False
+
+    @property
+    def collision_rate(self):
+        """Collisions per distinct hash seen."""
+        return self.collisions / len(self.positions) if self.positions else 0.0
+
 
-HASH_CODE = {
- (Point(row=1, col=1), Player.black):3553260803050964942,
- (Point(row=1, col=1), Player.white):8211050864078048429,
- (Point(row=1, col=2), Player.black):373402508605428822,
- (Point(row=1, col=2), Player.white):8904841857247764027,
- (Point(row=1, col=3), Player.black):4481891911369680483,
- (Point(row=1, col=3), Player.white):8469216845598671737,
- (Point(row=1, col=4), Player.black):7654042048833979962,
- (Point(row=1, col=4), Player.white):8926379391851030282,
- (Point(row=1, col=5), Player.black):3302422582397125125,
- (Point(row=1, col=5), Player.white):8224117987793733248,
- (Point(row=1, col=6), Player.black):2014778559842358804,
- (Point(row=1, col=6), Player.white):1284573236628236407,
- (Point(row=1, col=7), Player.black):1288927344666773108,
- (Point(row=1, col=7), Player.white):874659381428118138,
- (Point(row=1, col=8), Player.black):7373187333409828413,
- (Point(row=1, col=8), Player.white):9105858850789076728,
- (Point(row=1, col=9), Player.black):4912032505523413355,
- (Point(row=1, col=9), Player.white):6504065999293633590,
- (Point(row=1, col=10), Player.black):5551566716156929439,
- (Point(row=1, col=10), Player.white):1355479673763813644,
- (Point(row=1, col=11), Player.black):910931048343655642,
- (Point(row=1, col=11), Player.white):680153880282415356,
- (Point(row=1, col=12), Player.black):7844236507003634717,
- (Point(row=1, col=12), Player.white):3045531827580801579,
- (Point(row=1, col=13), Player.black):5163369892407040088,
- (Point(row=1, col=13), Player.white):3263149039050788341,
- (Point(row=1, col=14), Player.black):2916399799347831459,
- (Point(row=1, col=14), Player.white):5906863297837340346,
- (Point(row=1, col=15), Player.black):1885974311722489789,
- (Point(row=1, col=15), Player.white):5096131404122784706,
- (Point(row=1, col=16), Player.black):4083125530891472903,
- (Point(row=1, col=16), Player.white):4808638572204979103,
- (Point(row=1, col=17), Player.black):574427760717438916,
- (Point(row=1, col=17), Player.white):8471343414474329531,
- (Point(row=1, col=18), Player.black):8448557894608588455,
- (Point(row=1, col=18), Player.white):860281116225453225,
- (Point(row=1, col=19), Player.black):7748473845228409069,
- (Point(row=1, col=19), Player.white):6550931558933023922,
- (Point(row=2, col=1), Player.black):7240787545693948493,
- (Point(row=2, col=1), Player.white):5767059376704329346,
- (Point(row=2, col=2), Player.black):5643754487723779398,
- (Point(row=2, col=2), Player.white):7637535685110079104,
- (Point(row=2, col=3), Player.black):3072629301025912619,
- (Point(row=2, col=3), Player.white):6735631034784739691,
- (Point(row=2, col=4), Player.black):6489956947297605579,
- (Point(row=2, col=4), Player.white):580927410360759273,
- (Point(row=2, col=5), Player.black):8458007108886578637,
- (Point(row=2, col=5), Player.white):2044857532908331600,
- (Point(row=2, col=6), Player.black):7409550268663459576,
- (Point(row=2, col=6), Player.white):1314278795803408339,
- (Point(row=2, col=7), Player.black):5008198364716411774,
- (Point(row=2, col=7), Player.white):841318678563529285,
- (Point(row=2, col=8), Player.black):9160851946324105426,
- (Point(row=2, col=8), Player.white):8071255582292515107,
- (Point(row=2, col=9), Player.black):9204663603876619735,
- (Point(row=2, col=9), Player.white):4512874016252244620,
- (Point(row=2, col=10), Player.black):2780355897101858578,
- (Point(row=2, col=10), Player.white):2684837527145142712,
- (Point(row=2, col=11), Player.black):1151175637795419518,
- (Point(row=2, col=11), Player.white):3069081776923416171,
- (Point(row=2, col=12), Player.black):8506252401890616943,
- (Point(row=2, col=12), Player.white):1874206280119224002,
- (Point(row=2, col=13), Player.black):7373413641015402355,
- (Point(row=2, col=13), Player.white):5047306837111234451,
- (Point(row=2, col=14), Player.black):2653169968923677304,
- (Point(row=2, col=14), Player.white):845156888959700230,
- (Point(row=2, col=15), Player.black):7359651520543342958,
- (Point(row=2, col=15), Player.white):2924241052209045926,
- (Point(row=2, col=16), Player.black):2233044363990916467,
- (Point(row=2, col=16), Player.white):1695889665096353997,
- (Point(row=2, col=17), Player.black):7576697734048772903,
- (Point(row=2, col=17), Player.white):304116868276126134,
- (Point(row=2, col=18), Player.black):9050892595330200551,
- (Point(row=2, col=18), Player.white):2398595171548320888,
- (Point(row=2, col=19), Player.black):637199005029101437,
- (Point(row=2, col=19), Player.white):6260123591191214753,
- (Point(row=3, col=1), Player.black):1201108519776048313,
- (Point(row=3, col=1), Player.white):1379358351790704108,
- (Point(row=3, col=2), Player.black):356405542763279049,
- (Point(row=3, col=2), Player.white):740160084334311721,
- (Point(row=3, col=3), Player.black):6450114354924661879,
- (Point(row=3, col=3), Player.white):7649503767943913852,
- (Point(row=3, col=4), Player.black):6304159892813169082,
- (Point(row=3, col=4), Player.white):7727942757681723971,
- (Point(row=3, col=5), Player.black):4838340619716621298,
- (Point(row=3, col=5), Player.white):4812664182389339454,
- (Point(row=3, col=6), Player.black):2172120094996882982,
- (Point(row=3, col=6), Player.white):1984881558531074452,
- (Point(row=3, col=7), Player.black):6267044771238331911,
- (Point(row=3, col=7), Player.white):7611710403654792657,
- (Point(row=3, col=8), Player.black):3868496563917802101,
- (Point(row=3, col=8), Player.white):2538371716475184243,
- (Point(row=3, col=9), Player.black):4543943880614615682,
- (Point(row=3, col=9), Player.white):5913996852180932433,
- (Point(row=3, col=10), Player.black):6458440484456677618,
- (Point(row=3, col=10), Player.white):9061597622233245905,
- (Point(row=3, col=11), Player.black):3296133884052724315,
- (Point(row=3, col=11), Player.white):2991368692506715505,
- (Point(row=3, col=12), Player.black):1063913631493610119,
- (Point(row=3, col=12), Player.white):5414808371876830069,
- (Point(row=3, col=13), Player.black):3092324344988259848,
- (Point(row=3, col=13), Player.white):1755934946659598595,
- (Point(row=3, col=14), Player.black):149501898447623470,
- (Point(row=3, col=14), Player.white):2499883995496636595,
- (Point(row=3, col=15), Player.black):6505549734977766227,
- (Point(row=3, col=15), Player.white):3431649578773912085,
- (Point(row=3, col=16), Player.black):1572416804975397433,
- (Point(row=3, col=16), Player.white):3930365994662434526,
- (Point(row=3, col=17), Player.black):573624161836969540,
- (Point(row=3, col=17), Player.white):7222993359932058126,
- (Point(row=3, col=18), Player.black):7888958748389523451,
- (Point(row=3, col=18), Player.white):2017829939928795911,
- (Point(row=3, col=19), Player.black):7536604522959107506,
- (Point(row=3, col=19), Player.white):5849521700410548842,
- (Point(row=4, col=1), Player.black):8637869793891241779,
- (Point(row=4, col=1), Player.white):5554042441495032494,
- (Point(row=4, col=2), Player.black):682500950849165037,
- (Point(row=4, col=2), Player.white):1147790741084674537,
- (Point(row=4, col=3), Player.black):1738795805748189873,
- (Point(row=4, col=3), Player.white):7656193238276570753,
- (Point(row=4, col=4), Player.black):1103995898229270304,
- (Point(row=4, col=4), Player.white):844232345478646998,
- (Point(row=4, col=5), Player.black):7690857381437210047,
- (Point(row=4, col=5), Player.white):1070336752369214370,
- (Point(row=4, col=6), Player.black):5584790239078055188,
- (Point(row=4, col=6), Player.white):1794784721906563192,
- (Point(row=4, col=7), Player.black):8953052700657198402,
- (Point(row=4, col=7), Player.white):6623426422672871979,
- (Point(row=4, col=8), Player.black):4420150285947082747,
- (Point(row=4, col=8), Player.white):6706823190043711387,
- (Point(row=4, col=9), Player.black):563408672252607132,
- (Point(row=4, col=9), Player.white):6265871966173738489,
- (Point(row=4, col=10), Player.black):5019685706664318004,
- (Point(row=4, col=10), Player.white):5724024469076663062,
- (Point(row=4, col=11), Player.black):7709841182976371486,
- (Point(row=4, col=11), Player.white):645675714762906659,
- (Point(row=4, col=12), Player.black):663821655067870330,
- (Point(row=4, col=12), Player.white):2776802595658591385,
- (Point(row=4, col=13), Player.black):4022023379974151577,
- (Point(row=4, col=13), Player.white):563017157549052006,
- (Point(row=4, col=14), Player.black):4308525114052203119,
- (Point(row=4, col=14), Player.white):5501602379039291659,
- (Point(row=4, col=15), Player.black):6450117289258121585,
- (Point(row=4, col=15), Player.white):3608885943026383490,
- (Point(row=4, col=16), Player.black):2399305767628372783,
- (Point(row=4, col=16), Player.white):8341605060568565695,
- (Point(row=4, col=17), Player.black):4336978543222851276,
- (Point(row=4, col=17), Player.white):8322287575337046467,
- (Point(row=4, col=18), Player.black):5255187258501342199,
- (Point(row=4, col=18), Player.white):6435119667481635123,
- (Point(row=4, col=19), Player.black):1876169299785296915,
- (Point(row=4, col=19), Player.white):7077539253880602553,
- (Point(row=5, col=1), Player.black):7273996577425616172,
- (Point(row=5, col=1), Player.white):1459217057275678561,
- (Point(row=5, col=2), Player.black):1493762673965121298,
- (Point(row=5, col=2), Player.white):4883537748719422322,
- (Point(row=5, col=3), Player.black):1081097669535665072,
- (Point(row=5, col=3), Player.white):8498584643086799366,
- (Point(row=5, col=4), Player.black):6139130137729007110,
- (Point(row=5, col=4), Player.white):121783171363698778,
- (Point(row=5, col=5), Player.black):6283705127949594998,
- (Point(row=5, col=5), Player.white):8301939199564549984,
- (Point(row=5, col=6), Player.black):8068649143803928414,
- (Point(row=5, col=6), Player.white):8462546478365384228,
- (Point(row=5, col=7), Player.black):5985354966346951873,
- (Point(row=5, col=7), Player.white):3584591998971955944,
- (Point(row=5, col=8), Player.black):6065438881563604585,
- (Point(row=5, col=8), Player.white):1414983028353867652,
- (Point(row=5, col=9), Player.black):6371715330418638584,
- (Point(row=5, col=9), Player.white):4223881996711954123,
- (Point(row=5, col=10), Player.black):729326965199720860,
- (Point(row=5, col=10), Player.white):6816220633290940559,
- (Point(row=5, col=11), Player.black):5020461236122469361,
- (Point(row=5, col=11), Player.white):1243657405815322004,
- (Point(row=5, col=12), Player.black):7029746607037427618,
- (Point(row=5, col=12), Player.white):4444070478503495896,
- (Point(row=5, col=13), Player.black):5627508152664290396,
- (Point(row=5, col=13), Player.white):6211050640042515950,
- (Point(row=5, col=14), Player.black):5444350668220701701,
- (Point(row=5, col=14), Player.white):8226727139037703083,
- (Point(row=5, col=15), Player.black):7874678753022790814,
- (Point(row=5, col=15), Player.white):1220660537465955429,
- (Point(row=5, col=16), Player.black):2861990020979545200,
- (Point(row=5, col=16), Player.white):6903563728396294392,
- (Point(row=5, col=17), Player.black):7645278651811318813,
- (Point(row=5, col=17), Player.white):744539309475691398,
- (Point(row=5, col=18), Player.black):5484004201352913968,
- (Point(row=5, col=18), Player.white):6443288046836855480,
- (Point(row=5, col=19), Player.black):1476475351094483318,
- (Point(row=5, col=19), Player.white):2057714172502367570,
- (Point(row=6, col=1), Player.black):4133318868748508016,
- (Point(row=6, col=1), Player.white):6551822094545392754,
- (Point(row=6, col=2), Player.black):6214479310663434065,
- (Point(row=6, col=2), Player.white):8066186091724693259,
- (Point(row=6, col=3), Player.black):290955706479577518,
- (Point(row=6, col=3), Player.white):8039904498933234058,
- (Point(row=6, col=4), Player.black):5234008511841245997,
- (Point(row=6, col=4), Player.white):7122156114825766203,
- (Point(row=6, col=5), Player.black):6539426472254614370,
- (Point(row=6, col=5), Player.white):1528081894476464368,
- (Point(row=6, col=6), Player.black):589247202568870372,
- (Point(row=6, col=6), Player.white):6470344640282014209,
- (Point(row=6, col=7), Player.black):4116987816185832885,
- (Point(row=6, col=7), Player.white):8162181685812594765,
- (Point(row=6, col=8), Player.black):8375189429043425318,
- (Point(row=6, col=8), Player.white):5570708134491077548,
- (Point(row=6, col=9), Player.black):637883197649728,
- (Point(row=6, col=9), Player.white):358883103068234849,
- (Point(row=6, col=10), Player.black):3006301921903179856,
- (Point(row=6, col=10), Player.white):7726758570433383579,
- (Point(row=6, col=11), Player.black):459849600493567974,
- (Point(row=6, col=11), Player.white):7588251941765751057,
- (Point(row=6, col=12), Player.black):8985195793149399526,
- (Point(row=6, col=12), Player.white):3828966839681707230,
- (Point(row=6, col=13), Player.black):5059591987982817885,
- (Point(row=6, col=13), Player.white):8882455619003089719,
- (Point(row=6, col=14), Player.black):9025731328377756358,
- (Point(row=6, col=14), Player.white):7724098107794659506,
- (Point(row=6, col=15), Player.black):1203850615738723886,
- (Point(row=6, col=15), Player.white):135853702461281591,
- (Point(row=6, col=16), Player.black):8758030156173244309,
- (Point(row=6, col=16), Player.white):3850620191607302348,
- (Point(row=6, col=17), Player.black):31293176026299436,
- (Point(row=6, col=17), Player.white):131814110599417205,
- (Point(row=6, col=18), Player.black):6961375295284874763,
- (Point(row=6, col=18), Player.white):9041161025744437596,
- (Point(row=6, col=19), Player.black):6232803376088647316,
- (Point(row=6, col=19), Player.white):5645275191878725266,
- (Point(row=7, col=1), Player.black):1756682808925381910,
- (Point(row=7, col=1), Player.white):5611127270949289043,
- (Point(row=7, col=2), Player.black):1830990384079454813,
- (Point(row=7, col=2), Player.white):2789295694423770862,
- (Point(row=7, col=3), Player.black):6350660574894682871,
- (Point(row=7, col=3), Player.white):1680693463873484992,
- (Point(row=7, col=4), Player.black):4386686232842039580,
- (Point(row=7, col=4), Player.white):8511048527615078424,
- (Point(row=7, col=5), Player.black):5788948942650466687,
- (Point(row=7, col=5), Player.white):201489195516235197,
- (Point(row=7, col=6), Player.black):8429065459236840801,
- (Point(row=7, col=6), Player.white):7377079432063115481,
- (Point(row=7, col=7), Player.black):1067876418200200469,
- (Point(row=7, col=7), Player.white):2365691389318141224,
- (Point(row=7, col=8), Player.black):6028091466430536046,
- (Point(row=7, col=8), Player.white):7538014949312262507,
- (Point(row=7, col=9), Player.black):5948527753544973025,
- (Point(row=7, col=9), Player.white):1061696263291434871,
- (Point(row=7, col=10), Player.black):1424458841272252414,
- (Point(row=7, col=10), Player.white):7851300905202081183,
- (Point(row=7, col=11), Player.black):390126559773673859,
- (Point(row=7, col=11), Player.white):1897577290974947471,
- (Point(row=7, col=12), Player.black):2395027312255290880,
- (Point(row=7, col=12), Player.white):2902717219487114965,
- (Point(row=7, col=13), Player.black):3383997954830237145,
- (Point(row=7, col=13), Player.white):5233966546732025451,
- (Point(row=7, col=14), Player.black):7834680758868115892,
- (Point(row=7, col=14), Player.white):7806292417178554126,
- (Point(row=7, col=15), Player.black):8865532025147706538,
- (Point(row=7, col=15), Player.white):5604088517837325820,
- (Point(row=7, col=16), Player.black):4560825332055526280,
- (Point(row=7, col=16), Player.white):5941174679604367911,
- (Point(row=7, col=17), Player.black):4230432057590285091,
- (Point(row=7, col=17), Player.white):4016230844726266684,
- (Point(row=7, col=18), Player.black):8037345376901584310,
- (Point(row=7, col=18), Player.white):1644419491049091945,
- (Point(row=7, col=19), Player.black):3464104116839859578,
- (Point(row=7, col=19), Player.white):2684328625214184312,
- (Point(row=8, col=1), Player.black):1277039969235833952,
- (Point(row=8, col=1), Player.white):2502978130393265254,
- (Point(row=8, col=2), Player.black):3112990145794162822,
- (Point(row=8, col=2), Player.white):3386835797962702414,
- (Point(row=8, col=3), Player.black):864299271609881629,
- (Point(row=8, col=3), Player.white):7188852202060378493,
- (Point(row=8, col=4), Player.black):328955907257636339,
- (Point(row=8, col=4), Player.white):2486825350626821832,
- (Point(row=8, col=5), Player.black):1378119693045515208,
- (Point(row=8, col=5), Player.white):5381387296444430439,
- (Point(row=8, col=6), Player.black):3328775968345993656,
- (Point(row=8, col=6), Player.white):9124709883777717847,
- (Point(row=8, col=7), Player.black):1195726619913320336,
- (Point(row=8, col=7), Player.white):1059732389264931006,
- (Point(row=8, col=8), Player.black):6737873730273440303,
- (Point(row=8, col=8), Player.white):8612361288751603901,
- (Point(row=8, col=9), Player.black):2839689615904507760,
- (Point(row=8, col=9), Player.white):7904767243248559944,
- (Point(row=8, col=10), Player.black):6720709224380669610,
- (Point(row=8, col=10), Player.white):2791644093193916903,
- (Point(row=8, col=11), Player.black):7706678344585451482,
- (Point(row=8, col=11), Player.white):2759868126653443837,
- (Point(row=8, col=12), Player.black):1002132437350429185,
- (Point(row=8, col=12), Player.white):5172743583915199716,
- (Point(row=8, col=13), Player.black):4438031084279416854,
- (Point(row=8, col=13), Player.white):3109019230089535082,
- (Point(row=8, col=14), Player.black):7359092067743684106,
- (Point(row=8, col=14), Player.white):7492409463805717605,
- (Point(row=8, col=15), Player.black):1146693919467736351,
- (Point(row=8, col=15), Player.white):1069985520675023385,
- (Point(row=8, col=16), Player.black):4590790666234670413,
- (Point(row=8, col=16), Player.white):348868341176298315,
- (Point(row=8, col=17), Player.black):3090585135226652125,
- (Point(row=8, col=17), Player.white):6337475645724468236,
- (Point(row=8, col=18), Player.black):1435747857963901535,
- (Point(row=8, col=18), Player.white):1536209591257315942,
- (Point(row=8, col=19), Player.black):5206477199920736929,
- (Point(row=8, col=19), Player.white):7435130737984369050,
- (Point(row=9, col=1), Player.black):9144971076659104856,
- (Point(row=9, col=1), Player.white):801711878254201597,
- (Point(row=9, col=2), Player.black):7450386932935854742,
- (Point(row=9, col=2), Player.white):1826599189911234466,
- (Point(row=9, col=3), Player.black):2038906852207981519,
- (Point(row=9, col=3), Player.white):3549263340480491014,
- (Point(row=9, col=4), Player.black):904596180737099293,
- (Point(row=9, col=4), Player.white):5132572348038289684,
- (Point(row=9, col=5), Player.black):2673125116830641575,
- (Point(row=9, col=5), Player.white):8486910539087465566,
- (Point(row=9, col=6), Player.black):7270680602529373994,
- (Point(row=9, col=6), Player.white):6589235727345337358,
- (Point(row=9, col=7), Player.black):2003810260357662186,
- (Point(row=9, col=7), Player.white):771657242377992502,
- (Point(row=9, col=8), Player.black):2030413359467919459,
- (Point(row=9, col=8), Player.white):9215132206472341263,
- (Point(row=9, col=9), Player.black):5397775432555392286,
- (Point(row=9, col=9), Player.white):1536439577553668404,
- (Point(row=9, col=10), Player.black):1770380294288080964,
- (Point(row=9, col=10), Player.white):1060802162818809324,
- (Point(row=9, col=11), Player.black):7581433712342531725,
- (Point(row=9, col=11), Player.white):7866232962815328871,
- (Point(row=9, col=12), Player.black):254739839100291928,
- (Point(row=9, col=12), Player.white):4849793962609456568,
- (Point(row=9, col=13), Player.black):6940019295113761929,
- (Point(row=9, col=13), Player.white):1860242702076653910,
- (Point(row=9, col=14), Player.black):4584822707898607514,
- (Point(row=9, col=14), Player.white):2365607446486993300,
- (Point(row=9, col=15), Player.black):5912156345079768974,
- (Point(row=9, col=15), Player.white):9196075355206002869,
- (Point(row=9, col=16), Player.black):7355023248115734624,
- (Point(row=9, col=16), Player.white):5749989259172174437,
- (Point(row=9, col=17), Player.black):965038568893807857,
- (Point(row=9, col=17), Player.white):4228067924175104545,
- (Point(row=9, col=18), Player.black):3335559564627457006,
- (Point(row=9, col=18), Player.white):7627605012278955071,
- (Point(row=9, col=19), Player.black):966113899877095797,
- (Point(row=9, col=19), Player.white):5499347714264713167,
- (Point(row=10, col=1), Player.black):4500096192409316954,
- (Point(row=10, col=1), Player.white):5201097493630004415,
- (Point(row=10, col=2), Player.black):5887864427518722916,
- (Point(row=10, col=2), Player.white):3903689640746408905,
- (Point(row=10, col=3), Player.black):4807485721431382556,
- (Point(row=10, col=3), Player.white):6265606015607303216,
- (Point(row=10, col=4), Player.black):8188342616753148421,
- (Point(row=10, col=4), Player.white):7687989549964509762,
- (Point(row=10, col=5), Player.black):9206613561937875572,
- (Point(row=10, col=5), Player.white):5857438866707271051,
- (Point(row=10, col=6), Player.black):8067674341280159238,
- (Point(row=10, col=6), Player.white):5006529994973098959,
- (Point(row=10, col=7), Player.black):8589850031007853877,
- (Point(row=10, col=7), Player.white):89509726433411994,
- (Point(row=10, col=8), Player.black):6507953508872400291,
- (Point(row=10, col=8), Player.white):6890217562373276009,
- (Point(row=10, col=9), Player.black):2935425192205575172,
- (Point(row=10, col=9), Player.white):2968310708471608527,
- (Point(row=10, col=10), Player.black):4843260763870360238,
- (Point(row=10, col=10), Player.white):8065684424856657726,
- (Point(row=10, col=11), Player.black):5557881458166793050,
- (Point(row=10, col=11), Player.white):1437973131586118652,
- (Point(row=10, col=12), Player.black):3495705110244436029,
- (Point(row=10, col=12), Player.white):2715197903772325775,
- (Point(row=10, col=13), Player.black):6515142847662356941,
- (Point(row=10, col=13), Player.white):4338963668841213553,
- (Point(row=10, col=14), Player.black):7378197990210333054,
- (Point(row=10, col=14), Player.white):4764128074711903266,
- (Point(row=10, col=15), Player.black):8444128749614525516,
- (Point(row=10, col=15), Player.white):612013972057958392,
- (Point(row=10, col=16), Player.black):1203596072352451216,
- (Point(row=10, col=16), Player.white):2771146400298622031,
- (Point(row=10, col=17), Player.black):6999605281502640643,
- (Point(row=10, col=17), Player.white):4137504109107178013,
- (Point(row=10, col=18), Player.black):7949655613554939142,
- (Point(row=10, col=18), Player.white):7384650861150141401,
- (Point(row=10, col=19), Player.black):8012301894084528314,
- (Point(row=10, col=19), Player.white):4249531149031119197,
- (Point(row=11, col=1), Player.black):3424839705180900992,
- (Point(row=11, col=1), Player.white):3525473106217380085,
- (Point(row=11, col=2), Player.black):4886613162451656095,
- (Point(row=11, col=2), Player.white):310071420881152292,
- (Point(row=11, col=3), Player.black):836069975665495690,
- (Point(row=11, col=3), Player.white):7324696238068521526,
- (Point(row=11, col=4), Player.black):4777691532987445291,
- (Point(row=11, col=4), Player.white):5535335540599175292,
- (Point(row=11, col=5), Player.black):704279189445118685,
- (Point(row=11, col=5), Player.white):3932538493979926460,
- (Point(row=11, col=6), Player.black):6960125056884227801,
- (Point(row=11, col=6), Player.white):2671680133869553995,
- (Point(row=11, col=7), Player.black):8311537635966388977,
- (Point(row=11, col=7), Player.white):3853899759571880135,
- (Point(row=11, col=8), Player.black):8970176743275027050,
- (Point(row=11, col=8), Player.white):7798287072475896076,
- (Point(row=11, col=9), Player.black):8967274079673490544,
- (Point(row=11, col=9), Player.white):5602552073548283958,
- (Point(row=11, col=10), Player.black):2154313099490725328,
- (Point(row=11, col=10), Player.white):7976157591232307852,
- (Point(row=11, col=11), Player.black):188911086220451874,
- (Point(row=11, col=11), Player.white):8165036684274049964,
- (Point(row=11, col=12), Player.black):6832170439579518526,
- (Point(row=11, col=12), Player.white):2789535496657011691,
- (Point(row=11, col=13), Player.black):5259781347026759321,
- (Point(row=11, col=13), Player.white):3068485050088833116,
- (Point(row=11, col=14), Player.black):4551826535518865170,
- (Point(row=11, col=14), Player.white):2416592906457534946,
- (Point(row=11, col=15), Player.black):7609469527459690969,
- (Point(row=11, col=15), Player.white):7124871843626131142,
- (Point(row=11, col=16), Player.black):3543248072768715692,
- (Point(row=11, col=16), Player.white):3538818103492124324,
- (Point(row=11, col=17), Player.black):1510746148110872761,
- (Point(row=11, col=17), Player.white):8628689038147556720,
- (Point(row=11, col=18), Player.black):2203940413832173778,
- (Point(row=11, col=18), Player.white):6727994810751164187,
- (Point(row=11, col=19), Player.black):3080833637587287609,
- (Point(row=11, col=19), Player.white):8687144592798582055,
- (Point(row=12, col=1), Player.black):4439489496805995959,
- (Point(row=12, col=1), Player.white):1299618133031077089,
- (Point(row=12, col=2), Player.black):8208445857895850549,
- (Point(row=12, col=2), Player.white):5552162875025580289,
- (Point(row=12, col=3), Player.black):752808290036592271,
- (Point(row=12, col=3), Player.white):6444336884212391417,
- (Point(row=12, col=4), Player.black):7473592250761506408,
- (Point(row=12, col=4), Player.white):3253745877681488506,
- (Point(row=12, col=5), Player.black):324476289828289512,
- (Point(row=12, col=5), Player.white):4300664284982871028,
- (Point(row=12, col=6), Player.black):4232442525270255701,
- (Point(row=12, col=6), Player.white):935992494918359400,
- (Point(row=12, col=7), Player.black):7177151771117892087,
- (Point(row=12, col=7), Player.white):186571082180856197,
- (Point(row=12, col=8), Player.black):5518345849451554842,
- (Point(row=12, col=8), Player.white):1223959488945321052,
- (Point(row=12, col=9), Player.black):2987554935698454682,
- (Point(row=12, col=9), Player.white):6457095472966563968,
- (Point(row=12, col=10), Player.black):5985897073844989849,
- (Point(row=12, col=10), Player.white):1798314215757265823,
- (Point(row=12, col=11), Player.black):7225746168895466685,
- (Point(row=12, col=11), Player.white):7170811962614576205,
- (Point(row=12, col=12), Player.black):1023765925952067366,
- (Point(row=12, col=12), Player.white):554885683661723704,
- (Point(row=12, col=13), Player.black):6463899845792943787,
- (Point(row=12, col=13), Player.white):5666201917254641891,
- (Point(row=12, col=14), Player.black):8613850316944653736,
- (Point(row=12, col=14), Player.white):5999546955745613923,
- (Point(row=12, col=15), Player.black):8941924703087603464,
- (Point(row=12, col=15), Player.white):6581954065980867281,
- (Point(row=12, col=16), Player.black):2733681944238610581,
- (Point(row=12, col=16), Player.white):7831856246119431749,
- (Point(row=12, col=17), Player.black):8840316827827059007,
- (Point(row=12, col=17), Player.white):3575400419153322416,
- (Point(row=12, col=18), Player.black):2709859256057831477,
- (Point(row=12, col=18), Player.white):6878644205862330908,
- (Point(row=12, col=19), Player.black):8831811000486227833,
- (Point(row=12, col=19), Player.white):9070246285194719275,
- (Point(row=13, col=1), Player.black):1121123030516144531,
- (Point(row=13, col=1), Player.white):7936086116164020666,
- (Point(row=13, col=2), Player.black):9185013262106087700,
- (Point(row=13, col=2), Player.white):352189015596378226,
- (Point(row=13, col=3), Player.black):3615805267598942534,
- (Point(row=13, col=3), Player.white):3427235736335677461,
- (Point(row=13, col=4), Player.black):1756845384857131461,
- (Point(row=13, col=4), Player.white):3288628427251888781,
- (Point(row=13, col=5), Player.black):5829294823439369550,
- (Point(row=13, col=5), Player.white):8822132661922919547,
- (Point(row=13, col=6), Player.black):8318813093709583890,
- (Point(row=13, col=6), Player.white):368756648982714937,
- (Point(row=13, col=7), Player.black):2355523108467986675,
- (Point(row=13, col=7), Player.white):245858216954338699,
- (Point(row=13, col=8), Player.black):4796736195966881984,
- (Point(row=13, col=8), Player.white):5250466817777891735,
- (Point(row=13, col=9), Player.black):8078542059815913183,
- (Point(row=13, col=9), Player.white):2118195687115615434,
- (Point(row=13, col=10), Player.black):7160497015899426481,
- (Point(row=13, col=10), Player.white):8159788552763462077,
- (Point(row=13, col=11), Player.black):5786999587957281000,
- (Point(row=13, col=11), Player.white):4633940704056736313,
- (Point(row=13, col=12), Player.black):4830386310190534206,
- (Point(row=13, col=12), Player.white):4677233968562333427,
- (Point(row=13, col=13), Player.black):8720565018596796021,
- (Point(row=13, col=13), Player.white):1343756965163743637,
- (Point(row=13, col=14), Player.black):8225791546894344900,
- (Point(row=13, col=14), Player.white):3892784284500900322,
- (Point(row=13, col=15), Player.black):775058905867871991,
- (Point(row=13, col=15), Player.white):966283073418010609,
- (Point(row=13, col=16), Player.black):580360708947408420,
- (Point(row=13, col=16), Player.white):3829188474110862390,
- (Point(row=13, col=17), Player.black):1440293801155951647,
- (Point(row=13, col=17), Player.white):8804205235036338946,
- (Point(row=13, col=18), Player.black):7298849495760765618,
- (Point(row=13, col=18), Player.white):3976069412164478582,
- (Point(row=13, col=19), Player.black):3846326121993410761,
- (Point(row=13, col=19), Player.white):4580555034738483343,
- (Point(row=14, col=1), Player.black):7969525367450244762,
- (Point(row=14, col=1), Player.white):2992976199465403916,
- (Point(row=14, col=2), Player.black):2329694026568601660,
- (Point(row=14, col=2), Player.white):3251266548074748444,
- (Point(row=14, col=3), Player.black):1119514441826770091,
- (Point(row=14, col=3), Player.white):6380499585646200439,
- (Point(row=14, col=4), Player.black):3186168712105642200,
- (Point(row=14, col=4), Player.white):1640908543446909915,
- (Point(row=14, col=5), Player.black):7657889550228587564,
- (Point(row=14, col=5), Player.white):2125927610758022148,
- (Point(row=14, col=6), Player.black):3373932367711988831,
- (Point(row=14, col=6), Player.white):5502562596421464359,
- (Point(row=14, col=7), Player.black):1321627531773225352,
- (Point(row=14, col=7), Player.white):29810883563490439,
- (Point(row=14, col=8), Player.black):6078372691821013887,
- (Point(row=14, col=8), Player.white):6752444274521635507,
- (Point(row=14, col=9), Player.black):8309372235445040314,
- (Point(row=14, col=9), Player.white):6898868490485711287,
- (Point(row=14, col=10), Player.black):2704873349675669764,
- (Point(row=14, col=10), Player.white):6359205825029820477,
- (Point(row=14, col=11), Player.black):8603451081819649678,
- (Point(row=14, col=11), Player.white):2147783035588138384,
- (Point(row=14, col=12), Player.black):1308680644770066130,
- (Point(row=14, col=12), Player.white):4187854308544262198,
- (Point(row=14, col=13), Player.black):4396725259387381921,
- (Point(row=14, col=13), Player.white):6525355685581805939,
- (Point(row=14, col=14), Player.black):2381648494617969615,
- (Point(row=14, col=14), Player.white):257666311395607496,
- (Point(row=14, col=15), Player.black):1919569387227827823,
- (Point(row=14, col=15), Player.white):3089951060873953409,
- (Point(row=14, col=16), Player.black):8862803731887869302,
- (Point(row=14, col=16), Player.white):2733315315825503762,
- (Point(row=14, col=17), Player.black):8101905064272563041,
- (Point(row=14, col=17), Player.white):5102411101539741219,
- (Point(row=14, col=18), Player.black):3015896389823192889,
- (Point(row=14, col=18), Player.white):5469638481424522224,
- (Point(row=14, col=19), Player.black):745331599267206846,
- (Point(row=14, col=19), Player.white):4918159083925845546,
- (Point(row=15, col=1), Player.black):2838608068117433246,
- (Point(row=15, col=1), Player.white):3473419814784600047,
- (Point(row=15, col=2), Player.black):1355161004351032487,
- (Point(row=15, col=2), Player.white):1155098168029346477,
- (Point(row=15, col=3), Player.black):2055128020501169627,
- (Point(row=15, col=3), Player.white):4688539279815492243,
- (Point(row=15, col=4), Player.black):2182777323754532159,
- (Point(row=15, col=4), Player.white):1696587848385193648,
- (Point(row=15, col=5), Player.black):3435354907492933739,
- (Point(row=15, col=5), Player.white):6116899008951029234,
- (Point(row=15, col=6), Player.black):7941089132558117232,
- (Point(row=15, col=6), Player.white):5545167078829986605,
- (Point(row=15, col=7), Player.black):3632174729017867638,
- (Point(row=15, col=7), Player.white):6476370744907572093,
- (Point(row=15, col=8), Player.black):1217672126933104480,
- (Point(row=15, col=8), Player.white):2761354559393910282,
- (Point(row=15, col=9), Player.black):3843834039651777458,
- (Point(row=15, col=9), Player.white):8544498677323545595,
- (Point(row=15, col=10), Player.black):5451718670800433309,
- (Point(row=15, col=10), Player.white):2748824146935058375,
- (Point(row=15, col=11), Player.black):3270276762920039646,
- (Point(row=15, col=11), Player.white):2287935877875593517,
- (Point(row=15, col=12), Player.black):5836356121855468762,
- (Point(row=15, col=12), Player.white):5875698468638920795,
- (Point(row=15, col=13), Player.black):4881075824531157986,
- (Point(row=15, col=13), Player.white):3471970108280125788,
- (Point(row=15, col=14), Player.black):77730989892942438,
- (Point(row=15, col=14), Player.white):8872483213542377964,
- (Point(row=15, col=15), Player.black):8312677813172439440,
- (Point(row=15, col=15), Player.white):4070249987065740984,
- (Point(row=15, col=16), Player.black):3427373470608569573,
- (Point(row=15, col=16), Player.white):8783794732508018917,
- (Point(row=15, col=17), Player.black):839847845636609567,
- (Point(row=15, col=17), Player.white):1710549993334819090,
- (Point(row=15, col=18), Player.black):1001799046448843328,
- (Point(row=15, col=18), Player.white):1034481782539912622,
- (Point(row=15, col=19), Player.black):5585174756856233219,
- (Point(row=15, col=19), Player.white):1419281708379661613,
- (Point(row=16, col=1), Player.black):6480323556716589034,
- (Point(row=16, col=1), Player.white):8561763070198141985,
- (Point(row=16, col=2), Player.black):1709835067889958492,
- (Point(row=16, col=2), Player.white):3889535731017980558,
- (Point(row=16, col=3), Player.black):1611666211727538411,
- (Point(row=16, col=3), Player.white):8850123338194495305,
- (Point(row=16, col=4), Player.black):3139524252400949965,
- (Point(row=16, col=4), Player.white):4827039316215994140,
- (Point(row=16, col=5), Player.black):3277686202152471960,
- (Point(row=16, col=5), Player.white):5824715489248684493,
- (Point(row=16, col=6), Player.black):797816136751534825,
- (Point(row=16, col=6), Player.white):6963969407281840882,
- (Point(row=16, col=7), Player.black):2718389015599496880,
- (Point(row=16, col=7), Player.white):7657001454036110099,
- (Point(row=16, col=8), Player.black):4142109172419337978,
- (Point(row=16, col=8), Player.white):4261297937627575149,
- (Point(row=16, col=9), Player.black):2017466784595945113,
- (Point(row=16, col=9), Player.white):1055681522162364348,
- (Point(row=16, col=10), Player.black):9027859717183321852,
- (Point(row=16, col=10), Player.white):2777701180048993557,
- (Point(row=16, col=11), Player.black):5618514212802445896,
- (Point(row=16, col=11), Player.white):3912638095484132172,
- (Point(row=16, col=12), Player.black):6930003647221706665,
- (Point(row=16, col=12), Player.white):853651170448635279,
- (Point(row=16, col=13), Player.black):4590284083340058435,
- (Point(row=16, col=13), Player.white):8862905051397832530,
- (Point(row=16, col=14), Player.black):5015123863885586331,
- (Point(row=16, col=14), Player.white):3738279794716056311,
- (Point(row=16, col=15), Player.black):5829776188300844866,
- (Point(row=16, col=15), Player.white):199403644878613135,
- (Point(row=16, col=16), Player.black):2491033602875118106,
- (Point(row=16, col=16), Player.white):6165719693743839247,
- (Point(row=16, col=17), Player.black):2335440180956132,
- (Point(row=16, col=17), Player.white):3674855306110628856,
- (Point(row=16, col=18), Player.black):8213982899816275293,
- (Point(row=16, col=18), Player.white):6548268731534199877,
- (Point(row=16, col=19), Player.black):4100568724173465575,
- (Point(row=16, col=19), Player.white):6885717145915670595,
- (Point(row=17, col=1), Player.black):3263432271321558139,
- (Point(row=17, col=1), Player.white):8036305749620337743,
- (Point(row=17, col=2), Player.black):6203154782762715392,
- (Point(row=17, col=2), Player.white):1808065838337847090,
- (Point(row=17, col=3), Player.black):786377676589680854,
- (Point(row=17, col=3), Player.white):649838812713930888,
- (Point(row=17, col=4), Player.black):2421013342342611572,
- (Point(row=17, col=4), Player.white):4921947795708710702,
- (Point(row=17, col=5), Player.black):1090062593810435807,
- (Point(row=17, col=5), Player.white):7927056978264341393,
- (Point(row=17, col=6), Player.black):8215247435782523905,
- (Point(row=17, col=6), Player.white):7028214659547377431,
- (Point(row=17, col=7), Player.black):628046754794617221,
- (Point(row=17, col=7), Player.white):7940779892200854324,
- (Point(row=17, col=8), Player.black):2607888969255960680,
- (Point(row=17, col=8), Player.white):1239810494828894495,
- (Point(row=17, col=9), Player.black):4824376821479930041,
- (Point(row=17, col=9), Player.white):1939475403840961025,
- (Point(row=17, col=10), Player.black):971280068561616573,
- (Point(row=17, col=10), Player.white):8814360426120379343,
- (Point(row=17, col=11), Player.black):5013577398213722328,
- (Point(row=17, col=11), Player.white):6838457612007510252,
- (Point(row=17, col=12), Player.black):8338350095637352910,
- (Point(row=17, col=12), Player.white):2569766111533203186,
- (Point(row=17, col=13), Player.black):4080093416330963789,
- (Point(row=17, col=13), Player.white):5241023841285607784,
- (Point(row=17, col=14), Player.black):1271098284076286069,
- (Point(row=17, col=14), Player.white):1137225332549860572,
- (Point(row=17, col=15), Player.black):1111580987087695702,
- (Point(row=17, col=15), Player.white):3700569400402067422,
- (Point(row=17, col=16), Player.black):4316010933186977501,
- (Point(row=17, col=16), Player.white):5161520306262143220,
- (Point(row=17, col=17), Player.black):2757431043409771348,
- (Point(row=17, col=17), Player.white):5830199294436804907,
- (Point(row=17, col=18), Player.black):6846928473223634018,
- (Point(row=17, col=18), Player.white):2010786943969032849,
- (Point(row=17, col=19), Player.black):4508920703055692475,
- (Point(row=17, col=19), Player.white):4626140531982308001,
- (Point(row=18, col=1), Player.black):4544537586260521011,
- (Point(row=18, col=1), Player.white):8839887870222994113,
- (Point(row=18, col=2), Player.black):4095008887565629276,
- (Point(row=18, col=2), Player.white):1317202914046439205,
- (Point(row=18, col=3), Player.black):4570394257583902719,
- (Point(row=18, col=3), Player.white):8184222949128698033,
- (Point(row=18, col=4), Player.black):1989609951471021277,
- (Point(row=18, col=4), Player.white):3277998969758301241,
- (Point(row=18, col=5), Player.black):3606025269249711536,
- (Point(row=18, col=5), Player.white):9157734005401432073,
- (Point(row=18, col=6), Player.black):7805046494273639207,
- (Point(row=18, col=6), Player.white):9028819834608956262,
- (Point(row=18, col=7), Player.black):6335493859044446340,
- (Point(row=18, col=7), Player.white):750532597963745289,
- (Point(row=18, col=8), Player.black):8755832525708927221,
- (Point(row=18, col=8), Player.white):8528105414224556054,
- (Point(row=18, col=9), Player.black):3644296864679072943,
- (Point(row=18, col=9), Player.white):3332204338874742690,
- (Point(row=18, col=10), Player.black):1071314093912793573,
- (Point(row=18, col=10), Player.white):34498803485755463,
- (Point(row=18, col=11), Player.black):2493333273873964384,
- (Point(row=18, col=11), Player.white):5906400645086614479,
- (Point(row=18, col=12), Player.black):2698080011467791337,
- (Point(row=18, col=12), Player.white):8307729942123329791,
- (Point(row=18, col=13), Player.black):1297541987968756002,
- (Point(row=18, col=13), Player.white):5283611780846306627,
- (Point(row=18, col=14), Player.black):1763548765936248060,
- (Point(row=18, col=14), Player.white):4003117890663313839,
- (Point(row=18, col=15), Player.black):6607123307822921016,
- (Point(row=18, col=15), Player.white):3542975329126036932,
- (Point(row=18, col=16), Player.black):3050127809739671853,
- (Point(row=18, col=16), Player.white):5976790780557471230,
- (Point(row=18, col=17), Player.black):6340807325568136858,
- (Point(row=18, col=17), Player.white):1365236987051499386,
- (Point(row=18, col=18), Player.black):8607546455210703018,
- (Point(row=18, col=18), Player.white):1360454005271411823,
- (Point(row=18, col=19), Player.black):2915246858713397474,
- (Point(row=18, col=19), Player.white):1926449594822345431,
- (Point(row=19, col=1), Player.black):1723151298360998393,
- (Point(row=19, col=1), Player.white):3220499078973628901,
- (Point(row=19, col=2), Player.black):9071040515307342254,
- (Point(row=19, col=2), Player.white):3941056520691470875,
- (Point(row=19, col=3), Player.black):4537516493651146227,
- (Point(row=19, col=3), Player.white):6731061430725421208,
- (Point(row=19, col=4), Player.black):7337962105881780189,
- (Point(row=19, col=4), Player.white):4051569412824223820,
- (Point(row=19, col=5), Player.black):1884046343969053791,
- (Point(row=19, col=5), Player.white):6548566604717152453,
- (Point(row=19, col=6), Player.black):8354734306114879566,
- (Point(row=19, col=6), Player.white):306946861748109197,
- (Point(row=19, col=7), Player.black):5840015957072369512,
- (Point(row=19, col=7), Player.white):8033643496108463556,
- (Point(row=19, col=8), Player.black):3353711822175681416,
- (Point(row=19, col=8), Player.white):6854467079640640924,
- (Point(row=19, col=9), Player.black):6248766368575441694,
- (Point(row=19, col=9), Player.white):2149637574843579076,
- (Point(row=19, col=10), Player.black):2744203819496509932,
- (Point(row=19, col=10), Player.white):799017546371907104,
- (Point(row=19, col=11), Player.black):8013667017468272991,
- (Point(row=19, col=11), Player.white):6931291397842154795,
- (Point(row=19, col=12), Player.black):7115191309384549055,
- (Point(row=19, col=12), Player.white):8143791964498758956,
- (Point(row=19, col=13), Player.black):3794793453676846533,
- (Point(row=19, col=13), Player.white):497508865845413609,
- (Point(row=19, col=14), Player.black):6426892208640809408,
- (Point(row=19, col=14), Player.white):6139349890047719642,
- (Point(row=19, col=15), Player.black):5981469526952975391,
- (Point(row=19, col=15), Player.white):5046859650921160867,
- (Point(row=19, col=16), Player.black):6773797792159940063,
- (Point(row=19, col=16), Player.white):3971625549035446436,
- (Point(row=19, col=17), Player.black):4192966730067856822,
- (Point(row=19, col=17), Player.white):2349674428180062710,
- (Point(row=19, col=18), Player.black):4387119687830405089,
- (Point(row=19, col=18), Player.white):3110068077172473101,
- (Point(row=19, col=19), Player.black):389550176224686255,
- (Point(row=19, col=19), Player.white):484718786465166286,
-}
+def __getattr__(name):
+    """Build HASH_CODE, the old {(Point, Player): code} dict, the first time someone asks for it."""
+    if name == 'HASH_CODE':  # <1>
+        global HASH_CODE
+        HASH_CODE = {(Point(row, col), player): CODES[player.value][(row - 1) * MAX_BOARD_SIZE + (col - 1)]
+                     for row in range(1, MAX_BOARD_SIZE + 1)
+                     for col in range(1, MAX_BOARD_SIZE + 1)
+                     for player in Player}
+        return HASH_CODE
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
 
-EMPTY_BOARD = 0
+# <1> module level __getattr__ is only called for names the module doesn't have yet
@@ -1,11 +1,21 @@
 import argparse
 from multiprocessing import Process, cpu_count
 from dokigo import goboard
+from dokigo.base import Player
+from dokigo.arrayboard import ArrayBoard
+from dokigo.bitboard import BitBoard
 from dokigo.agent import mcts
+from dokigo.agent.timecontrol import GameClock
 import os
 from dokigo.sgfio import sgf, adaptor
 import time
 
+BOARD_CLASSES = {
+    'dict': goboard.Board,
+    'array': ArrayBoard,
+    'bit': BitBoard,
+}
+
 
 def worker(args, pid):
 
@@ -17,8 +27,14 @@ def worker(args, pid):
     for i in range(args.num_games):
         print('Process %d: Generating game %d/%d...' % (pid, i + 1, args.num_games))
 
-        game = goboard.GameState.new_game(board_size)
-        bot = mcts.MCTSAgent(rounds, temperature)
+        game = goboard.GameState.new_game(board_size, BOARD_CLASSES[args.board])
+        clocks = None
+        if args.main_time is not None:
+            clocks = {player: GameClock(args.main_time) for player in (Player.black, Player.white)}  # <1>
+        bot = mcts.MCTSAgent(rounds, temperature, table_size=args.table_size,
+                             early_stop=args.early_stop, num_workers=args.workers,
+                             light_playouts=args.light_playouts, rollouts_per_expansion=args.rollouts_per_expansion,
+                             batch_rollouts=args.batch_rollouts)
         num_moves = 0
 
         sgfgame = sgf.Sgf_game(board_size)  # recorder
@@ -26,6 +42,8 @@ def worker(args, pid):
 
         while not game.is_over():
             # print_board(game.board)
+            if clocks is not None:
+                bot.clock = clocks[game.next_player]
             move = bot.select_move(game)
             # print_move(game.next_player, move)
 
@@ -38,11 +56,14 @@ def worker(args, pid):
             if num_moves > max_moves:
                 break
 
+        bot.close()
         sgf_info.set_game_result(game, sgfgame)  # set game result
 
         with open(f"./selfplay_data/process{pid}_game{i}_rounds{rounds}.sgf", "wb") as f:  # write into a file
             f.write(sgfgame.serialise())
 
+    # <1> the bot plays both colors, and each player has its own main time to spend
+
 
 def main():
     parser = argparse.ArgumentParser()
@@ -53,6 +74,22 @@ def main():
                         help='Max moves per game.')
     parser.add_argument('--num-games', '-n', type=int, default=2)
     parser.add_argument('--cpu-cores', '-c', type=int, default=1)
+    parser.add_argument('--board', choices=sorted(BOARD_CLASSES), default='dict',
+                        help='Board implementation. With --light-playouts, array boards load faster into a rollout.')
+    parser.add_argument('--table-size', type=int, default=None,
+                        help='Share nodes between transpositions through a table of this many nodes.')
+    parser.add_argument('--main-time', type=float, default=None,
+                        help='Seconds on the clock of each player; rounds becomes an upper limit per move.')
+    parser.add_argument('--early-stop', action='store_true',
+                        help='Stop searching a move once the most visited move can not be caught.')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='Processes searching every move together (root parallel search).')
+    parser.add_argument('--light-playouts', action='store_true',
+                        help='Play rollouts on a scratch board; faster, but only checks the simple ko rule.')
+    parser.add_argument('--rollouts-per-expansion', type=int, default=1,
+                        help='Random games played from every new node.')
+    parser.add_argument('--batch-rollouts', action='store_true',
+                        help='Play the rollouts of a node together on a BatchBoard; pays off with many rollouts.')
 
     args = parser.parse_args()  # <1>
 
@@ -0,0 +1,47 @@
+import argparse
+import random
+import time
+from multiprocessing import cpu_count
+
+import numpy as np
+
+from dokigo import goboard
+from dokigo.arrayboard import ArrayBoard
+from dokigo.agent.mcts_array import ArrayMCTSAgent
+
+
+def measure(args, num_workers):
+    """Return the rounds per second of one tree parallel search of the first move."""
+    random.seed(args.seed)
+    np.random.seed(args.seed)
+    game = goboard.GameState.new_game(args.board_size, ArrayBoard)
+    agent = ArrayMCTSAgent(args.rounds, args.temperature, num_workers=num_workers, virtual_loss=args.virtual_loss)
+    start = time.perf_counter()
+    agent.select_move(game)
+    return args.rounds / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scaling of tree parallel MCTS with the number of workers.')
+    parser.add_argument('--board-size', '-b', type=int, default=9)
+    parser.add_argument('--rounds', '-r', type=int, default=400)
+    parser.add_argument('--temperature', '-t', type=float, default=0.8)
+    parser.add_argument('--virtual-loss', type=int, default=3)
+    parser.add_argument('--workers', '-w', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+
+    print(f"{cpu_count()} cores, {args.board_size}x{args.board_size}, {args.rounds} rounds per search")
+    print(f"{'workers':>7} {'rounds/s':>9} {'speedup':>8} {'efficiency':>10}")
+    rate = measure(args, 1)  # <1>
+    for num_workers in args.workers:
+        rate_workers = rate if num_workers == 1 else measure(args, num_workers)
+        speedup = rate_workers / rate
+        print(f"{num_workers:>7} {rate_workers:>9.1f} {speedup:>8.2f} {speedup / num_workers:>10.0%}")
+
+    # <1> speedup and efficiency are relative to one worker, which runs the serial search without a lock
+
+
+if __name__ == '__main__':
+    main()